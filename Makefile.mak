@@ -39,6 +39,7 @@ help:
 	@echo "  changes-csv             Download CO changes CSV (7d window)"
 	@echo "  digest-co-incremental   Run email digest for CO with since-file + log"
 	@echo "  openapi-paths           List mounted API paths from openapi.json"
+	@echo "  scrapergen-native       mypyc-compile scripts/scraper_gen_core.py (optional)"
 	@echo ""
 	@echo "External data fetchers (existing):"
 	@echo "  fetch-arb               CARB LCFS Fuel Pathways (default: Ethanol)"
@@ -100,6 +101,14 @@ digest-co-incremental:
 openapi-paths:
 	curl -s "$(API_BASE)/openapi.json" | jq '.paths | keys'
 
+# Optional: compile the scraper generator's normalization helpers with mypyc.
+# generate_scrapers_from_json.py picks up the built extension automatically;
+# delete scripts/scraper_gen_core.*.so to fall back to the .py source.
+.PHONY: scrapergen-native
+scrapergen-native: $(VENV)
+	$(PIP) install mypy
+	cd scripts && ../$(VENV)/bin/mypyc scraper_gen_core.py && rm -rf build
+
 # ================================================
 # 🌐 External Data Fetch Commands (existing)
 # ================================================
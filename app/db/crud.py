@@ -8,7 +8,7 @@ Run from the repo root (folder that contains app/).
 What this does:
   - Provides thin, typed helper functions around SQLAlchemy ORM for:
       • Sources: list, upsert
-      • Documents: create-or-update, search with filters
+      • Documents: create-or-update (single-statement upsert on url), search with filters
       • Alerts: create, list
   - Keeps business logic minimal and side-effect predictable (commit/refresh inside ops).
 
@@ -66,7 +66,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import select, and_, or_
+from sqlalchemy import String, and_, case, cast, or_, select
 from .models import Source, Document, Alert
 
 # --- Sources ---
@@ -80,6 +80,9 @@ def list_sources(db: Session, active: Optional[bool] = None):
 def upsert_source(db: Session, *, name: str, url: str, jurisdiction: Optional[str], type_: str, active: bool = True):
     src = db.execute(select(Source).where(Source.name == name)).scalar_one_or_none()
     if src:
+        if src.url != url:
+            # validators/hash belong to the old URL
+            src.etag = src.last_modified = src.content_hash = None
         src.url = url
         src.jurisdiction = jurisdiction
         src.type = type_
@@ -92,6 +95,67 @@ def upsert_source(db: Session, *, name: str, url: str, jurisdiction: Optional[st
     return src
 
 # --- Documents ---
+_UPSERT_DIALECTS = ("postgresql", "sqlite")
+
+
+def _doc_upsert_stmt(
+    db: Session,
+    *,
+    source_id: int,
+    title: str,
+    url: str,
+    published_at: Optional[datetime],
+    text: Optional[str],
+    metadata: Optional[dict],
+    jurisdiction: Optional[str],
+):
+    """
+    Build INSERT ... ON CONFLICT (url) DO UPDATE for Document, or None if the
+    bound dialect has no ON CONFLICT support. Update rules mirror the ORM path:
+    only non-empty inputs overwrite, and text/metadata only fill empty columns.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect not in _UPSERT_DIALECTS:
+        return None
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    cols = Document.__table__.c
+    row = {
+        "source_id": source_id,
+        "title": title or "(untitled)",
+        "url": url,
+        "published_at": published_at,
+        "text": text,
+        "jurisdiction": jurisdiction,
+    }
+    if metadata is not None:
+        row["meta"] = metadata
+
+    stmt = insert(Document).values(**row)
+    excluded = stmt.excluded
+    set_ = {"title": excluded.title if title else cols.title}
+    if published_at:
+        set_["published_at"] = excluded.published_at
+    if text:
+        set_["text"] = case(
+            (or_(cols.text.is_(None), cols.text == ""), excluded.text),
+            else_=cols.text,
+        )
+    if metadata:
+        meta_empty = or_(
+            cols["metadata"].is_(None),
+            cast(cols["metadata"], String).in_(("null", "{}", "[]")),
+        )
+        set_["metadata"] = case((meta_empty, excluded["metadata"]), else_=cols["metadata"])
+    if jurisdiction:
+        set_["jurisdiction"] = excluded.jurisdiction
+
+    return stmt.on_conflict_do_update(index_elements=[cols.url], set_=set_).returning(Document)
+
+
 def create_or_update_doc(
     db: Session,
     *,
@@ -103,6 +167,27 @@ def create_or_update_doc(
     metadata: Optional[dict],
     jurisdiction: Optional[str],
 ):
+    """
+    Insert a Document or update the existing row with the same URL.
+
+    On Postgres/SQLite this is a single INSERT ... ON CONFLICT (url) statement;
+    other backends fall back to SELECT-then-INSERT/UPDATE.
+    """
+    upsert = _doc_upsert_stmt(
+        db,
+        source_id=source_id,
+        title=title,
+        url=url,
+        published_at=published_at,
+        text=text,
+        metadata=metadata,
+        jurisdiction=jurisdiction,
+    )
+    if upsert is not None:
+        doc = db.scalars(upsert, execution_options={"populate_existing": True}).one()
+        db.commit()
+        return doc
+
     existing = db.execute(select(Document).where(Document.url == url)).scalar_one_or_none()
     if existing:
         changed = False
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+002_documents_url_unique.py — Migration: enforce a UNIQUE index on documents.url.
+
+Place at: app/db/migrations/002_documents_url_unique.py
+Run with:
+  PYTHONPATH=. python3 app/db/migrations/002_documents_url_unique.py
+
+What this does:
+  1. Checks documents.url for duplicate values and refuses to continue if any
+     exist (prints the first few so they can be cleaned up by hand).
+  2. Creates ux_documents_url ON documents(url) if no unique index covers url yet.
+  3. Safe to re-run — skips when the index (or an equivalent autoindex) exists.
+
+Why it matters:
+  - crud.create_or_update_doc() upserts with INSERT ... ON CONFLICT (url),
+    which requires a unique index on url. Databases created from models.py
+    already have one; older dev.db files may not.
+
+Common examples:
+  PYTHONPATH=. python3 app/db/migrations/002_documents_url_unique.py
+      # Apply migration against dev.db (default)
+  DB_PATH=prod.db PYTHONPATH=. python3 app/db/migrations/002_documents_url_unique.py
+      # Apply against prod.db
+"""
+
+import os, sqlite3, sys
+
+DB_PATH = os.getenv("DB_PATH", "dev.db")
+INDEX_NAME = "ux_documents_url"
+
+def has_unique_url_index(cur):
+    cur.execute("PRAGMA index_list(documents)")
+    for row in cur.fetchall():
+        name, unique = row[1], row[2]
+        if not unique:
+            continue
+        cur.execute(f"PRAGMA index_info({name})")
+        if [r[2] for r in cur.fetchall()] == ["url"]:
+            return True
+    return False
+
+def main():
+    con = sqlite3.connect(DB_PATH)
+    cur = con.cursor()
+
+    if has_unique_url_index(cur):
+        print("migration ok (unique url index already present)")
+        cur.close(); con.close()
+        return
+
+    cur.execute("""
+    SELECT url, COUNT(*) FROM documents
+    GROUP BY url HAVING COUNT(*) > 1
+    ORDER BY COUNT(*) DESC LIMIT 10;
+    """)
+    dupes = cur.fetchall()
+    if dupes:
+        print("ERROR: duplicate documents.url values; resolve before re-running:", file=sys.stderr)
+        for url, n in dupes:
+            print(f"  {n}x {url}", file=sys.stderr)
+        cur.close(); con.close()
+        sys.exit(1)
+
+    cur.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {INDEX_NAME} ON documents (url);")
+    con.commit()
+
+    cur.close(); con.close()
+    print("migration ok")
+
+if __name__ == "__main__":
+    main()
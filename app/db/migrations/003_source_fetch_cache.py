@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+003_source_fetch_cache.py — Migration: add conditional-fetch columns to sources.
+
+Place at: app/db/migrations/003_source_fetch_cache.py
+Run with:
+  PYTHONPATH=. python3 app/db/migrations/003_source_fetch_cache.py
+
+What this does:
+  1. Adds to sources (if missing):
+     - etag           (last ETag response header)
+     - last_modified  (last Last-Modified response header)
+     - content_hash   (sha256 of the last ingested response body)
+  2. Safe to re-run — adds only missing columns.
+
+Why it matters:
+  - run_html/run_rss send If-None-Match / If-Modified-Since and skip parsing on
+    304 or an identical body, so unchanged sources cost ~nothing per cron run.
+
+Common examples:
+  PYTHONPATH=. python3 app/db/migrations/003_source_fetch_cache.py
+      # Apply migration against dev.db (default)
+  DB_PATH=prod.db PYTHONPATH=. python3 app/db/migrations/003_source_fetch_cache.py
+      # Apply against prod.db
+"""
+
+import os, sqlite3
+
+DB_PATH = os.getenv("DB_PATH", "dev.db")
+
+def column_names(cur, table):
+    cur.execute(f"PRAGMA table_info({table})")
+    return {row[1] for row in cur.fetchall()}
+
+def add_column_if_missing(cur, table, col_name, col_ddl):
+    cols = column_names(cur, table)
+    if col_name not in cols:
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN {col_ddl}")
+
+def main():
+    con = sqlite3.connect(DB_PATH)
+    cur = con.cursor()
+
+    add_column_if_missing(cur, "sources", "etag",          "etag TEXT")
+    add_column_if_missing(cur, "sources", "last_modified", "last_modified TEXT")
+    add_column_if_missing(cur, "sources", "content_hash",  "content_hash TEXT")
+    con.commit()
+
+    cur.close(); con.close()
+    print("migration ok")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+004_last_version_no.py — Migration: add documents.last_version_no and backfill it.
+
+Place at: app/db/migrations/004_last_version_no.py
+Run with:
+  PYTHONPATH=. python3 app/db/migrations/004_last_version_no.py
+
+What this does:
+  1. Adds documents.last_version_no (INTEGER) if missing.
+  2. Fills it from MAX(document_versions.version_no) for rows where it is NULL.
+  3. Safe to re-run — only touches rows still NULL.
+
+Why it matters:
+  - change_tracker computes the next version number as last_version_no + 1
+    instead of a per-document SELECT MAX(version_no) round-trip.
+  - Rows left NULL still work (one MAX() lookup on first change).
+
+Common examples:
+  PYTHONPATH=. python3 app/db/migrations/004_last_version_no.py
+      # Apply migration against dev.db (default)
+  DB_PATH=prod.db PYTHONPATH=. python3 app/db/migrations/004_last_version_no.py
+      # Apply against prod.db
+"""
+
+import os, sqlite3
+
+DB_PATH = os.getenv("DB_PATH", "dev.db")
+
+def column_names(cur, table):
+    cur.execute(f"PRAGMA table_info({table})")
+    return {row[1] for row in cur.fetchall()}
+
+def add_column_if_missing(cur, table, col_name, col_ddl):
+    cols = column_names(cur, table)
+    if col_name not in cols:
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN {col_ddl}")
+
+def main():
+    con = sqlite3.connect(DB_PATH)
+    cur = con.cursor()
+
+    add_column_if_missing(cur, "documents", "last_version_no", "last_version_no INTEGER")
+    cur.execute("""
+    UPDATE documents
+    SET last_version_no = (
+        SELECT MAX(v.version_no) FROM document_versions v WHERE v.doc_id = documents.id
+    )
+    WHERE last_version_no IS NULL
+      AND EXISTS (SELECT 1 FROM document_versions v WHERE v.doc_id = documents.id);
+    """)
+    print(f"backfilled last_version_no on {cur.rowcount} documents")
+    con.commit()
+
+    cur.close(); con.close()
+    print("migration ok")
+
+if __name__ == "__main__":
+    main()
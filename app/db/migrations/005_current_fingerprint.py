@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+005_current_fingerprint.py — Migration: add documents.current_fingerprint.
+
+Place at: app/db/migrations/005_current_fingerprint.py
+Run with:
+  PYTHONPATH=. python3 app/db/migrations/005_current_fingerprint.py
+
+What this does:
+  1. Adds documents.current_fingerprint (BIGINT) if missing.
+  2. Safe to re-run — adds only the missing column.
+
+Why it matters:
+  - change_tracker stores a 64-bit xxh3 fingerprint of each document's hash
+    basis and returns NOCHANGE on a match without computing the full hash.
+  - Existing rows start NULL and get a fingerprint on their next record_version().
+
+Common examples:
+  PYTHONPATH=. python3 app/db/migrations/005_current_fingerprint.py
+      # Apply migration against dev.db (default)
+  DB_PATH=prod.db PYTHONPATH=. python3 app/db/migrations/005_current_fingerprint.py
+      # Apply against prod.db
+"""
+
+import os, sqlite3
+
+DB_PATH = os.getenv("DB_PATH", "dev.db")
+
+def column_names(cur, table):
+    cur.execute(f"PRAGMA table_info({table})")
+    return {row[1] for row in cur.fetchall()}
+
+def add_column_if_missing(cur, table, col_name, col_ddl):
+    cols = column_names(cur, table)
+    if col_name not in cols:
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN {col_ddl}")
+
+def main():
+    con = sqlite3.connect(DB_PATH)
+    cur = con.cursor()
+
+    add_column_if_missing(cur, "documents", "current_fingerprint", "current_fingerprint BIGINT")
+    con.commit()
+
+    cur.close(); con.close()
+    print("migration ok")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+006_doc_versions_doc_ver_index.py — Migration: index document_versions(doc_id, version_no DESC).
+
+Place at: app/db/migrations/006_doc_versions_doc_ver_index.py
+Run with:
+  PYTHONPATH=. python3 app/db/migrations/006_doc_versions_doc_ver_index.py
+
+What this does:
+  1. Creates ix_doc_versions_doc_ver ON document_versions (doc_id, version_no DESC).
+  2. Safe to re-run — uses CREATE INDEX IF NOT EXISTS.
+
+Why it matters:
+  - change_tracker looks up MAX(version_no) per document (rows without
+    last_version_no, and the grouped lookup in record_versions_bulk). With this
+    index that is an index-only lookup instead of a scan of the doc's versions.
+  - SQLite stores the rowid (id) in every index, so no INCLUDE is needed here.
+    On Postgres, models.py declares the index with INCLUDE (id); build it there
+    with CREATE INDEX CONCURRENTLY to avoid blocking writes.
+
+Common examples:
+  PYTHONPATH=. python3 app/db/migrations/006_doc_versions_doc_ver_index.py
+      # Apply migration against dev.db (default)
+  DB_PATH=prod.db PYTHONPATH=. python3 app/db/migrations/006_doc_versions_doc_ver_index.py
+      # Apply against prod.db
+"""
+
+import os, sqlite3
+
+DB_PATH = os.getenv("DB_PATH", "dev.db")
+
+def main():
+    con = sqlite3.connect(DB_PATH)
+    cur = con.cursor()
+
+    cur.execute("CREATE INDEX IF NOT EXISTS ix_doc_versions_doc_ver ON document_versions (doc_id, version_no DESC);")
+    con.commit()
+
+    cur.close(); con.close()
+    print("migration ok")
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,10 @@ Why it matters:
 
 Related scripts:
   - Migration: app/db/migrations/001_change_tracking.py
+               app/db/migrations/003_source_fetch_cache.py
+               app/db/migrations/004_last_version_no.py
+               app/db/migrations/005_current_fingerprint.py
+               app/db/migrations/006_doc_versions_doc_ver_index.py
   - Backfill:  tools/backfill_version.py
   - CRUD:      app/db/crud.py
 
@@ -40,6 +44,7 @@ from datetime import datetime
 from sqlalchemy import (
     Column,
     Integer,
+    BigInteger,
     String,
     DateTime,
     ForeignKey,
@@ -63,6 +68,12 @@ class Source(Base):
     jurisdiction = Column(String(128), nullable=True)  # e.g., "US", "TX", "CA"
     type = Column(String(16), nullable=False, default="rss")  # "rss" | "html"
     active = Column(Boolean, nullable=False, default=True)
+
+    # ---- Conditional-fetch state (added by migration 003_source_fetch_cache.py) ----
+    etag = Column(String(512), nullable=True)           # last ETag response header
+    last_modified = Column(String(64), nullable=True)   # last Last-Modified header
+    content_hash = Column(String(64), nullable=True)    # sha256 of last ingested body
+
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(
         DateTime,
@@ -100,9 +111,14 @@ class Document(Base):
     # ---- Change tracking fields (added by migration 001_change_tracking.py) ----
     # Note: in SQLite these map fine even if the column was created as TEXT.
     current_hash = Column(String(64), nullable=True)
+    # xxh3-64 of the hash basis (migration 005_current_fingerprint.py): cheap NOCHANGE check
+    current_fingerprint = Column(BigInteger, nullable=True)
     first_seen_at = Column(DateTime, nullable=True)
     last_seen_at = Column(DateTime, nullable=True)
     last_changed_at = Column(DateTime, nullable=True)
+    # Highest DocumentVersion.version_no for this doc (migration 004_last_version_no.py);
+    # NULL on rows that predate it — change_tracker falls back to MAX() once.
+    last_version_no = Column(Integer, nullable=True)
 
     source = relationship("Source", back_populates="documents")
     versions = relationship(
@@ -137,6 +153,8 @@ class DocumentVersion(Base):
 
     __table_args__ = (
         Index("ix_doc_versions_doc_id_fetched", "doc_id", "fetched_at"),
+        # MAX(version_no) per doc (change_tracker) → index-only scan; INCLUDE is Postgres-only
+        Index("ix_doc_versions_doc_ver", doc_id, version_no.desc(), postgresql_include=["id"]),
     )
 
 
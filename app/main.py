@@ -93,7 +93,7 @@ from typing import List
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, RedirectResponse
 from fastapi.openapi.docs import get_swagger_ui_oauth2_redirect_html
 
 APP_NAME = os.getenv("APP_NAME", "Regulatory Data Bridge")
@@ -103,6 +103,7 @@ app = FastAPI(
     title=APP_NAME,
     version=APP_VERSION,
     description="Scrape and serve regulatory documents (HTML & PDF) with an Admin API.",
+    default_response_class=ORJSONResponse,
 )
 
 # ------------------------------------------------------------
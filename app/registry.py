@@ -15,20 +15,34 @@ Typical usage:
             result = mod.check_for_update()
             print(src_id, result)
 
+Lazy variant (nothing is imported until a scraper is first used):
+
+    scrapers = discover(lazy=True)
+    result = scrapers["some_html_scraper"]()   # imports, then calls check_for_update()
+
 Notes:
   - `src_id` is derived from the filename stem (no extension).
   - Each scraper module is expected to provide `check_for_update() -> dict`.
   - Generated scrapers live under scrapers/state/<code>/<file>_scraper.py
+  - discover(lazy=True) reads the scraper paths from scrapers/_registry_cache.json
+    when it is still valid (no scanned directory changed since it was written)
+    and rewrites it otherwise. Rebuild it explicitly with:
+        python -m app.registry
 """
 
 from __future__ import annotations
 import importlib.util
+import json
+import os
+import threading
 from pathlib import Path
 from types import ModuleType
-from typing import Dict, Iterable
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 # Root scrapers folder (relative to project)
 SCRAPERS_DIR = Path(__file__).resolve().parent.parent / "scrapers"
+REGISTRY_CACHE_NAME = "_registry_cache.json"
+_SKIP_PARTS = {".cache", "__pycache__", "tests"}
 
 
 def _iter_scraper_paths(root: Path = SCRAPERS_DIR) -> Iterable[Path]:
@@ -38,7 +52,7 @@ def _iter_scraper_paths(root: Path = SCRAPERS_DIR) -> Iterable[Path]:
     if not root.exists():
         return []
     for p in root.rglob("*_scraper.py"):
-        if any(part in {".cache", "__pycache__", "tests"} for part in p.parts):
+        if any(part in _SKIP_PARTS for part in p.parts):
             continue
         yield p
 
@@ -55,14 +69,115 @@ def _load_module_from_path(path: Path) -> ModuleType:
     return mod
 
 
-def discover(root: Path | None = None) -> Dict[str, ModuleType]:
+class LazyScraper:
+    """
+    Stand-in for a scraper module that imports it on first use.
+
+    Attribute access is forwarded to the module; calling the object runs its
+    check_for_update().
+    """
+
+    __slots__ = ("path", "_module", "_lock")
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._module: Optional[ModuleType] = None
+        self._lock = threading.Lock()
+
+    @property
+    def module(self) -> ModuleType:
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = _load_module_from_path(self.path)
+        return self._module
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.module, name)
+
+    def __call__(self) -> Any:
+        return self.module.check_for_update()
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyScraper {self.path.stem} ({state})>"
+
+
+def _root_entries(root: Path) -> List[str]:
+    """Names in root that discovery depends on: scanned subdirectories and *_scraper.py files."""
+    return sorted(
+        e.name for e in os.scandir(root)
+        if (e.is_dir() and e.name not in _SKIP_PARTS) or e.name.endswith("_scraper.py")
+    )
+
+
+def _scan(root: Path) -> Tuple[List[Path], Dict[str, int]]:
+    """Scraper paths in rglob order, plus the mtime of every scanned subdirectory."""
+    dirs: Dict[str, int] = {}
+    for dirpath, dirnames, _ in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in _SKIP_PARTS]
+        if dirpath != str(root):
+            dirs[os.path.relpath(dirpath, root)] = os.stat(dirpath).st_mtime_ns
+    return list(_iter_scraper_paths(root)), dirs
+
+
+def build_registry_cache(root: Path | None = None) -> List[Path]:
+    """Scan root and write <root>/_registry_cache.json; returns the scraper paths."""
+    root = root or SCRAPERS_DIR
+    paths, dirs = _scan(root)
+    data = {
+        "root": _root_entries(root),
+        "dirs": dirs,
+        "scrapers": [str(p.relative_to(root)) for p in paths],
+    }
+    cache = root / REGISTRY_CACHE_NAME
+    tmp = cache.with_name(f"{cache.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp, cache)
+    except OSError:
+        pass  # read-only checkout: the cache is only an optimisation
+    finally:
+        tmp.unlink(missing_ok=True)
+    return paths
+
+
+def _cached_scraper_paths(root: Path) -> List[Path]:
+    """Scraper paths from the registry cache, rebuilding it if any scanned directory changed."""
+    try:
+        data = json.loads((root / REGISTRY_CACHE_NAME).read_text(encoding="utf-8"))
+        # root's own mtime moves whenever the cache file itself is written, so root
+        # is compared by its relevant entries; a file added/removed anywhere below
+        # bumps its directory's mtime
+        if data["root"] != _root_entries(root):
+            raise ValueError("stale")
+        for rel, mtime in data["dirs"].items():
+            if os.stat(root / rel).st_mtime_ns != mtime:
+                raise ValueError("stale")
+        return [root / rel for rel in data["scrapers"]]
+    except (OSError, ValueError, KeyError, TypeError):
+        return build_registry_cache(root)
+
+
+def discover(root: Path | None = None, lazy: bool = False) -> Dict[str, Any]:
     """
     Discover generated scraper modules under scrapers/ and return {source_id: module}.
+
+    With lazy=True the values are LazyScraper objects and no module is imported
+    until it is used; paths come from the registry cache.
     """
     root = root or SCRAPERS_DIR
+    if lazy:
+        if not root.exists():
+            return {}
+        return {path.stem: LazyScraper(path) for path in _cached_scraper_paths(root)}
     found: Dict[str, ModuleType] = {}
     for path in _iter_scraper_paths(root):
         mod = _load_module_from_path(path)
         src_id = path.stem  # filename without .py
         found[src_id] = mod
     return found
+
+
+if __name__ == "__main__":
+    print(f"Cached {len(build_registry_cache())} scraper path(s) in {SCRAPERS_DIR / REGISTRY_CACHE_NAME}")
@@ -7,7 +7,8 @@ Mount via: FastAPI(include_router(admin.router)).
 
 What this does:
   - POST /admin/ingest
-      Run one-shot ingestion (calls app.services.ingest.run_ingest_once).
+      Run one-shot ingestion (awaits app.services.ingest.run_ingest_once_async, so
+      all sources are fetched concurrently without pinning a threadpool worker).
   - POST /admin/alerts/test?to=EMAIL
       Trigger test alert email (calls app.services.alerts.notify).
   - POST /admin/sources/toggle?name=...&active=true|false
@@ -40,17 +41,17 @@ from sqlalchemy.orm import Session
 
 from app.db.session import get_db
 from app.db.models import Source, Document
-from app.services.ingest import run_ingest_once
+from app.services.ingest import run_ingest_once_async
 from app.services.alerts import notify
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
 @router.post("/ingest")
-def ingest(db: Session = Depends(get_db)):
+async def ingest(db: Session = Depends(get_db)):
     """Run a one-time ingest cycle."""
     try:
-        stats = run_ingest_once(db)
+        stats = await run_ingest_once_async(db)
         return {"ok": True, "stats": stats}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Ingest failed: {type(e).__name__}: {e}")
@@ -34,7 +34,7 @@ import csv, io
 from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
 
-from app.schemas import DocumentOut
+from app.schemas import DocumentOut, DocumentOutList
 from app.db.session import get_db
 from app.db.crud import search_documents
 
@@ -52,7 +52,7 @@ def list_documents(
     db: Session = Depends(get_db),
 ):
     """Search documents with optional filters and pagination."""
-    return search_documents(
+    rows = search_documents(
         db,
         q=q,
         jurisdiction=jurisdiction,
@@ -61,6 +61,10 @@ def list_documents(
         limit=min(limit, 200),
         offset=offset,
     )
+    # Validate + serialize in one Rust-side pass; returning a Response skips
+    # FastAPI's second validation/jsonable_encoder round over response_model.
+    docs = DocumentOutList.validate_python(rows, from_attributes=True)
+    return Response(content=DocumentOutList.dump_json(docs, by_alias=True), media_type="application/json")
 
 
 @router.get("/export.csv")
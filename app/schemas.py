@@ -8,14 +8,16 @@ Covers:
   - Alerts (create, output)
 
 Notes:
-  - Uses `from_attributes = True` for ORM → Pydantic conversion.
+  - Uses `model_config = ConfigDict(from_attributes=True)` for ORM → Pydantic conversion.
   - `DocumentOut.metadata` maps from ORM field `meta`.
+  - `DocumentOutList` is a prebuilt TypeAdapter so routes can validate and
+    serialize lists in one pass via the Rust-backed `dump_json()`.
 """
 
 from __future__ import annotations
 from datetime import datetime
 from typing import Optional, Any, Dict
-from pydantic import BaseModel, Field, AliasChoices
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, TypeAdapter
 
 # ----------------------------
 # Sources
@@ -34,8 +36,7 @@ class SourceOut(SourceCreate):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
 
 
 # ----------------------------
@@ -54,13 +55,16 @@ class DocumentOut(BaseModel):
     metadata: Optional[Dict[str, Any]] = Field(
         default=None,
         validation_alias=AliasChoices("meta", "metadata"),
+        serialization_alias="metadata",
     )
 
     jurisdiction: Optional[str] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+
+DocumentOutList = TypeAdapter(list[DocumentOut])
 
 
 class DocumentQuery(BaseModel):
@@ -86,5 +90,4 @@ class AlertOut(AlertCreate):
     id: int
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
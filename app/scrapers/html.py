@@ -10,7 +10,8 @@ However, some older code and tests may still do:
 
     from app.scrapers.html import run_html
 
-This shim re-exports run_html from html_utils.py to avoid breaking imports.
+This shim re-exports run_html (and run_html_async) from html_utils.py to
+avoid breaking imports.
 
 Usage:
 ------
@@ -19,6 +20,6 @@ Usage:
     from app.scrapers.html_utils import run_html
 """
 
-from .html_utils import run_html  # re-export
+from .html_utils import run_html, run_html_async  # re-export
 
-__all__ = ["run_html"]
+__all__ = ["run_html", "run_html_async"]
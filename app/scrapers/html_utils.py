@@ -14,6 +14,10 @@ What this does:
 
 Key pieces:
   - run_html(db, src): entry point. Chooses site-specific vs generic parser.
+  - run_html_async(db, src, client): same, fetching on a shared httpx client.
+  - _parse_page(): parses with selectolax (lexbor) when installed, otherwise
+    BeautifulSoup (lxml builder, else html.parser); both backends expose
+    anchors(), parent_text(), json_ld(). Each page is parsed exactly once.
   - _parse_rrc_news(): robust URL filtering for rrc.texas.gov/news with date parsing
     from URL patterns (/news/YYYYMMDD-… or /news/MMDDYY-…).
   - _generic_html(): JSON-LD first, then anchor fallback with loose date parsing.
@@ -37,24 +41,41 @@ Common examples (pseudo-usage):
       run_html(db, src)
 
 Notes:
+  - Conditional GETs (ETag / Last-Modified) + a body hash stored on Source let
+    unchanged pages skip download and parsing on scheduled runs.
   - DATE_PAT matches "Month DD, YYYY" anywhere in nearby text.
   - Titles are cleaned to normalize curly quotes/dashes.
   - If no publish date is found, the document is stored without published_at.
 """
 from __future__ import annotations
 
-import re, json, html
+import asyncio, re, html
 from datetime import datetime
-from urllib.parse import urljoin, urlparse
+from functools import lru_cache
+from urllib.parse import urljoin, urlparse, urlsplit
 
+import orjson
 from bs4 import BeautifulSoup
 from sqlalchemy.orm import Session
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except Exception:  # pragma: no cover - selectolax is optional; BeautifulSoup is the fallback
+    LexborHTMLParser = None
+
+try:
+    import lxml  # noqa: F401
+    _SOUP_PARSER = "lxml"
+except Exception:  # pragma: no cover - pure-Python tree builder as the last resort
+    _SOUP_PARSER = "html.parser"
+
 from app.db.crud import create_or_update_doc
 from app.db.models import Source
-from app.scrapers.http import make_session
+from app.scrapers.http import body_hash, conditional_headers, make_session, remember_fetch
 
 DATE_PAT = re.compile(r"\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},\s+\d{4}\b")
+# RRC article URLs: /news/YYYYMMDD-... or /news/MMDDYY-...
+_RRC_NEWS_DATE_RE = re.compile(r"/news/(\d{8}|\d{6})-")
 
 
 def _clean_title(s: str) -> str:
@@ -71,15 +92,40 @@ def _clean_title(s: str) -> str:
     return s
 
 
-def _same_host(href: str, base: str) -> bool:
+def _base_parts(base: str) -> tuple[str, str]:
+    """(origin, netloc) of the source URL, parsed once per page."""
+    u = urlsplit(base)
+    return f"{u.scheme}://{u.netloc}", u.netloc
+
+
+def _local_href(href: str, base: str, origin: str, base_host: str) -> tuple[str, str] | None:
+    """
+    Resolve a root-relative href and check it stays on base_host, parsing it at most once.
+    Returns (href, path), or None for links to another host. Root-relative hrefs are
+    joined to `origin` by concatenation (no urljoin/urlparse of the base per anchor);
+    scheme-relative ("//host/...") hrefs take the base's scheme. Unparseable hrefs
+    are kept with an empty path.
+    """
+    if href.startswith("//"):
+        href = urljoin(base, href)
+    elif href[0] == "/":
+        if "/." in href:  # dot segments: let urljoin normalize them
+            href = urljoin(base, href)
+            return href, urlsplit(href).path
+        path = href.partition("#")[0].partition("?")[0]
+        return origin + href, path
     try:
-        a, b = urlparse(href), urlparse(base)
-        return (a.netloc == "" or a.netloc == b.netloc)
-    except Exception:
-        return True
+        u = urlsplit(href)
+    except ValueError:
+        return href, ""
+    if u.netloc and u.netloc != base_host:
+        return None
+    return href, u.path
 
 
+@lru_cache(maxsize=1024)
 def _try_parse_date_text(text: str) -> datetime | None:
+    # cached: sibling anchors share parent text, and pages repeat date strings
     m = DATE_PAT.search(text or "")
     if m:
         try:
@@ -89,6 +135,66 @@ def _try_parse_date_text(text: str) -> datetime | None:
     return None
 
 
+# ---------- Parser backends ----------
+# Both expose the only things the parsers below need: (href, text, parent) for
+# every <a href>, the text of an anchor's parent, and raw JSON-LD script bodies.
+# parent_text() is memoized per parent node: sibling anchors under one <li>/<p>
+# would otherwise re-walk and re-join the same subtree once per anchor.
+class _LexborPage:
+    """selectolax/lexbor-backed page (C parser; much faster than BeautifulSoup)."""
+
+    def __init__(self, markup: str):
+        self.tree = LexborHTMLParser(markup)
+        self._parent_text: dict[int, str] = {}
+
+    def anchors(self):
+        for a in self.tree.css("a[href]"):
+            href = (a.attributes.get("href") or "").strip()
+            title = a.text(separator=" ", strip=True).strip()
+            yield href, title, a.parent
+
+    def parent_text(self, parent) -> str:
+        # Node wrappers are recreated on each access; mem_id is the stable identity
+        key = parent.mem_id
+        txt = self._parent_text.get(key)
+        if txt is None:
+            txt = self._parent_text[key] = parent.text(separator=" ", strip=True).strip()
+        return txt
+
+    def json_ld(self):
+        for tag in self.tree.css('script[type="application/ld+json"]'):
+            yield tag.text()
+
+
+class _SoupPage:
+    """BeautifulSoup fallback when selectolax is not installed (lxml tree builder when available)."""
+
+    def __init__(self, markup: str):
+        self.soup = BeautifulSoup(markup, _SOUP_PARSER)
+        self._parent_text: dict[int, str] = {}
+
+    def anchors(self):
+        for a in self.soup.select("a[href]"):
+            href = (a.get("href") or "").strip()
+            title = (a.get_text(" ", strip=True) or "").strip()
+            yield href, title, a.find_parent()
+
+    def parent_text(self, parent) -> str:
+        key = id(parent)
+        txt = self._parent_text.get(key)
+        if txt is None:
+            txt = self._parent_text[key] = parent.get_text(" ", strip=True)
+        return txt
+
+    def json_ld(self):
+        for tag in self.soup.find_all("script", {"type": "application/ld+json"}):
+            yield str(tag.string or "")
+
+
+def _parse_page(markup: str):
+    return _LexborPage(markup) if LexborHTMLParser is not None else _SoupPage(markup)
+
+
 def _ingest_doc(db: Session, src: Source, title: str, href: str, published_at: datetime | None):
     create_or_update_doc(
         db,
@@ -103,169 +209,164 @@ def _ingest_doc(db: Session, src: Source, title: str, href: str, published_at: d
 
 
 # ---------- Site-specific: Texas RRC ----------
-_RRC_BAD_PATH_PREFIXES = (
-    "/about-us",
-    "/apps",
-    "/forms",
-    "/resource-center",
-    "/general-counsel",
-    "/surface-mining",
-    "/gas-services",
-    "/pipeline-safety",
-    "/critical-infrastructure",
-    "/contact-us",
-    "/hearings",
-    "/legal",
-    "/public-engagement",
-    "/oil-and-gas",
-    "/site-policies",
-    "/newsletters",
-    "/announcements",
-)
-
-
-def _parse_rrc_news(db: Session, src: Source, soup: BeautifulSoup):
+def _parse_rrc_news(db: Session, src: Source, page):
     base = src.url
-    seen = set()
+    origin, base_host = _base_parts(base)
+    seen = set()  # exact on purpose: a probabilistic filter's false positive would drop a real article
+    seen_add = seen.add
 
     # Keep only /news/... links. RRC article URLs look like /news/MMDDYY-... or /news/YYYYMMDD-...
-    anchors = soup.select("a[href]")
-    for a in anchors:
-        href = (a.get("href") or "").strip()
-        title = (a.get_text(" ", strip=True) or "").strip()
-        if not href or not title:
+    # Everything else (nav/utility pages, hash-only links) is dropped.
+    for href, title, parent in page.anchors():
+        if not href or not title or href[0] == "#":
             continue
 
-        if href.startswith("/"):
-            href = urljoin(base, href)
-        if not _same_host(href, base):
+        local = _local_href(href, base, origin, base_host)
+        if local is None:
             continue
-
-        p = urlparse(href).path or ""
-        if not p.startswith("/news/"):
-            # exclude obvious nav/utility
-            if p.startswith(_RRC_BAD_PATH_PREFIXES) or p in ("/", ""):
-                continue
-            # also drop anchors and hash-only links
-            if href.endswith("#") or href.startswith("#"):
-                continue
+        href, p = local
+        if not p.startswith("/news/") or href in seen:
             continue
+        seen_add(href)
 
-        if href in seen:
-            continue
-        seen.add(href)
-
-        # Try date from URL: /news/MMDDYY-... or /news/YYYYMMDD-...
+        # Try date from URL: /news/YYYYMMDD-... or /news/MMDDYY-...
         pub = None
-        m6 = re.search(r"/news/(\d{6})-", p)  # e.g., 090525 => 2025-09-05 (MMDDYY)
-        m8 = re.search(r"/news/(\d{8})-", p)  # e.g., 20250113 => 2025-01-13 (YYYYMMDD)
-        if m8:
-            y, m, d = m8.group(1)[0:4], m8.group(1)[4:6], m8.group(1)[6:8]
-            try:
-                pub = datetime(int(y), int(m), int(d))
-            except Exception:
-                pass
-        elif m6:
-            mm, dd, yy = m6.group(1)[0:2], m6.group(1)[2:4], m6.group(1)[4:6]
-            # Assume 20YY (good enough for current content)
+        m = _RRC_NEWS_DATE_RE.search(p)
+        if m:
+            g = m.group(1)
             try:
-                pub = datetime(2000 + int(yy), int(mm), int(dd))
-            except Exception:
+                if len(g) == 8:  # e.g., 20250113 => 2025-01-13 (YYYYMMDD)
+                    pub = datetime(int(g[0:4]), int(g[4:6]), int(g[6:8]))
+                else:  # e.g., 090525 => 2025-09-05 (MMDDYY); assume 20YY
+                    pub = datetime(2000 + int(g[4:6]), int(g[0:2]), int(g[2:4]))
+            except ValueError:
                 pass
 
         if pub is None:
-            # fallback: nearby text
-            block = a.find_parent()
-            pub = _try_parse_date_text(block.get_text(" ", strip=True) if block else title)
+            # fallback: anchor text, then nearby text
+            pub = _try_parse_date_text(title)
+            if pub is None and parent is not None:
+                pub = _try_parse_date_text(page.parent_text(parent))
 
         _ingest_doc(db, src, title, href, pub)
 
 
 # ---------- Generic parser with JSON-LD fallback ----------
-def _generic_html(db: Session, src: Source, soup: BeautifulSoup):
+_LD_ARTICLE_TYPES = ("NewsArticle", "BlogPosting", "Article")
+
+
+def _iter_ld_articles(root):
+    """
+    Yield article dicts from a parsed JSON-LD document, in document order.
+    Iterative (explicit stack) rather than recursive; matched articles are not
+    descended into, since their nested author/publisher objects aren't articles.
+    """
+    stack = [root]
+    pop, extend = stack.pop, stack.extend
+    while stack:
+        o = pop()
+        if isinstance(o, dict):
+            if o.get("@type") in _LD_ARTICLE_TYPES:
+                yield o
+                continue
+            extend(reversed(o.values()))
+        elif isinstance(o, list):
+            extend(reversed(o))
+
+
+def _generic_html(db: Session, src: Source, page):
     base = src.url
-    seen = set()
+    origin, base_host = _base_parts(base)
+    seen = set()  # exact, as in _parse_rrc_news
     found_any = False
 
     # 1) JSON-LD NewsArticle / BlogPosting
-    for tag in soup.find_all("script", {"type": "application/ld+json"}):
+    for raw in page.json_ld():
+        if not raw:
+            continue
         try:
-            data = json.loads(tag.string or "")
+            data = orjson.loads(raw)
         except Exception:
             continue
 
-        def iter_items(obj):
-            if isinstance(obj, dict):
-                yield obj
-                for v in obj.values():
-                    yield from iter_items(v)
-            elif isinstance(obj, list):
-                for v in obj:
-                    yield from iter_items(v)
-
-        for item in iter_items(data):
-            if not isinstance(item, dict):
+        for item in _iter_ld_articles(data):
+            title = item.get("headline") or item.get("name")
+            href = item.get("url") or item.get("mainEntityOfPage") or ""
+            if not title or not href or not isinstance(href, str):
                 continue
-            tp = item.get("@type")
-            if tp in ("NewsArticle", "BlogPosting", "Article"):
-                title = item.get("headline") or item.get("name")
-                href = item.get("url") or item.get("mainEntityOfPage") or ""
-                if not title or not href:
-                    continue
-                if href.startswith("/"):
-                    href = urljoin(base, href)
-                if not _same_host(href, base):
-                    continue
-                if href in seen:
-                    continue
-                seen.add(href)
-
-                pub = None
-                for key in ("datePublished", "dateCreated", "dateModified"):
-                    if item.get(key):
-                        try:
-                            val = str(item[key]).split("T")[0]
-                            pub = datetime.fromisoformat(val)
-                            break
-                        except Exception:
-                            pass
-
-                _ingest_doc(db, src, title, href, pub)
-                found_any = True
+            local = _local_href(href, base, origin, base_host)
+            if local is None:
+                continue
+            href = local[0]
+            if href in seen:
+                continue
+            seen.add(href)
+
+            pub = None
+            for key in ("datePublished", "dateCreated", "dateModified"):
+                if item.get(key):
+                    try:
+                        val = str(item[key]).split("T")[0]
+                        pub = datetime.fromisoformat(val)
+                        break
+                    except Exception:
+                        pass
+
+            _ingest_doc(db, src, title, href, pub)
+            found_any = True
 
     # 2) Anchor fallback
     if not found_any:
-        anchors = soup.select("a[href]")
-        for a in anchors:
-            href = (a.get("href") or "").strip()
-            title = (a.get_text(" ", strip=True) or "").strip()
+        for href, title, parent in page.anchors():
             if not href or not title:
                 continue
-            if href.startswith("/"):
-                href = urljoin(base, href)
-            if not _same_host(href, base):
+            local = _local_href(href, base, origin, base_host)
+            if local is None:
                 continue
+            href = local[0]
             if href in seen:
                 continue
             seen.add(href)
 
-            block = a.find_parent()
-            pub = _try_parse_date_text(block.get_text(" ", strip=True) if block else title)
+            pub = _try_parse_date_text(title)
+            if pub is None and parent is not None:
+                pub = _try_parse_date_text(page.parent_text(parent))
             _ingest_doc(db, src, title, href, pub)
 
 
+def _ingest_html(db: Session, src: Source, r) -> None:
+    """Parse an already-fetched response (requests or httpx) and upsert its documents."""
+    if r.status_code == 304:
+        return
+    r.raise_for_status()
+    if body_hash(r.content) == getattr(src, "content_hash", None):
+        return
+    page = _parse_page(r.text)
+
+    host = urlparse(src.url).netloc.lower()
+    if host.endswith("rrc.texas.gov"):
+        _parse_rrc_news(db, src, page)
+    else:
+        _generic_html(db, src, page)
+    remember_fetch(db, src, r)
+
+
 def run_html(db: Session, src: Source):
     """
     Fetch src.url, parse HTML, and upsert Document records.
     Chooses site-specific RRC parser when host ends with rrc.texas.gov; otherwise generic.
+    Skips parsing entirely when the server answers 304 or the body is byte-identical
+    to the last ingested fetch.
     """
     s = make_session()
-    r = s.get(src.url, timeout=20, allow_redirects=True)
-    r.raise_for_status()
-    soup = BeautifulSoup(r.text, "html.parser")
+    r = s.get(src.url, timeout=20, allow_redirects=True, headers=conditional_headers(src))
+    _ingest_html(db, src, r)
 
-    host = urlparse(src.url).netloc.lower()
-    if host.endswith("rrc.texas.gov"):
-        _parse_rrc_news(db, src, soup)
-    else:
-        _generic_html(db, src, soup)
+
+async def run_html_async(db: Session, src: Source, client) -> None:
+    """
+    Async variant of run_html: fetch on a shared httpx.AsyncClient, then parse
+    and upsert in the default executor so the event loop keeps fetching.
+    """
+    r = await client.get(src.url, timeout=20, headers=conditional_headers(src))
+    await asyncio.get_running_loop().run_in_executor(None, _ingest_html, db, src, r)
@@ -18,14 +18,34 @@ Usage:
     r.raise_for_status()
     print(r.text)
 
+Conditional fetches:
+--------------------
+    from app.scrapers.http import conditional_headers, body_hash, remember_fetch
+
+    r = session.get(src.url, headers=conditional_headers(src))
+    if r.status_code == 304 or body_hash(r.content) == src.content_hash:
+        return  # unchanged since last ingest
+    ...  # parse + ingest
+    remember_fetch(db, src, r)
+
+Async fetches (one pooled client shared across sources):
+---------------------------------------------------------
+    from app.scrapers.http import make_async_client
+
+    async with make_async_client() as client:
+        r = await client.get(src.url, headers=conditional_headers(src))
+
 Notes:
 ------
 - Retries: 3 attempts, exponential backoff (0.5s, 1s, 2s)
 - Allowed retry methods: GET, HEAD
 - Uses Chrome-like UA string with project identifier
+- The async client speaks HTTP/2 when `h2` is installed (httpx[http2]);
+  its retries cover connection failures only, not 5xx responses
 """
 
 from __future__ import annotations
+import hashlib
 from typing import Optional
 
 import certifi
@@ -33,6 +53,11 @@ import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+try:
+    import httpx
+except Exception:  # pragma: no cover - only needed for async ingest
+    httpx = None
+
 
 DEFAULT_HEADERS = {
     "User-Agent": (
@@ -72,3 +97,41 @@ def make_session(headers: Optional[dict] = None) -> requests.Session:
     # Use certifi CA bundle
     s.verify = certifi.where()
     return s
+
+
+def make_async_client(headers: Optional[dict] = None, max_connections: int = 16) -> "httpx.AsyncClient":
+    """Return a pooled httpx.AsyncClient (HTTP/2 when available) for async scraper use."""
+    if httpx is None:
+        raise RuntimeError("httpx is not installed; async fetching is unavailable")
+    h = DEFAULT_HEADERS.copy()
+    if headers:
+        h.update(headers)
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=3,
+        verify=certifi.where(),
+        limits=httpx.Limits(max_connections=max_connections),
+    )
+    return httpx.AsyncClient(headers=h, transport=transport, follow_redirects=True)
+
+
+def conditional_headers(src) -> dict:
+    """If-None-Match / If-Modified-Since headers from a Source's last fetch."""
+    h = {}
+    if getattr(src, "etag", None):
+        h["If-None-Match"] = src.etag
+    if getattr(src, "last_modified", None):
+        h["If-Modified-Since"] = src.last_modified
+    return h
+
+
+def body_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def remember_fetch(db, src, r) -> None:
+    """Persist validators + body hash after a successful ingest of `r` (requests or httpx response)."""
+    src.etag = r.headers.get("ETag")
+    src.last_modified = r.headers.get("Last-Modified")
+    src.content_hash = body_hash(r.content)
+    db.add(src); db.commit()
@@ -5,25 +5,33 @@ RSS/Atom feed scraper with HTML fallback.
 
 Features:
 ---------
-- Parses standard RSS/Atom feeds using `feedparser`
+- Parses RSS/Atom feeds with the streaming lxml parser (`rss_fast`),
+  falling back to `feedparser` for feeds lxml cannot read
 - Extracts title, link, published date, summary, tags
 - Falls back to HTML scraping if:
   * Content-Type looks like HTML
-  * Or feedparser raises a parsing error (bozo flag)
+  * Or both parsers fail (lxml syntax error + feedparser bozo flag)
 - Stores results in the database via `create_or_update_doc`
+- Skips unchanged feeds (304 Not Modified or identical body hash)
 
 Usage:
 ------
     from app.scrapers.rss import run_rss
     run_rss(db, source)
 
+    # or, on a shared httpx.AsyncClient (see app.scrapers.http.make_async_client)
+    await run_rss_async(db, source, client)
+
 Notes:
 ------
-- Feedparser is robust but some feeds may serve HTML error pages instead.
-- For resilience, fallback to `run_html` ensures we still ingest content.
+- lxml is strict; feedparser is slower but tolerant of malformed XML.
+- Some feeds may serve HTML error pages instead.
+- For resilience, fallback to HTML parsing ensures we still ingest content;
+  the already-fetched response is reused rather than downloaded again.
 """
 
 from __future__ import annotations
+import asyncio
 from datetime import datetime
 from typing import Optional
 
@@ -32,8 +40,9 @@ from sqlalchemy.orm import Session
 
 from app.db.crud import create_or_update_doc
 from app.db.models import Source
-from app.scrapers.http import make_session
-from app.scrapers.html import run_html  # fallback
+from app.scrapers.http import body_hash, conditional_headers, make_session, remember_fetch
+from app.scrapers import rss_fast
+from app.scrapers.html_utils import _ingest_html  # fallback
 
 
 def parse_dt(entry) -> Optional[datetime]:
@@ -46,6 +55,18 @@ def parse_dt(entry) -> Optional[datetime]:
     return None
 
 
+def _feedparser_item(entry) -> dict:
+    """Map a feedparser entry to the item shape produced by rss_fast.parse."""
+    return {
+        "title": getattr(entry, "title", "(untitled)"),
+        "link": getattr(entry, "link", None),
+        "published_at": parse_dt(entry),
+        "summary": getattr(entry, "summary", None),
+        "id": getattr(entry, "id", None),
+        "tags": getattr(entry, "tags", None),
+    }
+
+
 def _looks_like_html(content_type: str | None, body: bytes) -> bool:
     """Heuristic: determine if response body is HTML rather than XML feed."""
     if content_type and ("html" in content_type.lower()):
@@ -54,44 +75,63 @@ def _looks_like_html(content_type: str | None, body: bytes) -> bool:
     return b"<html" in head or b"<!doctype html" in head
 
 
-def run_rss(db: Session, src: Source):
-    """
-    Ingest documents from an RSS/Atom feed.
-    Falls back to HTML scraping if feed is invalid or mis-served.
-    """
-    s = make_session()
-    r = s.get(src.url, timeout=25, allow_redirects=True)
+def _ingest_rss(db: Session, src: Source, r) -> None:
+    """Parse an already-fetched feed response (requests or httpx) and upsert its items."""
+    if r.status_code == 304:
+        return
     r.raise_for_status()
+    if body_hash(r.content) == getattr(src, "content_hash", None):
+        return
 
     if _looks_like_html(r.headers.get("Content-Type"), r.content):
         # Many sites return HTML error pages to bots → fallback to HTML scraping
-        run_html(db, src)
+        _ingest_html(db, src, r)
         return
 
-    feed = feedparser.parse(r.content)
-    if feed.bozo and getattr(feed, "bozo_exception", None):
-        # If RSS parsing fails, fallback to HTML scraping once
-        run_html(db, src)
-        return
+    items = rss_fast.parse(r.content)
+    if items is None:
+        feed = feedparser.parse(r.content)
+        if feed.bozo and getattr(feed, "bozo_exception", None):
+            # If RSS parsing fails, fallback to HTML scraping once
+            _ingest_html(db, src, r)
+            return
+        items = [_feedparser_item(e) for e in feed.entries or []]
 
-    for e in feed.entries or []:
-        title = getattr(e, "title", "(untitled)")
-        link = getattr(e, "link", None)
+    for item in items:
+        link = item["link"]
         if not link:
             continue
-        published_at = parse_dt(e)
-        snippet = getattr(e, "summary", None)
         metadata = {
-            "rss_id": getattr(e, "id", None),
-            "tags": getattr(e, "tags", None),
+            "rss_id": item["id"],
+            "tags": item["tags"],
         }
         create_or_update_doc(
             db,
             source_id=src.id,
-            title=title,
+            title=item["title"],
             url=link,
-            published_at=published_at,
-            text=snippet,
+            published_at=item["published_at"],
+            text=item["summary"],
             metadata=metadata,
             jurisdiction=src.jurisdiction,
         )
+    remember_fetch(db, src, r)
+
+
+def run_rss(db: Session, src: Source):
+    """
+    Ingest documents from an RSS/Atom feed.
+    Falls back to HTML scraping if feed is invalid or mis-served.
+    """
+    s = make_session()
+    r = s.get(src.url, timeout=25, allow_redirects=True, headers=conditional_headers(src))
+    _ingest_rss(db, src, r)
+
+
+async def run_rss_async(db: Session, src: Source, client) -> None:
+    """
+    Async variant of run_rss: fetch on a shared httpx.AsyncClient, then parse
+    and upsert in the default executor so the event loop keeps fetching.
+    """
+    r = await client.get(src.url, timeout=25, headers=conditional_headers(src))
+    await asyncio.get_running_loop().run_in_executor(None, _ingest_rss, db, src, r)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# app/scrapers/rss_fast.py
+"""
+Streaming RSS/Atom parser built on `lxml.etree.iterparse`.
+
+Features:
+---------
+- Walks <item> (RSS 0.9x/1.0/2.0) and <entry> (Atom) elements in one pass
+- Extracts title, link, published date, summary, id/guid, categories
+- Clears each element after use so memory stays flat on large feeds
+- Returns None when lxml is unavailable or the document is not well-formed,
+  so callers can fall back to `feedparser`
+
+Usage:
+------
+    from app.scrapers.rss_fast import parse
+
+    items = parse(r.content)
+    if items is None:
+        ...  # fall back to feedparser
+
+Item shape:
+-----------
+    {
+      "title": str,
+      "link": str | None,
+      "published_at": datetime | None,   # naive UTC, like feedparser's *_parsed
+      "summary": str | None,
+      "id": str | None,
+      "tags": list[{"term", "scheme", "label"}] | None,
+    }
+"""
+
+from __future__ import annotations
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from io import BytesIO
+from typing import Optional
+
+try:
+    from lxml import etree
+except Exception:  # pragma: no cover - lxml is optional; feedparser remains the fallback
+    etree = None
+
+
+_ITEM_TAGS = ("{*}item", "{*}entry")
+_DATE_TAGS = ("{*}pubDate", "{*}published", "{*}date", "{*}issued", "{*}updated", "{*}modified")
+
+
+def _text(elem, tag: str) -> Optional[str]:
+    child = elem.find(tag)
+    if child is None:
+        return None
+    # itertext(): Atom type="xhtml" titles/summaries keep their text in child elements
+    return "".join(child.itertext()).strip() or None
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse RFC 822 (RSS) or ISO 8601 (Atom/Dublin Core) dates to naive UTC."""
+    if not value:
+        return None
+    try:
+        dt = parsedate_to_datetime(value)
+    except Exception:
+        try:
+            dt = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _link(elem) -> Optional[str]:
+    # Atom: <link rel="alternate" href="..."/> (rel defaults to alternate)
+    fallback = None
+    for child in elem.iterfind("{*}link"):
+        href = child.get("href")
+        if href:
+            if child.get("rel", "alternate") == "alternate":
+                return href.strip()
+            fallback = fallback or href.strip()
+        elif child.text and child.text.strip():
+            return child.text.strip()
+    return fallback
+
+
+def _tags(elem) -> Optional[list]:
+    tags = []
+    for cat in elem.iterfind("{*}category"):
+        term = cat.get("term") or (cat.text or "").strip()
+        if term:
+            tags.append({"term": term, "scheme": cat.get("scheme") or cat.get("domain"), "label": cat.get("label")})
+    return tags or None
+
+
+def _item(elem) -> dict:
+    published = None
+    for tag in _DATE_TAGS:
+        published = _parse_date(_text(elem, tag))
+        if published:
+            break
+    return {
+        "title": _text(elem, "{*}title") or "(untitled)",
+        "link": _link(elem),
+        "published_at": published,
+        "summary": _text(elem, "{*}description") or _text(elem, "{*}summary") or _text(elem, "{*}content"),
+        "id": _text(elem, "{*}guid") or _text(elem, "{*}id"),
+        "tags": _tags(elem),
+    }
+
+
+def parse(content: bytes) -> Optional[list[dict]]:
+    """
+    Parse an RSS/Atom document into a list of item dicts.
+
+    Returns None if lxml is not installed or the XML is malformed.
+    """
+    if etree is None:
+        return None
+    items: list[dict] = []
+    try:
+        for _, elem in etree.iterparse(
+            BytesIO(content),
+            events=("end",),
+            tag=_ITEM_TAGS,
+            resolve_entities=False,
+            no_network=True,
+        ):
+            items.append(_item(elem))
+            elem.clear()
+            # drop already-processed siblings so the tree doesn't keep growing
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+    except etree.XMLSyntaxError:
+        return None
+    return items
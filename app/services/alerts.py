@@ -38,11 +38,13 @@ import smtplib
 from email.message import EmailMessage
 from typing import List
 
-from sqlalchemy import and_, or_, select
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.orm import Session
 
 from ..db.models import Alert, Document
 
+MAX_MATCHES_PER_ALERT = 20
+
 
 def find_matches(db: Session):
     """
@@ -51,54 +53,87 @@ def find_matches(db: Session):
     Matching logic:
       - Document.title ILIKE '%keyword%' OR Document.text ILIKE '%keyword%'
       - If Alert.jurisdiction is set, require documents to match it
-      - Up to 20 most recent docs per alert
+      - Up to MAX_MATCHES_PER_ALERT most recent docs per alert
+
+    All alerts are matched in a single statement (alerts joined against
+    documents, capped per alert with ROW_NUMBER()), so the cost is one
+    round-trip regardless of how many alerts are active.
     """
-    alerts = db.execute(select(Alert).where(Alert.active == True)).scalars().all()  # noqa: E712
-    matched: list[tuple[Alert, Document]] = []
-    for a in alerts:
-        like = f"%{a.keyword}%"
-        q = (
-            select(Document)
-            .where(
-                and_(
-                    or_(Document.title.ilike(like), Document.text.ilike(like)),
-                    (Document.jurisdiction == a.jurisdiction) if a.jurisdiction else True,
-                )
+    like = "%" + Alert.keyword + "%"
+    rn = (
+        func.row_number()
+        .over(partition_by=Alert.id, order_by=Document.id.desc())
+        .label("rn")
+    )
+    pairs = (
+        select(Alert.id.label("alert_id"), Document.id.label("doc_id"), rn)
+        .select_from(Alert)
+        .join(Document, or_(Document.title.ilike(like), Document.text.ilike(like)))
+        .where(
+            and_(
+                Alert.active == True,  # noqa: E712
+                or_(
+                    Alert.jurisdiction.is_(None),
+                    Alert.jurisdiction == "",
+                    Document.jurisdiction == Alert.jurisdiction,
+                ),
             )
-            .order_by(Document.id.desc())
-            .limit(20)
         )
-        for doc in db.execute(q).scalars():
-            matched.append((a, doc))
-    return matched
-
-
-def send_email(subject: str, body: str, to_addr: str) -> None:
-    """
-    Send a plain-text email using SMTP settings from environment.
-
-    Env:
-      SMTP_HOST, SMTP_PORT, SMTP_FROM
-    """
+        .subquery()
+    )
+    q = (
+        select(Alert, Document)
+        .join(pairs, pairs.c.alert_id == Alert.id)
+        .join(Document, Document.id == pairs.c.doc_id)
+        .where(pairs.c.rn <= MAX_MATCHES_PER_ALERT)
+        .order_by(Alert.id, Document.id.desc())
+    )
+    return [(a, doc) for a, doc in db.execute(q).all()]
+
+
+def _smtp_settings() -> tuple[str, int, str]:
+    """Return (host, port, sender) from SMTP_* environment variables."""
     host = os.getenv("SMTP_HOST", "localhost")
     port = int(os.getenv("SMTP_PORT", "25"))
     sender = os.getenv("SMTP_FROM", "alerts@regulatorydatabridge.com")
+    return host, port, sender
+
 
+def _build_message(subject: str, body: str, to_addr: str, sender: str) -> EmailMessage:
     msg = EmailMessage()
     msg["From"] = sender
     msg["To"] = to_addr
     msg["Subject"] = subject
     msg.set_content(body)
+    return msg
 
+
+def send_email(subject: str, body: str, to_addr: str) -> None:
+    """
+    Send a plain-text email using SMTP settings from environment.
+
+    Env:
+      SMTP_HOST, SMTP_PORT, SMTP_FROM
+    """
+    host, port, sender = _smtp_settings()
     with smtplib.SMTP(host, port) as s:
-        s.send_message(msg)
+        s.send_message(_build_message(subject, body, to_addr, sender))
 
 
 def notify(db: Session, to_addr: str) -> None:
     """
     Find matches for all active alerts and send an email per match to `to_addr`.
+
+    All messages go out over a single SMTP connection (one connect/EHLO for
+    the whole batch); no connection is opened when there are no matches.
     """
-    for alert, doc in find_matches(db):
-        subject = f"[RDB] New match: {alert.keyword}"
-        body = f"{doc.title}\n{doc.url}\nJurisdiction: {doc.jurisdiction or '-'}"
-        send_email(subject, body, to_addr)
+    matches = find_matches(db)
+    if not matches:
+        return
+
+    host, port, sender = _smtp_settings()
+    with smtplib.SMTP(host, port) as s:
+        for alert, doc in matches:
+            subject = f"[RDB] New match: {alert.keyword}"
+            body = f"{doc.title}\n{doc.url}\nJurisdiction: {doc.jurisdiction or '-'}"
+            s.send_message(_build_message(subject, body, to_addr, sender))
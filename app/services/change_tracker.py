@@ -6,15 +6,21 @@ Place at: app/services/change_tracker.py  (or keep current location and imports)
 Run from: your app context (called from scrapers/ingesters with a DB session).
 
 What this does:
-  - Normalizes extracted text and computes a stable SHA-1 content hash.
+  - Normalizes extracted text and computes a stable content hash
+    (BLAKE3 when installed, else SHA-256; stored as "<algo>:<40 hex>").
   - Seeds initial version rows for legacy documents missing current_hash.
   - Appends new DocumentVersion rows when content changes (ADDED/UPDATED/REMOVED).
   - Maintains document tracking fields:
-      current_hash, first_seen_at, last_seen_at, last_changed_at.
-  - Provides optional unified diff summary helper (not persisted by default).
+      current_hash, first_seen_at, last_seen_at, last_changed_at,
+      last_version_no (so the next version number needs no MAX() query).
+  - Provides optional unified diff summary helper (not persisted by default);
+    uses the C++ fast_diff_match_patch engine in line mode when installed,
+    difflib otherwise.
 
 Key functions:
   - record_version(db, doc, extracted_text, title) -> "ADDED" | "UPDATED" | "NOCHANGE"
+  - record_versions_bulk(db, [(doc, text, title), ...]) -> [status, ...]   # batched
+  - flush_versions(db, pending) -> int   # bulk-insert rows queued via pending=[...]
   - record_removed(db, doc, reason="removed") -> "REMOVED"
   - seed_if_missing(db, doc, text=None, title=None) -> "ADDED" | "SEEDED-DOC" | "SKIP"
 
@@ -30,25 +36,54 @@ Examples (pseudo-usage):
   if status in ("ADDED", "UPDATED"):
       db.commit()
 
-  # seeding legacy rows missing current_hash:
+  # seeding legacy rows missing current_hash (one timestamp for the batch):
+  now = datetime.utcnow()
   for doc in db.query(Document).filter(Document.current_hash.is_(None)):
-      seed_if_missing(db, doc, text=doc.text, title=doc.title)
+      seed_if_missing(db, doc, text=doc.text, title=doc.title, now=now)
   db.commit()
 
 Notes:
   - Hash basis prefers extracted_text; if absent, uses "title\\nurl" for stability.
+  - A 64-bit xxh3 fingerprint (current_fingerprint) short-circuits the common
+    NOCHANGE path without computing the full hash; needs the optional xxhash.
+  - Stored hashes carry their algorithm as a prefix; unprefixed values are legacy
+    SHA-1. A stored hash is always verified with its own algorithm, so switching
+    algorithms (or hosts with/without blake3) never produces spurious UPDATED rows.
   - SNAPSHOT_MAX_CHARS limits stored snapshot size (default 20k chars).
+  - Every writer takes an optional `now`; pass one value per batch so
+    first_seen_at/last_seen_at line up across the rows it touched.
 """
 
 from __future__ import annotations
 import hashlib
+import os
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from difflib import unified_diff
-from typing import Optional
+from itertools import islice
+from typing import Optional, Sequence
 
-from sqlalchemy import func
+from sqlalchemy import exists, func
 from sqlalchemy.orm import Session
 
+try:
+    import blake3
+except Exception:  # pragma: no cover - optional accelerator; hashlib.sha256 is the fallback
+    blake3 = None
+
+try:
+    from fast_diff_match_patch import diff as _fast_diff
+except Exception:  # pragma: no cover - optional; difflib is the fallback
+    _fast_diff = None
+
+try:
+    import xxhash
+except Exception:  # pragma: no cover - optional; without it the fingerprint pre-check is skipped
+    xxhash = None
+
 # --- Model imports (support both singular/plural module names) ---
 try:
     from app.db.model import Document, DocumentVersion  # your current file path
@@ -57,55 +92,296 @@ except Exception:  # pragma: no cover
 
 
 SNAPSHOT_MAX_CHARS = 20_000
+BULK_BATCH_SIZE = 500
+_PARALLEL_HASH_MIN = 64  # below this, thread-pool overhead outweighs parallel hashing
+_HASH_WORKERS = min(8, os.cpu_count() or 1)
+
+HASH_ALGO = "blake3" if blake3 is not None else "sha256"
+_DIGEST_BYTES = 20  # 40 hex chars; "<algo>:<hex>" fits the String(64) hash columns
+_STREAM_CHUNK = 1 << 20  # texts longer than this are encoded + hashed piecewise
 
 
 # -----------------------
 # Utilities
 # -----------------------
+_CRLF_RE = re.compile(r"\r\n?")
+
+
 def normalize_text(s: Optional[str]) -> str:
     """Normalize text before hashing/snapshotting."""
     if not s:
         return ""
-    # normalize newlines and trim trailing whitespace lines
-    s = s.replace("\r\n", "\n").replace("\r", "\n")
+    # normalize newlines (CRLF and lone CR → LF) in one pass, then trim
+    if "\r" in s:
+        s = _CRLF_RE.sub("\n", s)
     return s.strip()
 
 
-def compute_hash(text: str) -> str:
-    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+def _new_hasher(algo: str):
+    if algo == "blake3":
+        return blake3.blake3() if blake3 is not None else None
+    if algo == "sha256":
+        return hashlib.sha256()
+    if algo == "sha1":
+        return hashlib.sha1()
+    return None
+
+
+def _digest(algo: str, data: str | bytes) -> Optional[str]:
+    """
+    Incrementally hash `data` with `algo`. Bytes are hashed as-is; large str
+    values are UTF-8 encoded chunk by chunk so no full-size bytes copy is built.
+    """
+    h = _new_hasher(algo)
+    if h is None:
+        return None
+    if isinstance(data, str):
+        if len(data) > _STREAM_CHUNK:
+            for i in range(0, len(data), _STREAM_CHUNK):
+                h.update(data[i : i + _STREAM_CHUNK].encode("utf-8"))
+        else:
+            h.update(data.encode("utf-8"))
+    else:
+        h.update(data)
+    if algo == "blake3":
+        return h.hexdigest(length=_DIGEST_BYTES)
+    if algo == "sha256":
+        return h.hexdigest()[: _DIGEST_BYTES * 2]
+    return h.hexdigest()
+
+
+def compute_hash(text: str | bytes) -> str:
+    return f"{HASH_ALGO}:{_digest(HASH_ALGO, text)}"
+
+
+def hash_matches(stored: Optional[str], text: str | bytes) -> bool:
+    """True if `stored` is the hash of `text` under the algorithm `stored` was made with."""
+    if not stored:
+        return False
+    algo, sep, hexd = stored.partition(":")
+    if not sep:
+        algo, hexd = "sha1", stored  # legacy, unprefixed
+    return _digest(algo, text) == hexd
+
+
+def fingerprint(text: str) -> Optional[int]:
+    """
+    Cheap 64-bit fingerprint (xxh3) of the hash basis, as a signed int for BIGINT
+    columns. None when xxhash is not installed.
+    """
+    if xxhash is None:
+        return None
+    fp = xxhash.xxh3_64_intdigest(text.encode("utf-8"))
+    return fp - (1 << 64) if fp >= (1 << 63) else fp
+
+
+def _unchanged_by_fingerprint(doc: Document, fp: Optional[int]) -> bool:
+    """Matching fingerprint on an already-hashed doc: skip the full content hash."""
+    return (
+        fp is not None
+        and bool(getattr(doc, "current_hash", None))
+        and getattr(doc, "current_fingerprint", None) == fp
+    )
+
+
+def _basis(text: Optional[str], title: Optional[str], doc: Document) -> str:
+    """Normalized hash basis: the text if non-empty, else "title\\nurl"."""
+    basis = normalize_text(text)
+    if basis:
+        return basis
+    return normalize_text(f"{title or doc.title}\n{doc.url}")
+
+
+def _line_opcodes(a: list[str], b: list[str]) -> Optional[list[tuple]]:
+    """
+    difflib-style opcodes for two line lists, computed by the C++ diff engine.
+    Each distinct line is mapped to one code point so the engine diffs lines,
+    not characters. None if the engine is unavailable or there are too many
+    distinct lines to encode.
+    """
+    if _fast_diff is None:
+        return None
+    ids: dict[str, str] = {}
+
+    def encode(lines: list[str]) -> str:
+        out = []
+        for line in lines:
+            c = ids.get(line)
+            if c is None:
+                n = 0x100 + len(ids)
+                if n >= 0xD800:
+                    n += 0x800  # skip the surrogate block
+                if n > 0x10FFFF:
+                    raise OverflowError
+                c = ids[line] = chr(n)
+            out.append(c)
+        return "".join(out)
+
+    try:
+        ea, eb = encode(a), encode(b)
+    except OverflowError:
+        return None
+
+    codes: list[tuple] = []
+    i = j = 0
+    for op, n in _fast_diff(ea, eb, counts_only=True, cleanup="No"):
+        if op == "=":
+            codes.append(("equal", i, i + n, j, j + n))
+            i, j = i + n, j + n
+            continue
+        if op == "-":
+            code = ("delete", i, i + n, j, j)
+            i += n
+        else:
+            code = ("insert", i, i, j, j + n)
+            j += n
+        # adjacent delete/insert pairs become one replace, as in SequenceMatcher
+        if codes and codes[-1][0] in ("delete", "insert") and codes[-1][0] != code[0]:
+            _, i1, _, j1, _ = codes.pop()
+            code = ("replace", i1, i, j1, j)
+        codes.append(code)
+    return codes
+
+
+def _unified_range(start: int, stop: int) -> str:
+    length = stop - start
+    beginning = start + 1
+    if length == 1:
+        return f"{beginning}"
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def _hunks(codes: list[tuple], n: int = 3):
+    """Group opcodes into hunks with up to n lines of context, as difflib.unified_diff does."""
+    if not codes:
+        return
+    if codes[0][0] == "equal":
+        _, i1, i2, j1, j2 = codes[0]
+        codes[0] = ("equal", max(i1, i2 - n), i2, max(j1, j2 - n), j2)
+    if codes[-1][0] == "equal":
+        _, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = ("equal", i1, min(i2, i1 + n), j1, min(j2, j1 + n))
+    group: list[tuple] = []
+    for tag, i1, i2, j1, j2 in codes:
+        # a long unchanged run closes the hunk: n lines after it, n before the next
+        if tag == "equal" and i2 - i1 > 2 * n:
+            group.append((tag, i1, i1 + n, j1, j1 + n))
+            yield group
+            group = []
+            i1, j1 = i2 - n, j2 - n
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+
+def _fast_unified_diff(
+    a: list[str], b: list[str], max_lines: Optional[int] = None
+) -> Optional[tuple[list[str], int]]:
+    """
+    difflib.unified_diff(a, b, lineterm="") from the C++ engine's opcodes, as
+    (first max_lines lines, total line count). Lines past max_lines are only
+    counted, never formatted. None if the engine is unavailable.
+    """
+    codes = _line_opcodes(a, b)
+    if codes is None:
+        return None
+    limit = sys.maxsize if max_lines is None else max_lines
+    lines: list[str] = []
+    total = 0
+
+    def emit(prefix: str, seq: list[str], start: int, stop: int) -> None:
+        nonlocal total
+        room = limit - len(lines)
+        if room > 0:
+            lines.extend(prefix + seq[k] for k in range(start, min(stop, start + room)))
+        total += stop - start
+
+    for group in _hunks(codes):
+        if not total:
+            emit("", ["--- ", "+++ "], 0, 2)
+        first, last = group[0], group[-1]
+        emit("", [f"@@ -{_unified_range(first[1], last[2])} +{_unified_range(first[3], last[4])} @@"], 0, 1)
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                emit(" ", a, i1, i2)
+                continue
+            if tag in ("replace", "delete"):
+                emit("-", a, i1, i2)
+            if tag in ("replace", "insert"):
+                emit("+", b, j1, j2)
+    return lines, total
 
 
 def diff_summary(prev: Optional[str], curr: Optional[str], max_lines: int = 12) -> str:
     prev_s = normalize_text(prev).splitlines()
     curr_s = normalize_text(curr).splitlines()
-    lines = list(unified_diff(prev_s, curr_s, lineterm=""))
-    if not lines:
+    fast = _fast_unified_diff(prev_s, curr_s, max_lines)
+    if fast is not None:
+        head, total = fast
+    else:
+        rest = unified_diff(prev_s, curr_s, lineterm="")
+        head = list(islice(rest, max_lines))
+        total = len(head) + sum(1 for _ in rest)
+    if not head:
         return ""
-    head = lines[:max_lines]
-    if len(lines) > max_lines:
-        head.append(f"... (+{len(lines)-max_lines} more)")
+    if total > max_lines:
+        head.append(f"... (+{total - max_lines} more)")
     return "\n".join(head)
 
 
 # -----------------------
 # Core: record_version
 # -----------------------
-def record_version(
-    db: Session,
+def _next_version_no(db: Session, doc: Document) -> int:
+    """
+    Bump and return doc.last_version_no. Only rows that predate the column
+    (NULL) pay for a MAX(version_no) lookup, once.
+    """
+    last = getattr(doc, "last_version_no", None)
+    if last is None:
+        last = (
+            db.query(func.max(DocumentVersion.version_no))
+            .filter(DocumentVersion.doc_id == doc.id)
+            .scalar()
+        ) or 0
+    doc.last_version_no = last + 1
+    return last + 1
+
+
+def _emit(db: Session, row: dict, pending: Optional[list]) -> None:
+    """Queue a version row on `pending` (see flush_versions) or add it to the session."""
+    if pending is not None:
+        pending.append(row)
+    else:
+        db.add(DocumentVersion(**row))
+
+
+def flush_versions(db: Session, pending: list) -> int:
+    """Bulk-insert queued version rows in one executemany and clear the queue."""
+    n = len(pending)
+    if n:
+        db.bulk_insert_mappings(DocumentVersion, pending)
+        pending.clear()
+    return n
+
+
+def _apply_hash(
     doc: Document,
     *,
-    extracted_text: Optional[str],
     title: Optional[str],
-) -> str:
+    basis_text: str,
+    new_hash: str,
+    now: datetime,
+    fp: Optional[int] = None,
+) -> tuple[str, Optional[dict]]:
     """
-    Compare current_hash vs new hash; if changed, append a version row and update doc fields.
-    Returns: 'ADDED' | 'UPDATED' | 'NOCHANGE'
+    Update doc tracking fields for a freshly computed hash (and fingerprint).
+    Returns (status, version row mapping or None). For UPDATED rows the caller
+    fills in version_no.
     """
-    now = datetime.utcnow()
-
-    # Prefer extracted_text; if missing, fall back to a stable basis so we can seed
-    basis_text = normalize_text(extracted_text) or normalize_text(f"{title or doc.title}\n{doc.url}")
-    new_hash = compute_hash(basis_text)
+    doc.current_fingerprint = fp
 
     # First time seeing this doc with content
     if not getattr(doc, "current_hash", None):
@@ -113,8 +389,8 @@ def record_version(
         doc.first_seen_at = now
         doc.last_seen_at = now
         doc.last_changed_at = now
-
-        v = DocumentVersion(
+        doc.last_version_no = 1
+        return "ADDED", dict(
             doc_id=doc.id,
             version_no=1,
             content_hash=new_hash,
@@ -122,70 +398,167 @@ def record_version(
             snapshot=basis_text[:SNAPSHOT_MAX_CHARS],
             change_type="ADDED",
         )
-        db.add(v)
-        return "ADDED"
 
     # Subsequent fetch
     doc.last_seen_at = now
     if doc.current_hash == new_hash:
-        return "NOCHANGE"
+        return "NOCHANGE", None
+    if hash_matches(doc.current_hash, basis_text):
+        # same content hashed with an older algorithm: upgrade in place
+        doc.current_hash = new_hash
+        return "NOCHANGE", None
 
-    # Changed → next version number
-    last_no = (
-        db.query(DocumentVersion.version_no)
-        .filter(DocumentVersion.doc_id == doc.id)
-        .order_by(DocumentVersion.version_no.desc())
-        .first()
-    )
-    next_no = (last_no[0] if last_no else 0) + 1
-
-    # Optional: generate a short diff (not stored by default)
-    # prev_text = (
-    #     db.query(DocumentVersion.snapshot)
-    #     .filter(DocumentVersion.doc_id == doc.id)
-    #     .order_by(DocumentVersion.version_no.desc())
-    #     .limit(1)
-    #     .scalar()
-    # )
-    # summary = diff_summary(prev_text, basis_text)
-
-    v = DocumentVersion(
+    row = dict(
         doc_id=doc.id,
-        version_no=next_no,
+        version_no=None,
         content_hash=new_hash,
         title=title or getattr(doc, "title", None),
         snapshot=basis_text[:SNAPSHOT_MAX_CHARS],
         change_type="UPDATED",
     )
-    db.add(v)
-
     doc.current_hash = new_hash
     doc.last_changed_at = now
     if title and getattr(doc, "title", None) != title:
         doc.title = title
+    return "UPDATED", row
 
-    return "UPDATED"
+
+def record_version(
+    db: Session,
+    doc: Document,
+    *,
+    extracted_text: Optional[str],
+    title: Optional[str],
+    pending: Optional[list] = None,
+    now: Optional[datetime] = None,
+) -> str:
+    """
+    Compare current_hash vs new hash; if changed, append a version row and update doc fields.
+    Pass a `pending` list to queue version rows as plain mappings instead of ORM
+    objects, then write them all at once with flush_versions(db, pending).
+    Pass `now` to stamp a whole batch with one timestamp (default: utcnow()).
+    Returns: 'ADDED' | 'UPDATED' | 'NOCHANGE'
+    """
+    now = now or datetime.utcnow()
+
+    # Prefer extracted_text; if missing, fall back to a stable basis so we can seed
+    basis_text = _basis(extracted_text, title, doc)
+    fp = fingerprint(basis_text)
+    if _unchanged_by_fingerprint(doc, fp):
+        doc.last_seen_at = now
+        return "NOCHANGE"
+    new_hash = compute_hash(basis_text)
+
+    status, row = _apply_hash(doc, title=title, basis_text=basis_text, new_hash=new_hash, now=now, fp=fp)
+    if row is None:
+        return status
+
+    if status == "UPDATED":
+        # Changed → next version number
+        row["version_no"] = _next_version_no(db, doc)
+
+        # Optional: generate a short diff (not stored by default)
+        # prev_text = (
+        #     db.query(DocumentVersion.snapshot)
+        #     .filter(DocumentVersion.doc_id == doc.id)
+        #     .order_by(DocumentVersion.version_no.desc())
+        #     .limit(1)
+        #     .scalar()
+        # )
+        # summary = diff_summary(prev_text, basis_text)
+
+    _emit(db, row, pending)
+    return status
+
+
+def record_versions_bulk(
+    db: Session,
+    items: Sequence[tuple[Document, Optional[str], Optional[str]]],
+    *,
+    batch_size: int = BULK_BATCH_SIZE,
+    now: Optional[datetime] = None,
+) -> list[str]:
+    """
+    Batched record_version for many documents: items are (doc, extracted_text, title).
+
+    Per batch: fingerprints weed out unchanged docs, remaining hashes are computed up front (in a thread pool for large batches;
+    hashlib/blake3 release the GIL on big buffers), next version numbers come
+    from one grouped MAX() query, and all version rows go in with a single bulk
+    insert. Docs that already carry last_version_no need no lookup at all.
+    Returns one status per item, in order. Caller commits.
+    """
+    statuses: list[str] = []
+    now = now or datetime.utcnow()
+    for start in range(0, len(items), batch_size):
+        batch = items[start : start + batch_size]
+        bases = [_basis(text, title, doc) for doc, text, title in batch]
+        fps = [fingerprint(b) for b in bases]
+        # a doc listed twice is compared against its state after the earlier item,
+        # so only docs seen once can be skipped before anything is applied
+        seen = Counter(id(doc) for doc, _text, _title in batch)
+        todo = [
+            i for i, (item, fp) in enumerate(zip(batch, fps))
+            if seen[id(item[0])] > 1 or not _unchanged_by_fingerprint(item[0], fp)
+        ]
+        to_hash = [bases[i] for i in todo]
+        if len(to_hash) >= _PARALLEL_HASH_MIN:
+            with ThreadPoolExecutor(max_workers=_HASH_WORKERS) as pool:
+                hashes = dict(zip(todo, pool.map(compute_hash, to_hash)))
+        else:
+            hashes = dict(zip(todo, map(compute_hash, to_hash)))
+
+        rows: list[dict] = []
+        numbering: list[tuple[Document, dict]] = []  # UPDATED rows still needing version_no
+        for i, ((doc, _text, title), basis_text, fp) in enumerate(zip(batch, bases, fps)):
+            if i not in hashes or _unchanged_by_fingerprint(doc, fp):
+                doc.last_seen_at = now
+                statuses.append("NOCHANGE")
+                continue
+            status, row = _apply_hash(doc, title=title, basis_text=basis_text, new_hash=hashes[i], now=now, fp=fp)
+            statuses.append(status)
+            if row is not None:
+                rows.append(row)
+                if row["version_no"] is None:
+                    numbering.append((doc, row))
+
+        unknown_ids = {doc.id for doc, _ in numbering if getattr(doc, "last_version_no", None) is None}
+        if unknown_ids:
+            last_nos = dict(
+                db.query(DocumentVersion.doc_id, func.max(DocumentVersion.version_no))
+                .filter(DocumentVersion.doc_id.in_(unknown_ids))
+                .group_by(DocumentVersion.doc_id)
+                .all()
+            )
+            for doc, _ in numbering:
+                if doc.id in unknown_ids:
+                    doc.last_version_no = last_nos.get(doc.id) or 0
+        for doc, row in numbering:
+            doc.last_version_no += 1
+            row["version_no"] = doc.last_version_no
+        flush_versions(db, rows)
+    return statuses
 
 
 # -----------------------
 # Optional helpers
 # -----------------------
-def record_removed(db: Session, doc: Document, *, reason: str = "removed") -> str:
+def record_removed(
+    db: Session,
+    doc: Document,
+    *,
+    reason: str = "removed",
+    pending: Optional[list] = None,
+    now: Optional[datetime] = None,
+) -> str:
     """
     Append a REMOVED version (e.g., source 404s or is deliberately retired).
     Does not change current_hash; sets last_seen_at and last_changed_at.
+    `pending` and `now` work as in record_version.
     """
-    now = datetime.utcnow()
-    # next version number
-    last_no = (
-        db.query(DocumentVersion.version_no)
-        .filter(DocumentVersion.doc_id == doc.id)
-        .order_by(DocumentVersion.version_no.desc())
-        .first()
-    )
-    next_no = (last_no[0] if last_no else 0) + 1
+    now = now or datetime.utcnow()
+    next_no = _next_version_no(db, doc)
 
-    v = DocumentVersion(
+    row = dict(
         doc_id=doc.id,
         version_no=next_no,
         content_hash=doc.current_hash or compute_hash(f"{doc.title}\n{doc.url}"),
@@ -193,7 +566,7 @@ def record_removed(db: Session, doc: Document, *, reason: str = "removed") -> st
         snapshot=f"(Document marked removed: {reason})",
         change_type="REMOVED",
     )
-    db.add(v)
+    _emit(db, row, pending)
 
     doc.last_seen_at = now
     doc.last_changed_at = now
@@ -206,26 +579,28 @@ def seed_if_missing(
     *,
     text: Optional[str] = None,
     title: Optional[str] = None,
+    pending: Optional[list] = None,
+    now: Optional[datetime] = None,
 ) -> str:
     """
     One-time seeding helper for existing rows without current_hash.
-    Uses text if provided, otherwise title+url.
+    Uses text if provided, otherwise title+url. `pending` and `now` work as in record_version.
     """
     if getattr(doc, "current_hash", None):
         return "SKIP"
 
-    basis = normalize_text(text) or normalize_text(f"{title or doc.title}\n{doc.url}")
+    basis = _basis(text, title, doc)
     h = compute_hash(basis)
-    now = datetime.utcnow()
+    fp = fingerprint(basis)
+    now = now or datetime.utcnow()
 
     # If a version already exists, only fill doc fields
-    has_version = (
-        db.query(func.count(DocumentVersion.id))
-        .filter(DocumentVersion.doc_id == doc.id)
-        .scalar()
-    )
+    has_version = getattr(doc, "last_version_no", None) or db.query(
+        exists().where(DocumentVersion.doc_id == doc.id)
+    ).scalar()
     if has_version:
         doc.current_hash = doc.current_hash or h
+        doc.current_fingerprint = fp
         doc.first_seen_at = doc.first_seen_at or now
         doc.last_seen_at = doc.last_seen_at or now
         doc.last_changed_at = doc.last_changed_at or now
@@ -233,11 +608,13 @@ def seed_if_missing(
 
     # Create initial version
     doc.current_hash = h
+    doc.current_fingerprint = fp
     doc.first_seen_at = now
     doc.last_seen_at = now
     doc.last_changed_at = now
+    doc.last_version_no = 1
 
-    v = DocumentVersion(
+    row = dict(
         doc_id=doc.id,
         version_no=1,
         content_hash=h,
@@ -245,5 +622,5 @@ def seed_if_missing(
         snapshot=basis[:SNAPSHOT_MAX_CHARS],
         change_type="ADDED",
     )
-    db.add(v)
+    _emit(db, row, pending)
     return "ADDED"
@@ -10,6 +10,13 @@ What this does:
   - For each source, dispatches to the correct scraper:
       • type == "rss"  → app.scrapers.rss.run_rss
       • type == "html" → app.scrapers.html.run_html
+    via the _HANDLERS registry; @register_source("...") adds more types.
+  - Runs sources concurrently on a thread pool (INGEST_WORKERS, default 8);
+    each worker gets its own Session bound to the caller's engine.
+  - run_ingest_once_async() instead overlaps all fetches on one event loop with
+    a shared httpx.AsyncClient (HTTP/2, pooled keep-alive); every DB call
+    (listing sources, opening each Session, parsing/upserts) runs in the
+    default thread pool, one Session per source.
   - Captures per-source success/error and returns an aggregate stats dict.
 
 Why it matters:
@@ -36,29 +43,83 @@ Common examples (pseudo):
       stats = run_ingest_once(db, only_active=True)
       print(stats)
 
+      stats = asyncio.run(run_ingest_once_async(db))
+
 Notes:
   - Unsupported source types raise ValueError but are captured per-source in results.
-  - DB session is provided by caller; this function does not commit/rollback itself.
+  - DB session is provided by caller and is only used to list sources; the
+    scrapers commit through their per-worker sessions.
+  - per_source keeps the order sources were loaded in, regardless of which
+    finishes first.
 """
 from __future__ import annotations
 
-from typing import Any, Dict
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Awaitable, Callable, Dict
 
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
 
 from app.db.models import Source
-from app.scrapers.rss import run_rss
-from app.scrapers.html import run_html
+from app.scrapers.rss import run_rss, run_rss_async
+from app.scrapers.html import run_html, run_html_async
+from app.scrapers.http import make_async_client
+
+
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "8"))
 
+# Source.type → scraper. Sync handlers take (db, src); async ones (db, src, client).
+_HANDLERS: Dict[str, Callable[[Session, Source], None]] = {"rss": run_rss, "html": run_html}
+_ASYNC_HANDLERS: Dict[str, Callable[..., Awaitable[None]]] = {"rss": run_rss_async, "html": run_html_async}
 
-def run_ingest_once(db: Session, only_active: bool = True) -> dict:
+
+def register_source(type_: str, *, async_handler: Callable[..., Awaitable[None]] | None = None):
+    """
+    Decorator registering a sync scraper for a new Source.type, e.g.
+
+        @register_source("sitemap")
+        def run_sitemap(db, src): ...
+
+    Without an async_handler, run_ingest_once_async runs the sync one in the
+    default executor.
+    """
+    def deco(fn: Callable[[Session, Source], None]):
+        _HANDLERS[type_] = fn
+        if async_handler is not None:
+            _ASYNC_HANDLERS[type_] = async_handler
+        return fn
+    return deco
+
+
+def _handler(registry: Dict[str, Callable], src: Source) -> Callable | None:
+    if src.type not in _HANDLERS:
+        raise ValueError(f"Unsupported source type: {src.type}")
+    return registry.get(src.type)
+
+
+def _run_source(Worker: scoped_session, src_id: int) -> None:
+    """Run one source's scraper on the calling thread's own Session."""
+    db = Worker()
+    try:
+        src = db.get(Source, src_id)
+        _handler(_HANDLERS, src)(db, src)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        Worker.remove()
+
+
+def run_ingest_once(db: Session, only_active: bool = True, max_workers: int = INGEST_WORKERS) -> dict:
     """
     Iterate all sources (optionally only active) and run their respective scrapers.
 
     Args:
         db: SQLAlchemy Session.
         only_active: If True, limit to Source.active == True.
+        max_workers: Upper bound on sources fetched concurrently.
 
     Returns:
         Stats dictionary (see module docstring for shape).
@@ -68,20 +129,88 @@ def run_ingest_once(db: Session, only_active: bool = True) -> dict:
         q = q.where(Source.active == True)  # noqa: E712
     sources = db.execute(q).scalars().all()
 
-    stats: Dict[str, Any] = {"total": len(sources), "ok": 0, "errors": 0, "per_source": []}
-    for src in sources:
-        entry = {"source": src.name, "type": src.type, "url": src.url, "ok": False, "error": None}
+    entries = [
+        {"source": src.name, "type": src.type, "url": src.url, "ok": False, "error": None}
+        for src in sources
+    ]
+    stats: Dict[str, Any] = {"total": len(sources), "ok": 0, "errors": 0, "per_source": entries}
+    if not sources:
+        return stats
+
+    # Session isn't thread-safe: scoped_session hands each worker thread its own.
+    Worker = scoped_session(sessionmaker(bind=db.get_bind(), autocommit=False, autoflush=False))
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(sources)))) as pool:
+        futures = {pool.submit(_run_source, Worker, src.id): entry for src, entry in zip(sources, entries)}
+        for fut in as_completed(futures):
+            entry = futures[fut]
+            try:
+                fut.result()
+                entry["ok"] = True
+                stats["ok"] += 1
+            except Exception as e:
+                entry["error"] = f"{type(e).__name__}: {e}"
+                stats["errors"] += 1
+    return stats
+
+
+async def run_ingest_once_async(db: Session, only_active: bool = True, max_connections: int = 16) -> dict:
+    """
+    Async counterpart of run_ingest_once: same filtering, stats shape and
+    per-source error capture, but fetches every source over one shared
+    httpx.AsyncClient so network waits overlap on a single thread.
+
+    Args:
+        db: SQLAlchemy Session (used only to list sources).
+        only_active: If True, limit to Source.active == True.
+        max_connections: Connection pool size of the shared client.
+    """
+    q = select(Source)
+    if only_active:
+        q = q.where(Source.active == True)  # noqa: E712
+    # every Session call below runs in the default executor: blocking DB I/O
+    # must not stall the event loop (this is awaited from an async route)
+    loop = asyncio.get_running_loop()
+    sources = await loop.run_in_executor(None, lambda: db.execute(q).scalars().all())
+
+    entries = [
+        {"source": src.name, "type": src.type, "url": src.url, "ok": False, "error": None}
+        for src in sources
+    ]
+    stats: Dict[str, Any] = {"total": len(sources), "ok": 0, "errors": 0, "per_source": entries}
+    if not sources:
+        return stats
+
+    # Each source gets its own Session; it is only ever used by one thread at a time.
+    Worker = sessionmaker(bind=db.get_bind(), autocommit=False, autoflush=False)
+
+    def open_source(src_id: int) -> tuple[Session, Source]:
+        wdb = Worker()
+        try:
+            return wdb, wdb.get(Source, src_id)
+        except Exception:
+            wdb.close()
+            raise
+
+    async def one(client, src_id: int, entry: dict) -> None:
+        wdb = None
         try:
-            if src.type == "rss":
-                run_rss(db, src)
-            elif src.type == "html":
-                run_html(db, src)
+            wdb, src = await loop.run_in_executor(None, open_source, src_id)
+            fn = _handler(_ASYNC_HANDLERS, src)
+            if fn is not None:
+                await fn(wdb, src, client)
             else:
-                raise ValueError(f"Unsupported source type: {src.type}")
+                await loop.run_in_executor(None, _HANDLERS[src.type], wdb, src)
             entry["ok"] = True
             stats["ok"] += 1
         except Exception as e:
+            if wdb is not None:
+                await loop.run_in_executor(None, wdb.rollback)
             entry["error"] = f"{type(e).__name__}: {e}"
             stats["errors"] += 1
-        stats["per_source"].append(entry)
+        finally:
+            if wdb is not None:
+                await loop.run_in_executor(None, wdb.close)
+
+    async with make_async_client(max_connections=max_connections) as client:
+        await asyncio.gather(*(one(client, src.id, entry) for src, entry in zip(sources, entries)))
     return stats
@@ -5,10 +5,15 @@ Background scheduler for periodic ingestion.
 
 Uses APScheduler with a BackgroundScheduler to run ingestion jobs
 in-process. This is suitable for small to medium deployments or dev/staging.
-For production with multiple workers, consider a distributed scheduler (e.g., Celery beat).
+Every worker process may start its own scheduler (uvicorn --workers N); each
+firing is gated so only one of them actually runs the ingest:
+  - Postgres: pg_try_advisory_lock on a dedicated connection.
+  - Other databases (SQLite dev): a non-blocking flock on a lock file, which
+    covers workers on the same host.
 
 Jobs:
-  - `ingest_job`: Runs every 3 hours on the hour, calls run_ingest_once() with only_active=True.
+  - `ingest_job`: Runs every 3 hours on the hour, calls run_ingest_once_async() with
+    only_active=True (asyncio.run on the job thread; fetches overlap on one client).
 
 Usage:
   from app.tasks.schedule import start_scheduler
@@ -21,27 +26,76 @@ Usage:
 Notes:
   - Scheduler is idempotent: calling start_scheduler() multiple times returns the same instance.
   - DB sessions are managed per job via SessionLocal.
+  - Workers that lose the lock skip that firing; the lock is released when
+    the job ends (or its connection/process dies).
   - Timezone is fixed to UTC for predictable triggers.
 """
 
 from __future__ import annotations
 
+import asyncio
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator
+
 from apscheduler.schedulers.background import BackgroundScheduler
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
-from app.db.session import SessionLocal
-from app.services.ingest import run_ingest_once
+try:
+    import fcntl
+except Exception:  # pragma: no cover - non-POSIX; falls back to running every worker
+    fcntl = None
+
+from app.db.session import SessionLocal, engine
+from app.services.ingest import run_ingest_once_async
 
 _scheduler: BackgroundScheduler | None = None
 
+# Arbitrary app-wide key for pg_try_advisory_lock (fits in a signed bigint).
+INGEST_LOCK_KEY = 0x52444249  # "RDBI"
+INGEST_LOCK_FILE = os.getenv("INGEST_LOCK_FILE", os.path.join(tempfile.gettempdir(), "rdb-ingest.lock"))
+
+
+@contextmanager
+def _single_fire(key: int = INGEST_LOCK_KEY) -> Iterator[bool]:
+    """Yield True if this process won the cross-worker lock for `key`, else False."""
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as conn:
+            got = conn.execute(text("SELECT pg_try_advisory_lock(:k)"), {"k": key}).scalar()
+            try:
+                yield bool(got)
+            finally:
+                if got:
+                    conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": key})
+        return
+
+    if fcntl is None:
+        yield True
+        return
+    with open(INGEST_LOCK_FILE, "a") as fh:
+        try:
+            fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
 
 def _ingest_job() -> None:
-    """Job wrapper: open DB session, run ingest, close DB."""
-    db: Session = SessionLocal()
-    try:
-        run_ingest_once(db, only_active=True)
-    finally:
-        db.close()
+    """Job wrapper: take the cross-worker lock, open DB session, run ingest, close DB."""
+    with _single_fire() as acquired:
+        if not acquired:
+            return  # another worker is already running this firing
+        db: Session = SessionLocal()
+        try:
+            asyncio.run(run_ingest_once_async(db, only_active=True))
+        finally:
+            db.close()
 
 
 def start_scheduler() -> BackgroundScheduler:
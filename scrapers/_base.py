@@ -1,41 +1,344 @@
 # scrapers/_base.py
-import os, hashlib
-from datetime import datetime
+import os, asyncio, hashlib, json, sqlite3, threading
+from functools import lru_cache
+from datetime import datetime, timezone
+from typing import BinaryIO
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
+import soupsieve
 
-def ensure_dir(p): os.makedirs(p, exist_ok=True)
+try:
+    import blake3
+except Exception:  # pragma: no cover - optional; sha256 fallback
+    blake3 = None
+try:
+    import requests_cache
+except Exception:  # pragma: no cover - plain Session; the ETag/304 path still applies
+    requests_cache = None
+try:
+    from selectolax.lexbor import LexborHTMLParser, SelectolaxError
+except ImportError:  # pragma: no cover - BeautifulSoup fallback
+    LexborHTMLParser = None
+try:
+    import lxml  # noqa: F401
+    BS_PARSER = "lxml"
+except ImportError:  # pragma: no cover - pure-Python tree builder
+    BS_PARSER = "html.parser"
 
-def content_hash(text: str) -> str:
-    return hashlib.sha256(text.encode("utf-8", "ignore")).hexdigest()
+# Hashes are written as "<algo>:<hex>"; bare hex in old cache files is sha256.
+HASH_ALGO = "blake3" if blake3 is not None else "sha256"
+
+# Last-seen hashes for every scraper live in one SQLite file (WAL), keyed by
+# the scraper's cache_dir, instead of one last_hash.txt per scraper.
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+CACHE_DB = os.getenv("SCRAPER_CACHE_DB", os.path.join(_ROOT, ".cache", "hashes.sqlite3"))
+
+_conn: sqlite3.Connection | None = None
+_conn_lock = threading.Lock()
+
+def _db() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(CACHE_DB) or ".", exist_ok=True)
+        conn = sqlite3.connect(CACHE_DB, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS scraper_hash (key TEXT PRIMARY KEY, hash TEXT NOT NULL, raw_hash TEXT, ts TEXT NOT NULL)")
+        if "raw_hash" not in {r[1] for r in conn.execute("PRAGMA table_info(scraper_hash)")}:
+            conn.execute("ALTER TABLE scraper_hash ADD COLUMN raw_hash TEXT")
+        _conn = conn
+    return _conn
+
+def _cache_key(cache_dir: str) -> str:
+    # relative to scrapers/ so the cache survives moving the checkout
+    path = os.path.abspath(cache_dir)
+    try:
+        rel = os.path.relpath(path, _ROOT)
+    except ValueError:  # different drive (Windows)
+        return path
+    return path if rel.startswith("..") else rel.replace(os.sep, "/")
+
+def _legacy_hash(cache_dir: str) -> str | None:
+    """Hash from a pre-SQLite last_hash.txt, read once when the key has no row yet."""
+    try:
+        with open(os.path.join(cache_dir, "last_hash.txt"), "r") as f:
+            value = f.read().strip()
+    except OSError:
+        return None
+    # a JSON object here is a validators blob from an earlier build, not a hash
+    return value if value and not value.startswith("{") else None
+
+def get_hashes(cache_dir: str) -> tuple[str | None, str | None]:
+    """(content hash, raw page hash) last stored for cache_dir."""
+    with _conn_lock:
+        row = _db().execute("SELECT hash, raw_hash FROM scraper_hash WHERE key = ?", (_cache_key(cache_dir),)).fetchone()
+    return (row[0], row[1]) if row else (_legacy_hash(cache_dir), None)
+
+def get_hash(cache_dir: str) -> str | None:
+    return get_hashes(cache_dir)[0]
+
+def set_hash(cache_dir: str, value: str, raw_hash: str | None = None) -> None:
+    with _conn_lock:
+        _db().execute(
+            "INSERT OR REPLACE INTO scraper_hash (key, hash, raw_hash, ts) VALUES (?, ?, ?, ?)",
+            (_cache_key(cache_dir), value, raw_hash, utc_stamp()),
+        )
+
+_READ_CHUNK = 1 << 18  # 256 KiB
+
+def _hasher(algo: str):
+    if algo == "blake3":
+        return blake3.blake3() if blake3 is not None else None
+    if algo == "sha256":
+        return hashlib.sha256()
+    return None
+
+def _digest(algo: str, data: bytes) -> str | None:
+    h = _hasher(algo)
+    if h is None:
+        return None
+    h.update(data)
+    return h.hexdigest()
+
+def _digest_file(algo: str, f: BinaryIO) -> str | None:
+    """Hash a binary file object from its current position without reading it whole into memory."""
+    if algo == "sha256" and hasattr(hashlib, "file_digest"):  # 3.11+: readinto loop in C
+        return hashlib.file_digest(f, "sha256").hexdigest()
+    h = _hasher(algo)
+    if h is None:
+        return None
+    buf = bytearray(_READ_CHUNK)
+    view = memoryview(buf)
+    while n := f.readinto(buf):
+        h.update(view[:n])
+    return h.hexdigest()
+
+def _digest_any(algo: str, data: "str | BinaryIO") -> str | None:
+    if isinstance(data, str):
+        return _digest(algo, data.encode("utf-8", "ignore"))
+    return _digest_file(algo, data)
+
+def content_hash(data: "str | BinaryIO") -> str:
+    """Prefixed hash of text, or of a binary file object (e.g. a saved HTML download opened "rb")."""
+    return f"{HASH_ALGO}:{_digest_any(HASH_ALGO, data)}"
+
+def hash_matches(stored: str | None, data: "str | BinaryIO") -> bool:
+    """Verify `stored` against `data` using the algorithm `stored` was made with."""
+    if not stored:
+        return False
+    algo, sep, hexd = stored.partition(":")
+    if not sep:
+        algo, hexd = "sha256", stored
+    return _digest_any(algo, data) == hexd
+
+@lru_cache(maxsize=64)
+def _compiled(selector: str):
+    # scrapers pass the same handful of selector strings on every poll: parse each once
+    return soupsieve.compile(selector)
+
+def _lexbor_text(html: str, selector: str | None) -> str:
+    tree = LexborHTMLParser(html)
+    if selector:
+        # every match, not css_first(): SELECTORs are comma lists ("a, h2, h3")
+        return "\n".join(n.text(strip=True) for n in tree.css(selector))
+    tree.strip_tags(["script", "style"])  # get_text() leaves these out too
+    if tree.root is None:
+        return ""
+    # one space between non-blank text nodes, as BeautifulSoup's get_text(" ", strip=True)
+    return " ".join(s for n in tree.root.traverse(include_text=True)
+                    if n.tag == "-text" and (s := n.text_content.strip()))
 
 def extract_text(html: str, selector: str | None = None) -> str:
-    soup = BeautifulSoup(html, "html.parser")
+    """Text of the `selector` matches, one per line, or of the whole page.
+
+    selectolax (lexbor) when installed; BeautifulSoup otherwise, or for
+    selectors lexbor cannot parse.
+    """
+    if LexborHTMLParser is not None:
+        try:
+            return _lexbor_text(html, selector)
+        except SelectolaxError:
+            pass  # soupsieve-only selector syntax
+    soup = BeautifulSoup(html, BS_PARSER)
     if selector:
-        nodes = soup.select(selector)
+        nodes = _compiled(selector).select(soup)
         return "\n".join(n.get_text(strip=True) for n in nodes)
     return soup.get_text(" ", strip=True)
 
-def check_updated(fetch_html_fn, cache_dir: str, selector: str | None = None, url: str = "", diff_label: str = "Content"):
-    ensure_dir(cache_dir)
-    cache_file = os.path.join(cache_dir, "last_hash.txt")
+def utc_stamp() -> str:
+    """Current UTC time as "YYYY-MM-DDTHH:MM:SSZ" (lastChecked / cache ts)."""
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
 
+def check_updated(fetch_html_fn, cache_dir: str, selector: str | None = None, url: str = "", diff_label: str = "Content",
+                  checked_at: str | None = None):
+    # checked_at: one utc_stamp() shared by a batch of checks (see scrapers/check_sites.py)
     html = fetch_html_fn()
-    body = extract_text(html, selector=selector)
-    new_hash = content_hash(body)
-
-    old_hash = None
-    if os.path.exists(cache_file):
-        with open(cache_file, "r") as f:
-            old_hash = f.read().strip()
+    old_hash, old_raw = get_hashes(cache_dir)
 
-    updated = (old_hash != new_hash)
-    if updated:
-        with open(cache_file, "w") as f:
-            f.write(new_hash)
+    # Fast path: byte-identical page → no change, without parsing the HTML at all
+    raw_hash = content_hash(html)
+    if old_hash and old_raw == raw_hash:
+        updated = False
+    else:
+        # Raw page changed (ads, tokens, whitespace...): compare the extracted text
+        body = extract_text(html, selector=selector)
+        new_hash = content_hash(body)
+        updated = old_hash != new_hash and not hash_matches(old_hash, body)
+        if old_hash != new_hash or old_raw != raw_hash:
+            # changed content/page, or same content under an older algorithm: rewrite
+            set_hash(cache_dir, new_hash, raw_hash)
 
     return {
         "url": url,
         "updated": updated,
-        "lastChecked": datetime.utcnow().isoformat() + "Z",
+        "lastChecked": checked_at or utc_stamp(),
         "diffSummary": f"{diff_label} hash changed" if updated else "No change",
     }
+
+
+# --- agency site checks (conservation.ca.gov, bsee, ferc, boem) -----------------
+# Each site module is a TARGET_URL/SELECTOR/label triple around check_hash_update():
+# conditional GET (ETag / Last-Modified, HEAD probe for servers that ignore them),
+# then check_updated() on the page. Validators live in <cache_dir>/validators.json;
+# last_hash.txt is only read by _legacy_hash() to migrate pre-SQLite hashes.
+
+NOT_MODIFIED = object()  # fetch_conditional() page for an HTTP 304 (or a matching HEAD probe)
+HTTP_CACHE = os.path.join(_ROOT, ".cache", "http")
+VALIDATORS_FILE = "validators.json"
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+def site_session() -> requests.Session:
+    """One pooled keep-alive Session for all site checks.
+
+    With requests-cache, a response still fresh per Cache-Control/Expires is served
+    from HTTP_CACHE without a request; anything else is revalidated via its ETag.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            if requests_cache is not None:
+                session = requests_cache.CachedSession(
+                    HTTP_CACHE, backend="sqlite",
+                    cache_control=True, expire_after=requests_cache.EXPIRE_IMMEDIATELY,
+                )
+            else:
+                session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=Retry(total=2, backoff_factor=0.3))
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+    return _session
+
+def load_validators(cache_dir: str) -> dict:
+    """{"etag", "last_modified", "head_first"} of the last checked 200, or {} if none was saved."""
+    try:
+        with open(os.path.join(cache_dir, VALIDATORS_FILE), "rb") as f:
+            state = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+def save_validators(cache_dir: str, state: dict) -> None:
+    path = os.path.join(cache_dir, VALIDATORS_FILE)
+    # open first, create the directory only on the very first save
+    try:
+        f = open(path, "w")
+    except FileNotFoundError:
+        os.makedirs(cache_dir, exist_ok=True)
+        f = open(path, "w")
+    with f:
+        json.dump(state, f)
+
+def _conditional_headers(state: dict) -> dict:
+    headers = {}
+    if state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    if state.get("last_modified"):
+        headers["If-Modified-Since"] = state["last_modified"]
+    return headers
+
+def _from_cache(r) -> bool:
+    # requests-cache / hishel answer revalidated 304s with the stored 200
+    return bool(getattr(r, "from_cache", False) or getattr(r, "extensions", {}).get("from_cache"))
+
+def _head_unchanged(state: dict, h) -> bool:
+    # Content-Length is not compared: an edit can keep the page the same size
+    return h.status_code == 200 and h.headers.get("ETag") == state["etag"]
+
+def _response_validators(r, sent: dict, state: dict) -> dict:
+    etag = r.headers.get("ETag")
+    validators = {"etag": etag, "last_modified": r.headers.get("Last-Modified")}
+    # a fresh 200 carrying the very ETag we sent: the server ignores If-None-Match,
+    # so later polls try a HEAD first and skip the GET while the ETag still matches
+    ignored = bool(etag) and sent.get("If-None-Match") == etag and not _from_cache(r)
+    if ignored or (state.get("head_first") and etag):
+        validators["head_first"] = True
+    return validators
+
+def fetch_conditional(url: str, cache_dir: str, session: requests.Session | None = None, timeout: float = 15):
+    """GET `url` with the cached validators.
+
+    Returns (page text, validators of that 200), or (NOT_MODIFIED, None). The
+    validators are saved by check_hash_update() once the page has been checked.
+    """
+    session = session or site_session()
+    state = load_validators(cache_dir)
+    if state.get("head_first") and state.get("etag"):
+        try:
+            if _head_unchanged(state, session.head(url, timeout=5, allow_redirects=True)):
+                return NOT_MODIFIED, None
+        except requests.RequestException:
+            pass  # fall through to the GET
+    sent = _conditional_headers(state)
+    r = session.get(url, headers=sent, timeout=timeout)
+    if r.status_code == 304:
+        return NOT_MODIFIED, None
+    r.raise_for_status()
+    return r.text, _response_validators(r, sent, state)
+
+async def fetch_conditional_async(client, url: str, cache_dir: str, timeout: float = 15):
+    """fetch_conditional() on a shared httpx.AsyncClient (see scrapers/check_sites.py); same result."""
+    state = load_validators(cache_dir)
+    if state.get("head_first") and state.get("etag"):
+        try:
+            if _head_unchanged(state, await client.head(url, timeout=5)):
+                return NOT_MODIFIED, None
+        except Exception:
+            pass  # fall through to the GET
+    sent = _conditional_headers(state)
+    r = await client.get(url, headers=sent, timeout=timeout)
+    if r.status_code == 304:
+        return NOT_MODIFIED, None
+    r.raise_for_status()
+    return r.text, _response_validators(r, sent, state)
+
+def _finish_hash_update(html, validators: dict | None, url: str, selector: str | None, label: str,
+                        cache_dir: str, checked_at: str | None):
+    if html is NOT_MODIFIED:
+        return {"url": url, "updated": False, "lastChecked": checked_at or utc_stamp(), "diffSummary": "304 not modified"}
+    result = check_updated(lambda: html, cache_dir, selector=selector, url=url, diff_label=label, checked_at=checked_at)
+    # saved only after check_updated: a stored ETag must never mask an unrecorded change
+    if validators is not None and load_validators(cache_dir) != validators:
+        save_validators(cache_dir, validators)
+    return result
+
+def check_hash_update(url: str, selector: str | None, label: str, *, cache_dir: str,
+                      fetch_html_fn=None, checked_at: str | None = None):
+    """Conditional fetch + check_updated() for one site.
+
+    `fetch_html_fn` overrides the fetch; it returns the page text, or a
+    fetch_conditional() (page, validators) pair.
+    """
+    fetched = fetch_html_fn() if fetch_html_fn is not None else fetch_conditional(url, cache_dir)
+    html, validators = fetched if isinstance(fetched, tuple) else (fetched, None)
+    return _finish_hash_update(html, validators, url, selector, label, cache_dir, checked_at)
+
+async def check_hash_update_async(client, url: str, selector: str | None, label: str, *, cache_dir: str,
+                                  checked_at: str | None = None):
+    html, validators = await fetch_conditional_async(client, url, cache_dir)
+    # hashing/parsing/cache I/O stay synchronous; keep them off the event loop
+    return await asyncio.to_thread(_finish_hash_update, html, validators, url, selector, label, cache_dir, checked_at)
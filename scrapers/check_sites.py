@@ -0,0 +1,103 @@
+# scrapers/check_sites.py
+"""
+Run the agency-site check_updates modules concurrently.
+
+Each site module exposes check_for_update_async(client); all of them share one
+httpx.AsyncClient so the page fetches overlap instead of running back to back.
+Modules without an async entry point (e.g. cpuc.ca.gov) run their sync
+check_for_update() in a worker thread.
+
+check_all_threaded() is the sync alternative: each site's blocking
+check_for_update() runs in a ThreadPoolExecutor, sharing the pooled
+requests Session from scrapers._base.
+
+Run from the repo root:
+    python -m scrapers.check_sites [site ...]
+    python -m scrapers.check_sites --threads [site ...]
+"""
+import asyncio, importlib.util, os, sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import httpx
+
+from scrapers._base import utc_stamp
+from shared.http import HTTP_CACHE_DIR, HTTP_CACHE_TTL, hishel
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# conservation.ca.gov / cpuc.ca.gov are not valid package names, so modules are loaded by path
+SITES = {
+    "conservation.ca.gov": "conservation.ca.gov/check_updates.py",
+    "cpuc.ca.gov": "cpuc.ca.gov/check_updates.py",
+    "bsee.gov": "federal/bsee_gov/check_updates.py",
+    "ferc.gov": "federal/ferc_gov/check_updates.py",
+    "boem.gov": "federal/boem_gov/check_updates.py",
+}
+
+_modules: dict = {}
+
+def make_client():
+    """Shared AsyncClient; with hishel, Cache-Control-fresh pages are served from disk."""
+    kwargs = dict(follow_redirects=True, headers={"User-Agent": "Mozilla/5.0"})
+    if hishel is not None:
+        storage = hishel.AsyncFileStorage(base_path=Path(HTTP_CACHE_DIR), ttl=HTTP_CACHE_TTL)
+        return hishel.AsyncCacheClient(storage=storage, **kwargs)
+    return httpx.AsyncClient(**kwargs)
+
+def load_site(name):
+    mod = _modules.get(name)
+    if mod is None:
+        path = os.path.join(_ROOT, SITES[name])
+        spec = importlib.util.spec_from_file_location(f"scrapers._sites.{name.replace('.', '_')}", path)
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        _modules[name] = mod
+    return mod
+
+async def _check_site(name, client, checked_at):
+    try:
+        mod = load_site(name)
+        if hasattr(mod, "check_for_update_async"):
+            return await mod.check_for_update_async(client, checked_at)
+        return await asyncio.to_thread(mod.check_for_update, checked_at)
+    except Exception as e:
+        return {"updated": False, "error": str(e)}
+
+async def check_all_async(names=None, *, client=None):
+    """Check every site (or just `names`) concurrently; returns {site: result}."""
+    names = list(names or SITES)
+    own = client is None
+    if own:
+        client = make_client()
+    try:
+        checked_at = utc_stamp()  # one lastChecked for the whole batch
+        results = await asyncio.gather(*(_check_site(n, client, checked_at) for n in names))
+    finally:
+        if own:
+            await client.aclose()
+    return dict(zip(names, results))
+
+def check_all(names=None):
+    return asyncio.run(check_all_async(names))
+
+def _check_site_sync(name, checked_at):
+    try:
+        return load_site(name).check_for_update(checked_at)
+    except Exception as e:
+        return {"updated": False, "error": str(e)}
+
+def check_all_threaded(names=None, max_workers=16):
+    """check_all() without asyncio: blocking checks overlap in worker threads."""
+    names = list(names or SITES)
+    checked_at = utc_stamp()
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(names)))) as ex:
+        results = list(ex.map(lambda n: _check_site_sync(n, checked_at), names))
+    return dict(zip(names, results))
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    threaded = "--threads" in args
+    names = [a for a in args if a != "--threads"] or None
+    for site, result in (check_all_threaded(names) if threaded else check_all(names)).items():
+        print(f"{site}: {result}")
@@ -2,7 +2,7 @@ import requests
 from bs4 import BeautifulSoup
 import hashlib
 import os
-from datetime import datetime
+from scrapers._base import utc_stamp
 
 TARGET_URL = "https://www.cpuc.ca.gov"
 CACHE_DIR = os.path.join(os.path.dirname(__file__), ".cache")
@@ -22,17 +22,23 @@ def compute_hash(content):
     return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
 def load_last_hash():
-    if not os.path.exists(CACHE_FILE):
+    try:
+        with open(CACHE_FILE, "rb") as f:
+            return f.read().decode().strip()
+    except FileNotFoundError:
         return None
-    with open(CACHE_FILE, "r") as f:
-        return f.read().strip()
 
 def save_hash(new_hash):
-    os.makedirs(CACHE_DIR, exist_ok=True)
-    with open(CACHE_FILE, "w") as f:
+    # open first, create the directory only on the very first save
+    try:
+        f = open(CACHE_FILE, "w")
+    except FileNotFoundError:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        f = open(CACHE_FILE, "w")
+    with f:
         f.write(new_hash)
 
-def check_for_update():
+def check_for_update(checked_at=None):
     html = fetch_html()
     content = extract_content(html)
     new_hash = compute_hash(content)
@@ -45,7 +51,7 @@ def check_for_update():
     return {
         "url": TARGET_URL,
         "updated": updated,
-        "lastChecked": datetime.utcnow().isoformat() + "Z",
+        "lastChecked": checked_at or utc_stamp(),
         "diffSummary": "CPUC homepage content changed" if updated else "No change detected"
     }
 
@@ -6,7 +6,9 @@ Commands:
   - list:   List discovered scrapers (optionally filter by state)
   - scrape: Run one scraper by source_id (with optional state/selector/force)
   - bulk:   Run many scrapers via the API (filter by state/pattern/limit)
-            and optionally write results to JSONL
+            and optionally write results to JSONL; runs go out concurrently
+            (--concurrency, default 20) on one async client; the scraper
+            listing is reused from ~/.cache/reg-bridge for --list-ttl seconds
 
 Examples:
   python scripts/admin_client.py list
@@ -19,29 +21,83 @@ Examples:
     --source-id air-quality-permits_html_scraper --state wa --force
 
   python scripts/admin_client.py bulk --state ca --pattern air --limit 5 --only-updated --out data/runs/api_bulk.jsonl
+  python scripts/admin_client.py bulk --state tx --concurrency 8
+  python scripts/admin_client.py bulk --state tx --pattern oil --list-ttl 0   # always refetch the listing
 """
 from __future__ import annotations
 
 import argparse
+import asyncio
+import hashlib
 import json
+import os
+import re
 import sys
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional
 
 import httpx
+import orjson
+
+DEFAULT_CONCURRENCY = 20
+JSONL_BATCH = 256  # records joined per write() to the --out file
+# bulk reuses a scraper listing fetched within the last LIST_CACHE_TTL seconds
+LIST_CACHE_DIR = Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "reg-bridge"
+LIST_CACHE_TTL = 60.0
+
+
+def _jsonl(rec: Dict[str, Any]) -> bytes:
+    return orjson.dumps(rec) + b"\n"
+
+
+def _list_cache_path(base_url: str, state: str | None) -> Path:
+    key = hashlib.blake2b(f"{base_url}\0{state or ''}".encode("utf-8"), digest_size=8).hexdigest()
+    return LIST_CACHE_DIR / f"list-{key}.json"
+
+
+def _cached_listing(path: Path, ttl: float) -> Optional[List[Dict[str, Any]]]:
+    try:
+        if time.time() - path.stat().st_mtime < ttl:
+            return orjson.loads(path.read_bytes())
+    except (OSError, ValueError):
+        pass  # missing, unreadable or half-written: refetch
+    return None
+
+
+def _store_listing(path: Path, items: List[Dict[str, Any]]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(orjson.dumps(items))
+        os.replace(tmp, path)
+    except OSError:
+        pass  # the cache is only an optimisation
 
 
 def pretty(obj: Any) -> str:
     return json.dumps(obj, ensure_ascii=False, indent=2)
 
 
-def list_scrapers(base_url: str, state: str | None, timeout: float) -> List[Dict[str, Any]]:
-    params = {}
+def _list_params(state: str | None) -> Dict[str, str]:
+    return {"state": state} if state else {}
+
+
+def _scrape_params(source_id: str, state: str | None, selector: str | None, force: bool) -> Dict[str, str]:
+    params = {"source_id": source_id}
     if state:
         params["state"] = state
+    if selector:
+        params["selector"] = selector
+    if force:
+        params["force"] = "true"
+    return params
+
+
+def list_scrapers(base_url: str, state: str | None, timeout: float) -> List[Dict[str, Any]]:
     with httpx.Client(base_url=base_url, timeout=timeout) as c:
-        r = c.get("/admin/scrapers", params=params)
+        r = c.get("/admin/scrapers", params=_list_params(state))
         r.raise_for_status()
         return r.json()
 
@@ -54,19 +110,30 @@ def run_scraper(
     force: bool,
     timeout: float,
 ) -> Dict[str, Any]:
-    params = {"source_id": source_id}
-    if state:
-        params["state"] = state
-    if selector:
-        params["selector"] = selector
-    if force:
-        params["force"] = "true"
     with httpx.Client(base_url=base_url, timeout=timeout) as c:
-        r = c.post("/admin/scrape", params=params)
+        r = c.post("/admin/scrape", params=_scrape_params(source_id, state, selector, force))
         r.raise_for_status()
         return r.json()
 
 
+async def _list_scrapers_async(client: httpx.AsyncClient, state: str | None) -> List[Dict[str, Any]]:
+    r = await client.get("/admin/scrapers", params=_list_params(state))
+    r.raise_for_status()
+    return r.json()
+
+
+async def _run_scraper_async(
+    client: httpx.AsyncClient,
+    source_id: str,
+    state: str | None,
+    selector: str | None,
+    force: bool,
+) -> Dict[str, Any]:
+    r = await client.post("/admin/scrape", params=_scrape_params(source_id, state, selector, force))
+    r.raise_for_status()
+    return r.json()
+
+
 def bulk_scrape(
     base_url: str,
     state: str | None,
@@ -76,80 +143,134 @@ def bulk_scrape(
     force: bool,
     out_path: Path | None,
     timeout: float,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    list_ttl: float = LIST_CACHE_TTL,
 ) -> None:
-    items = list_scrapers(base_url, state, timeout)
-    if pattern:
-        pat = pattern.lower()
-        items = [it for it in items if pat in it["source_id"].lower() or pat in it["path"].lower()]
-    if limit and limit > 0:
-        items = items[:limit]
-    if not items:
-        print("No scrapers matched.")
-        return
+    asyncio.run(
+        bulk_scrape_async(
+            base_url, state, pattern, limit, only_updated, force, out_path, timeout, concurrency, list_ttl
+        )
+    )
+
+
+async def bulk_scrape_async(
+    base_url: str,
+    state: str | None,
+    pattern: str | None,
+    limit: int,
+    only_updated: bool,
+    force: bool,
+    out_path: Path | None,
+    timeout: float,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    list_ttl: float = LIST_CACHE_TTL,
+) -> None:
+    """Run the matched scrapers with up to `concurrency` requests in flight on one pooled client.
+
+    The listing is read from the on-disk cache when it is younger than `list_ttl` seconds (0 disables).
+    """
+    concurrency = max(1, concurrency)
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, http2=True, limits=limits) as client:
+        cache_path = _list_cache_path(base_url, state)
+        items = _cached_listing(cache_path, list_ttl) if list_ttl > 0 else None
+        if items is None:
+            items = await _list_scrapers_async(client, state)
+            if list_ttl > 0:
+                _store_listing(cache_path, items)
+        if pattern:
+            # case-insensitive substring match without lowercasing a copy of every name
+            pat = re.compile(re.escape(pattern), re.IGNORECASE).search
+            items = [it for it in items if pat(it["source_id"]) or pat(it["path"])]
+        if limit and limit > 0:
+            items = items[:limit]
+        if not items:
+            print("No scrapers matched.")
+            return
+
+        # one pass over the listing into parallel columns; the loops below zip them
+        sids = [it["source_id"] for it in items]
+        sts = [it["state"] for it in items]
+        mods = [it.get("module") for it in items]
+        paths = [it.get("path") for it in items]
+
+        ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        sem = asyncio.Semaphore(concurrency)
+
+        async def sem_run(sid: str, st: str) -> Dict[str, Any]:
+            async with sem:
+                return await _run_scraper_async(client, sid, st, None, force)
 
+        results = await asyncio.gather(*(sem_run(sid, st) for sid, st in zip(sids, sts)), return_exceptions=True)
+
+    # Report and write in listing order from this task once every run is done
     if out_path:
         out_path.parent.mkdir(parents=True, exist_ok=True)
-        fh = out_path.open("w", encoding="utf-8")
+        fh = out_path.open("wb", buffering=1 << 20)
     else:
         fh = None
 
-    ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
     ok = upd = fail = 0
+    batch: List[bytes] = []
 
-    for it in items:
-        sid = it["source_id"]
-        st = it["state"]
-        try:
-            res = run_scraper(base_url, sid, st, selector=None, force=force, timeout=timeout)
-            ok += 1
-            is_upd = bool(res.get("updated"))
-            if is_upd:
-                upd += 1
-                print(f"✓ UPDATED {st} {sid}")
-            else:
-                if not only_updated:
-                    print(f"• {st} {sid} (no change)")
-            if fh:
-                rec = {
-                    "source_id": sid,
-                    "state": st,
-                    "module": it.get("module"),
-                    "path": it.get("path"),
-                    "run_at": ts,
-                    "ok": True,
-                    "result": res,
-                }
-                fh.write(json.dumps(rec, ensure_ascii=False) + "\n")
-        except httpx.HTTPStatusError as e:
+    for sid, st, mod, path, res in zip(sids, sts, mods, paths, results):
+        if isinstance(res, httpx.HTTPStatusError):
+            e = res
             fail += 1
             print(f"✗ {st} {sid}: HTTP {e.response.status_code} — {e.response.text[:200]}")
             if fh:
                 rec = {
                     "source_id": sid,
                     "state": st,
-                    "module": it.get("module"),
-                    "path": it.get("path"),
+                    "module": mod,
+                    "path": path,
                     "run_at": ts,
                     "ok": False,
                     "error": f"HTTP {e.response.status_code}: {e.response.text}",
                 }
-                fh.write(json.dumps(rec, ensure_ascii=False) + "\n")
-        except Exception as e:
+                batch.append(_jsonl(rec))
+        elif isinstance(res, BaseException):
+            e = res
             fail += 1
             print(f"✗ {st} {sid}: {e}")
             if fh:
                 rec = {
                     "source_id": sid,
                     "state": st,
-                    "module": it.get("module"),
-                    "path": it.get("path"),
+                    "module": mod,
+                    "path": path,
                     "run_at": ts,
                     "ok": False,
                     "error": str(e),
                 }
-                fh.write(json.dumps(rec, ensure_ascii=False) + "\n")
+                batch.append(_jsonl(rec))
+        else:
+            ok += 1
+            is_upd = bool(res.get("updated"))
+            if is_upd:
+                upd += 1
+                print(f"✓ UPDATED {st} {sid}")
+            else:
+                if not only_updated:
+                    print(f"• {st} {sid} (no change)")
+            if fh:
+                rec = {
+                    "source_id": sid,
+                    "state": st,
+                    "module": mod,
+                    "path": path,
+                    "run_at": ts,
+                    "ok": True,
+                    "result": res,
+                }
+                batch.append(_jsonl(rec))
+        if len(batch) >= JSONL_BATCH:
+            fh.write(b"".join(batch))
+            batch.clear()
 
     if fh:
+        if batch:
+            fh.write(b"".join(batch))
         fh.close()
         print(f"\nWrote results → {out_path}")
 
@@ -178,6 +299,10 @@ def main():
     p_bulk.add_argument("--only-updated", action="store_true", help="Print only updated results")
     p_bulk.add_argument("--force", action="store_true", help="Clear cache before each run")
     p_bulk.add_argument("--out", type=Path, help="Write JSONL results to this file (e.g., data/runs/api_bulk.jsonl)")
+    p_bulk.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Max scrapers in flight at once")
+    p_bulk.add_argument(
+        "--list-ttl", type=float, default=LIST_CACHE_TTL, help="Reuse a cached scraper listing this many seconds (0 = off)"
+    )
 
     args = ap.parse_args()
 
@@ -208,6 +333,8 @@ def main():
             force=args.force,
             out_path=args.out,
             timeout=args.timeout,
+            concurrency=args.concurrency,
+            list_ttl=args.list_ttl,
         )
         return
 
@@ -59,253 +59,83 @@ from __future__ import annotations
 
 import argparse
 import hashlib
+import importlib.util
 import io
-import json
-import re
+import marshal
+import os
+import string
+import struct
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
-from urllib.parse import urlparse
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import orjson
+
+# sibling module; a mypyc-built extension of it is picked up automatically
+from scraper_gen_core import (
+    STATE_TO_CODE,
+    URL_KEYS,
+    filename_stem_for,
+    guess_type,
+    host_slug,
+    iter_nodes,
+    normalize_entries,
+    path_slug,
+    pick_url,
+    slugify,
+    state_code_for,
+    unique_filename,
+)
 
 # -------------------------
-# State mapping
+# Config reading
 # -------------------------
 
-def _norm_state_key(s: str) -> str:
-    s = s.lower().strip()
-    s = re.sub(r"\bstate of\b", "", s)
-    s = re.sub(r"[^a-z]+", " ", s)
-    return re.sub(r"\s+", " ", s).strip()
-
-STATE_TO_CODE: Dict[str, str] = {
-    # 50 states + DC
-    "alabama": "al", "al": "al",
-    "alaska": "ak", "ak": "ak",
-    "arizona": "az", "az": "az",
-    "arkansas": "ar", "ar": "ar",
-    "california": "ca", "ca": "ca",
-    "colorado": "co", "co": "co",
-    "connecticut": "ct", "ct": "ct",
-    "delaware": "de", "de": "de",
-    "florida": "fl", "fl": "fl",
-    "georgia": "ga", "ga": "ga",
-    "hawaii": "hi", "hi": "hi",
-    "idaho": "id", "id": "id",
-    "illinois": "il", "il": "il",
-    "indiana": "in", "in": "in",
-    "iowa": "ia", "ia": "ia",
-    "kansas": "ks", "ks": "ks",
-    "kentucky": "ky", "ky": "ky",
-    "louisiana": "la", "la": "la",
-    "maine": "me", "me": "me",
-    "maryland": "md", "md": "md",
-    "massachusetts": "ma", "ma": "ma",
-    "michigan": "mi", "mi": "mi",
-    "minnesota": "mn", "mn": "mn",
-    "mississippi": "ms", "ms": "ms",
-    "missouri": "mo", "mo": "mo",
-    "montana": "mt", "mt": "mt",
-    "nebraska": "ne", "ne": "ne",
-    "nevada": "nv", "nv": "nv",
-    "new hampshire": "nh", "nh": "nh",
-    "new jersey": "nj", "nj": "nj",
-    "new mexico": "nm", "nm": "nm",
-    "new york": "ny", "ny": "ny",
-    "north carolina": "nc", "nc": "nc",
-    "north dakota": "nd", "nd": "nd",
-    "ohio": "oh", "oh": "oh",
-    "oklahoma": "ok", "ok": "ok",
-    "oregon": "or", "or": "or",
-    "pennsylvania": "pa", "pa": "pa",
-    "rhode island": "ri", "ri": "ri",
-    "south carolina": "sc", "sc": "sc",
-    "south dakota": "sd", "sd": "sd",
-    "tennessee": "tn", "tn": "tn",
-    "texas": "tx", "tx": "tx",
-    "utah": "ut", "ut": "ut",
-    "vermont": "vt", "vt": "vt",
-    "virginia": "va", "va": "va",
-    "washington": "wa", "wa": "wa",
-    "west virginia": "wv", "wv": "wv",
-    "wisconsin": "wi", "wi": "wi",
-    "wyoming": "wy", "wy": "wy",
-    "district of columbia": "dc", "washington dc": "dc", "dc": "dc", "d c": "dc"
-}
-
-def state_code_for(name: Optional[str]) -> Optional[str]:
-    if not name:
-        return None
-    key = _norm_state_key(name)
-    return STATE_TO_CODE.get(key)
-
-# -------------------------
-# Helpers
-# -------------------------
+def _json_rows(lines: Iterable[bytes]) -> Iterator[Any]:
+    """NDJSON: one parsed value per non-blank line; unparseable lines are skipped."""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield orjson.loads(line)
+        except ValueError:
+            pass
 
-URL_KEYS = ["target_url", "url", "link", "href", "source_url", "pdf_url", "website"]
+def _stream_rows(f, head: List[bytes]) -> Iterator[Any]:
+    with f:
+        yield from _json_rows(chain(head, f))
 
 def read_json(path: Path) -> Any:
-    txt = path.read_text(encoding="utf-8")
-    try:
-        return json.loads(txt)
-    except json.JSONDecodeError:
-        # Try NDJSON
-        rows = []
-        for line in txt.splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                rows.append(json.loads(line))
-            except Exception:
-                pass
-        if rows:
-            return rows
-        raise
-
-def slugify(s: str, max_len: int = 50) -> str:
-    s = s.strip().lower()
-    s = re.sub(r"https?://", "", s)
-    s = re.sub(r"[^a-z0-9]+", "-", s)
-    s = s.strip("-")
-    if len(s) > max_len:
-        s = s[:max_len].rstrip("-")
-    return s or "source"
-
-def host_slug(u: str) -> str:
-    try:
-        h = urlparse(u).netloc.lower()
-        h = re.sub(r"^www\.", "", h)
-        return slugify(h, max_len=50)
-    except Exception:
-        return "host"
-
-def path_slug(u: str) -> str:
-    try:
-        p = urlparse(u).path
-        if not p or p == "/":
-            return "root"
-        parts = [seg for seg in p.split("/") if seg]
-        parts = parts[:4]  # keep it short
-        s = "-".join(slugify(seg, 20) for seg in parts if seg)
-        return s or "root"
-    except Exception:
-        return "root"
-
-def guess_type(u: str) -> str:
-    return "pdf" if u.lower().split("?")[0].endswith(".pdf") else "html"
-
-def iter_nodes(x: Any) -> Iterable[Dict[str, Any]]:
-    if isinstance(x, dict):
-        yield x
-        for v in x.values():
-            yield from iter_nodes(v)
-    elif isinstance(x, list):
-        for v in x:
-            yield from iter_nodes(v)
-
-def pick_url(d: Dict[str, Any]) -> Optional[str]:
-    for k in URL_KEYS:
-        v = d.get(k)
-        if isinstance(v, str) and v.startswith(("http://", "https://")):
-            return v
-    return None
-
-def normalize_entries(raw: Any, default_selector: Optional[str]) -> List[Dict[str, Any]]:
     """
-    Produce entries with:
-      { name?: str, target_url: str, type?: 'html'|'pdf', selector?: str }
-    Accepts:
-      - dict of {state: [url, url, ...]}  <-- your file shape
-      - list of strings (urls)
-      - list/dicts with any of URL_KEYS
-      - nested structures (recursively)
+    Parse the config file. A single JSON document is returned as-is; NDJSON
+    comes back as an iterator that reads and parses one line at a time, so a
+    large URL list is never held in memory as a whole.
     """
-    entries: List[Dict[str, Any]] = []
-
-    # Case 1: dict of "state": [urls...]
-    if isinstance(raw, dict):
-        all_values_are_lists = all(isinstance(v, list) for v in raw.values())
-        if all_values_are_lists:
-            for state, urls in raw.items():
-                if not isinstance(urls, list):
-                    continue
-                for u in urls:
-                    if isinstance(u, str) and u.startswith(("http://", "https://")):
-                        entries.append({
-                            "name": state,
-                            "target_url": u,
-                            "type": guess_type(u),
-                            "selector": default_selector if guess_type(u) == "html" else None,
-                        })
-        else:
-            # Fall through to generic walker
-            pass
-
-    # Generic walker: catches lists, nested dicts, etc.
-    for node in iter_nodes(raw):
-        url = pick_url(node)
-        if url:
-            name = (node.get("name")
-                    or node.get("slug")
-                    or node.get("id")
-                    or node.get("title")
-                    or node.get("state")
-                    or None)
-            entries.append({
-                "name": name,
-                "target_url": url,
-                "type": (node.get("type") or guess_type(url)).lower(),
-                "selector": node.get("selector") or (default_selector if guess_type(url) == "html" else None),
-            })
-        # Also allow plain url strings tucked inside dicts
-        for k, v in list(node.items()):
-            if isinstance(v, str) and v.startswith(("http://", "https://")) and k not in URL_KEYS:
-                entries.append({
-                    "name": node.get("name") or node.get("slug") or node.get("id") or node.get("title") or None,
-                    "target_url": v,
-                    "type": guess_type(v),
-                    "selector": default_selector if guess_type(v) == "html" else None,
-                })
-
-    # Also, if the top-level is a list of raw URL strings:
-    if isinstance(raw, list):
-        for v in raw:
-            if isinstance(v, str) and v.startswith(("http://", "https://")):
-                entries.append({
-                    "name": None,
-                    "target_url": v,
-                    "type": guess_type(v),
-                    "selector": default_selector if guess_type(v) == "html" else None,
-                })
-
-    # Filter + de-dup by target_url
-    norm: List[Dict[str, Any]] = []
-    seen = set()
-    for e in entries:
-        u = e.get("target_url")
-        if not u:
-            continue
-        if u in seen:
-            continue
-        seen.add(u)
-        t = (e.get("type") or guess_type(u)).lower()
-        e["type"] = t if t in ("html", "pdf") else guess_type(u)
-        if e["type"] == "html" and not e.get("selector"):
-            e["selector"] = default_selector
-        norm.append(e)
-
-    return norm
-
-def unique_filename(base: str, used: set[str]) -> str:
-    """Ensure unique filename stem (without extension) within a directory."""
-    b = base
-    i = 2
-    while b in used:
-        b = f"{base}-{i}"
-        i += 1
-    used.add(b)
-    return b
+    f = path.open("rb")
+    head = next((ln for ln in f if ln.strip()), b"")
+    try:
+        first = orjson.loads(head)
+    except ValueError:
+        # Multi-line (pretty-printed) document
+        with f:
+            buf = head + f.read()
+        try:
+            return orjson.loads(buf)
+        except ValueError:
+            rows = list(_json_rows(buf.splitlines()))
+            if rows:
+                return rows
+            raise
+    more = next((ln for ln in f if ln.strip()), None)
+    if more is None:
+        f.close()
+        return first
+    # a second value after a complete first line: NDJSON
+    return _stream_rows(f, [head, more])
 
 # -------------------------
 # Templates
@@ -341,7 +171,11 @@ CONTENT_FILE   = CACHE_DIR / "last_content.txt"
 
 DEFAULT_SELECTOR = {default_selector!r}
 
-def _head(url: str):
+def _head(url: str, client=None):
+    if client is not None:  # shared httpx.Client from the caller (e.g. run_all_scrapers)
+        r = client.head(url, timeout=15.0, follow_redirects=True)
+        r.raise_for_status()
+        return r
     if _HTTPX:
         with httpx.Client(timeout=15.0, follow_redirects=True) as c:
             r = c.head(url)
@@ -353,7 +187,11 @@ def _head(url: str):
             r.raise_for_status()
         return r
 
-def _get_text(url: str) -> str:
+def _get_text(url: str, client=None) -> str:
+    if client is not None:
+        r = client.get(url, timeout=30.0, follow_redirects=True, headers={{"User-Agent": "RegDataBridge/1.0"}})
+        r.raise_for_status()
+        return r.text
     if _HTTPX:
         with httpx.Client(timeout=30.0, follow_redirects=True, headers={{"User-Agent": "RegDataBridge/1.0"}}) as c:
             r = c.get(url)
@@ -378,19 +216,19 @@ def _extract_text(html: str, selector: Optional[str]) -> str:
             text_parts.append(t)
     return "\\n\\n".join(text_parts).strip()
 
-def check_for_update(selector: Optional[str] = None) -> dict:
+def check_for_update(selector: Optional[str] = None, client=None) -> dict:
     selector = selector or DEFAULT_SELECTOR
     new_signature = ""
     html = ""
     try:
-        head_r = _head(TARGET_URL)
+        head_r = _head(TARGET_URL, client)
         etag = head_r.headers.get("ETag", "")
         lm = head_r.headers.get("Last-Modified", "")
         cl = head_r.headers.get("Content-Length", "")
         if etag or lm or cl:
             new_signature = f"etag={{etag}}|lm={{lm}}|cl={{cl}}"
         else:
-            html = _get_text(TARGET_URL)
+            html = _get_text(TARGET_URL, client)
             new_signature = f"sha256={{hashlib.sha256(html.encode('utf-8', 'ignore')).hexdigest()}}"
     except Exception as e:
         return {{
@@ -420,7 +258,7 @@ def check_for_update(selector: Optional[str] = None) -> dict:
     if is_updated:
         if not html:
             try:
-                html = _get_text(TARGET_URL)
+                html = _get_text(TARGET_URL, client)
             except Exception as e:
                 return {{
                     "url": TARGET_URL,
@@ -507,7 +345,11 @@ CACHE_DIR.mkdir(parents=True, exist_ok=True)
 SIGNATURE_FILE = CACHE_DIR / "last_signature.json"
 CONTENT_FILE = CACHE_DIR / "last_content.txt"
 
-def _head(url: str):
+def _head(url: str, client=None):
+    if client is not None:  # shared httpx.Client from the caller (e.g. run_all_scrapers)
+        r = client.head(url, timeout=15.0, follow_redirects=True)
+        r.raise_for_status()
+        return r
     if _HTTPX:
         with httpx.Client(timeout=15.0, follow_redirects=True) as c:
             r = c.head(url)
@@ -519,7 +361,11 @@ def _head(url: str):
             r.raise_for_status()
         return r
 
-def _get_bytes(url: str) -> bytes:
+def _get_bytes(url: str, client=None) -> bytes:
+    if client is not None:
+        r = client.get(url, timeout=30.0, follow_redirects=True, headers={{"User-Agent": "RegDataBridge/1.0"}})
+        r.raise_for_status()
+        return r.content
     if _HTTPX:
         with httpx.Client(timeout=30.0, follow_redirects=True, headers={{"User-Agent": "RegDataBridge/1.0"}}) as c:
             r = c.get(url)
@@ -544,18 +390,18 @@ def _extract_text_from_pdf_bytes(pdf_bytes: bytes) -> str:
         return (pdfminer_extract_text(io.BytesIO(pdf_bytes)) or "").strip()
     raise RuntimeError("No PDF text extraction library found (install pypdf or pdfminer.six)")
 
-def check_for_update() -> dict:
+def check_for_update(client=None) -> dict:
     new_signature = ""
     pdf_bytes = b""
     try:
-        head_r = _head(TARGET_URL)
+        head_r = _head(TARGET_URL, client)
         etag = head_r.headers.get("ETag", "")
         lm = head_r.headers.get("Last-Modified", "")
         cl = head_r.headers.get("Content-Length", "")
         if etag or lm or cl:
             new_signature = f"etag={{etag}}|lm={{lm}}|cl={{cl}}"
         else:
-            pdf_bytes = _get_bytes(TARGET_URL)
+            pdf_bytes = _get_bytes(TARGET_URL, client)
             new_signature = f"sha256={{hashlib.sha256(pdf_bytes).hexdigest()}}"
     except Exception as e:
         return {{
@@ -585,7 +431,7 @@ def check_for_update() -> dict:
     if is_updated:
         if not pdf_bytes:
             try:
-                pdf_bytes = _get_bytes(TARGET_URL)
+                pdf_bytes = _get_bytes(TARGET_URL, client)
             except Exception as e:
                 return {{
                     "url": TARGET_URL,
@@ -644,41 +490,85 @@ if __name__ == "__main__":
 # Generation
 # -------------------------
 
-def filename_stem_for(entry: Dict[str, Any]) -> str:
-    """Build a friendly filename stem without extension."""
-    url = entry["target_url"]
-    parts = []
-    if entry.get("name"):
-        parts.append(slugify(str(entry["name"]), 40))
-    parts.append(host_slug(url))
-    ps = path_slug(url)
-    if ps != "root":
-        parts.append(ps)
-    stem = "-".join([p for p in parts if p]) or "source"
-    return stem
-
 def target_directory_for(entry: Dict[str, Any], base_outdir: Path) -> Path:
     """Return base_outdir/state/<code> or base_outdir/state/_unknown."""
     code = state_code_for(entry.get("name"))
-    sub = code if code else "_unknown"
+    return _state_directory(base_outdir, code if code else "_unknown")
+
+@lru_cache(maxsize=None)
+def _state_directory(base_outdir: Path, sub: str) -> Path:
+    # once per state folder: ~50 mkdir/marker probes instead of 4 per entry
     d = base_outdir / "state" / sub
     d.mkdir(parents=True, exist_ok=True)
     # Ensure package markers (if you like to import scrapers.*)
     for mark in [base_outdir, base_outdir / "state", d]:
-        initp = mark / "__init__.py"
-        if not initp.exists():
-            initp.write_text("# generated package marker\n", encoding="utf-8")
+        _ensure_marker(mark / "__init__.py")
     return d
 
+# markers already checked/written this run: the shared outdir and state/ ones
+# are probed once, not once per state folder
+_INIT_DONE: set[Path] = set()
+
+def _ensure_marker(initp: Path) -> None:
+    if initp in _INIT_DONE:
+        return
+    if not initp.exists():
+        initp.write_text("# generated package marker\n", encoding="utf-8")
+    _INIT_DONE.add(initp)
+
+def _compile_template(fmt: str) -> List[tuple]:
+    """
+    Parse a str.format template once into (literal, field, conversion) parts.
+    Rendering then only joins strings: no re-scan of the ~6 KB template (and its
+    {{ }} escapes) per generated file.
+    """
+    parts = []
+    for literal, field, spec, conv in string.Formatter().parse(fmt):
+        if spec:
+            raise ValueError(f"format spec not supported in templates: {field}:{spec}")
+        parts.append((literal, field, conv))
+    return parts
+
+def _render(parts: List[tuple], **values: Any) -> str:
+    out = []
+    for literal, field, conv in parts:
+        out.append(literal)
+        if field is not None:
+            v = values[field]
+            out.append(repr(v) if conv == "r" else str(v))
+    return "".join(out)
+
+WRITE_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+_HTML_PARTS = _compile_template(HTML_TEMPLATE)
+_PDF_PARTS = _compile_template(PDF_TEMPLATE)
+
 def render_template(entry: Dict[str, Any], default_selector: Optional[str]) -> str:
     t = entry["type"]
     if t == "pdf":
-        return PDF_TEMPLATE.format(target_url=entry["target_url"])
-    return HTML_TEMPLATE.format(
+        return _render(_PDF_PARTS, target_url=entry["target_url"])
+    return _render(
+        _HTML_PARTS,
         target_url=entry["target_url"],
         default_selector=(entry.get("selector") or default_selector or "main, article, section, h1, h2, h3"),
     )
 
+def _write_scraper(path: Path, src: str) -> None:
+    """Write the module and its __pycache__ .pyc, so its first import skips compiling."""
+    path.write_text(src, encoding="utf-8")
+    if sys.dont_write_bytecode:
+        return
+    code = compile(src, str(path), "exec")
+    st = path.stat()
+    # timestamp-based pyc header (PEP 552): magic, flags=0, source mtime, source size
+    header = (importlib.util.MAGIC_NUMBER + b"\x00\x00\x00\x00"
+              + struct.pack("<II", int(st.st_mtime) & 0xFFFFFFFF, st.st_size & 0xFFFFFFFF))
+    pyc = Path(importlib.util.cache_from_source(str(path)))
+    pyc.parent.mkdir(exist_ok=True)
+    tmp = pyc.with_name(f"{pyc.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(header + marshal.dumps(code))
+    os.replace(tmp, pyc)
+
 def main():
     ap = argparse.ArgumentParser(description="Generate scraper modules from a config file.")
     ap.add_argument("--config", required=True, help="Path to config JSON (dict of state→urls or list).")
@@ -691,9 +581,7 @@ def main():
     outdir = Path(args.outdir)
     outdir.mkdir(parents=True, exist_ok=True)
     # top-level package marker
-    init_path = outdir / "__init__.py"
-    if not init_path.exists():
-        init_path.write_text("# generated package marker\n", encoding="utf-8")
+    _ensure_marker(outdir / "__init__.py")
 
     try:
         raw = read_json(cfg_path)
@@ -708,25 +596,37 @@ def main():
 
     # Track uniqueness per directory (so same stem can appear under different states)
     used_stems_per_dir: Dict[Path, set[str]] = {}
-    written = 0
+    next_suffix_per_dir: Dict[Path, Dict[str, int]] = {}
+    # one scandir per state folder instead of a stat per entry
+    existing_per_dir: Dict[Path, set[str]] = {}
+    jobs: List[tuple] = []
 
     for e in entries:
         dirpath = target_directory_for(e, outdir)
         used = used_stems_per_dir.setdefault(dirpath, set())
         stem = filename_stem_for(e)
-        stem = unique_filename(stem, used)
+        stem = unique_filename(stem, used, next_suffix_per_dir.setdefault(dirpath, {}))
         suffix = "_html_scraper.py" if e["type"] == "html" else "_pdf_scraper.py"
         path = dirpath / f"{stem}{suffix}"
 
-        if path.exists() and not args.overwrite:
-            print(f"Skip (exists): {path}")
-            continue
+        if not args.overwrite:
+            existing = existing_per_dir.get(dirpath)
+            if existing is None:
+                with os.scandir(dirpath) as it:
+                    existing = existing_per_dir[dirpath] = {de.name for de in it}
+            if path.name in existing:
+                print(f"Skip (exists): {path}")
+                continue
+
+        jobs.append((path, render_template(e, args.default_selector)))
 
-        src = render_template(e, args.default_selector)
-        path.write_text(src, encoding="utf-8")
-        written += 1
+    # Naming/skip decisions above stay sequential; only the file writes (which
+    # release the GIL) fan out across threads.
+    if jobs:
+        with ThreadPoolExecutor(max_workers=min(WRITE_WORKERS, len(jobs))) as ex:
+            list(ex.map(lambda job: _write_scraper(*job), jobs))
 
-    print(f"Generated {written} scraper(s) under {outdir.resolve()}/state/<code>/")
+    print(f"Generated {len(jobs)} scraper(s) under {outdir.resolve()}/state/<code>/")
 
 if __name__ == "__main__":
     main()
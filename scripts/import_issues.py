@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-import_issues.py — Bulk-create GitHub issues from JSON via the REST API.
+import_issues.py — Bulk-create GitHub issues from JSON via the GitHub API.
 
 Place at: tools/import_issues.py
 Run from the repo root (folder that contains app/).
@@ -11,6 +11,8 @@ What this does:
     unless you pass --repo owner/name explicitly.
   - Ensures referenced milestones and labels exist (creates them if missing).
   - Skips creating issues whose titles already exist (ignores PRs).
+  - Creates issues in batches of aliased GraphQL createIssue mutations (one HTTP
+    call per --batch-size issues); items a batch rejects are retried over REST.
   - Supports a dry-run mode to preview actions without changing GitHub.
 
 JSON format (example):
@@ -43,18 +45,61 @@ Exit codes:
 from __future__ import annotations
 
 import argparse
+import atexit
 import json
 import os
 import re
 import subprocess
 import sys
-from typing import Dict, List, Optional, Set, Tuple
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 API = "https://api.github.com"
 
+_REPO_RE = re.compile(r"github\.com[:/](?P<owner>[^/]+)/(?P<repo>[^/.]+)")
+_LINK_NEXT_RE = re.compile(r'<([^>]+)>;\s*rel="next"')
+
+# One pooled keep-alive session for every API call: a run makes hundreds of
+# small requests to the same host, so reusing the TLS connection matters more
+# than anything else. Retries cover idempotent methods only (urllib3 default),
+# so a POST that timed out is never replayed into a duplicate issue; after the
+# last retry the 5xx response is returned so callers report it as before.
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    "Accept": "application/vnd.github+json",
+    "X-GitHub-Api-Version": "2022-11-28",
+    "User-Agent": "issue-importer-python",
+})
+_adapter = HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504], raise_on_status=False),
+)
+_SESSION.mount("https://", _adapter)
+_SESSION.mount("http://", _adapter)
+
+# times a request is re-sent after a rate-limited (403/429) response
+RATE_LIMIT_RETRIES = 5
+# when fewer calls than this remain in the window, wait for the reset first
+RATE_LIMIT_FLOOR = 5
+# issues per aliased createIssue mutation (default for --batch-size)
+GRAPHQL_BATCH = 20
+
+# GET url -> [etag, body, Link header]. List calls are re-sent with If-None-Match;
+# a 304 (which doesn't count against the rate limit) reuses the stored page.
+ETAG_CACHE_PATH = os.getenv("GH_ETAG_CACHE", os.path.join(".cache", "gh_etags.json"))
+_etags: Optional[Dict[str, list]] = None
+_etags_dirty = False
+_etags_lock = threading.Lock()
+
 
 def die(msg: str, code: int = 1) -> None:
     print(f"ERROR: {msg}", file=sys.stderr)
@@ -80,7 +125,7 @@ def detect_repo() -> Optional[str]:
             ["git", "remote", "get-url", "origin"], stderr=subprocess.DEVNULL
         ).decode().strip()
         # Supports git@github.com:owner/repo.git or https://github.com/owner/repo.git
-        m = re.search(r"github\.com[:/](?P<owner>[^/]+)/(?P<repo>[^/.]+)", url)
+        m = _REPO_RE.search(url)
         if m:
             return f"{m.group('owner')}/{m.group('repo')}"
     except Exception:
@@ -88,6 +133,49 @@ def detect_repo() -> Optional[str]:
     return None
 
 
+def _etag_cache() -> Dict[str, list]:
+    global _etags
+    with _etags_lock:
+        if _etags is None:
+            try:
+                with open(ETAG_CACHE_PATH, "r", encoding="utf-8") as f:
+                    _etags = json.load(f)
+            except (OSError, ValueError):
+                _etags = {}
+            atexit.register(_save_etag_cache)
+        return _etags
+
+
+def _save_etag_cache() -> None:
+    if not _etags_dirty:
+        return
+    try:
+        os.makedirs(os.path.dirname(ETAG_CACHE_PATH) or ".", exist_ok=True)
+        tmp = f"{ETAG_CACHE_PATH}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(_etags, f)
+        os.replace(tmp, ETAG_CACHE_PATH)
+    except OSError as e:
+        print(f"WARN: could not save {ETAG_CACHE_PATH}: {e}", file=sys.stderr)
+
+
+def _until_reset(resp: requests.Response) -> float:
+    reset = resp.headers.get("X-RateLimit-Reset", "")
+    return max(1.0, int(reset) - time.time()) if reset.isdigit() else 60.0
+
+
+def rate_limit_wait(resp: requests.Response) -> Optional[float]:
+    """Seconds to wait before re-sending a rate-limited request, or None if `resp` is not one."""
+    if resp.status_code not in (403, 429):
+        return None
+    retry_after = resp.headers.get("Retry-After", "")
+    if retry_after.isdigit():  # secondary limit
+        return float(retry_after)
+    if resp.headers.get("X-RateLimit-Remaining") == "0":  # primary limit
+        return _until_reset(resp)
+    return None
+
+
 def api_request(
     method: str,
     path: str,
@@ -96,49 +184,72 @@ def api_request(
     json_body: Optional[dict] = None,
     paginate: bool = False,
 ) -> Tuple[int, dict | list]:
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "Authorization": f"Bearer {token}",
-        "X-GitHub-Api-Version": "2022-11-28",
-        "User-Agent": "issue-importer-python",
-    }
+    headers = {"Authorization": f"Bearer {token}"}
     url = f"{API}{path}"
 
-    def do(req_url: str):
-        resp = requests.request(method, req_url, headers=headers, params=params, json=json_body, timeout=30)
+    def do(req_url: str) -> Tuple[int, Any, str]:
+        """(status, parsed body, Link header) for one request."""
+        global _etags_dirty
+        cached = None
+        req_headers = headers
+        if method == "GET" and params is None:
+            cached = _etag_cache().get(req_url)
+            if cached:
+                req_headers = {**headers, "If-None-Match": cached[0]}
+        resp = _SESSION.request(method, req_url, headers=req_headers, params=params, json=json_body, timeout=30)
+        # Rate limited: sleep as long as GitHub asks and re-send, so a long import
+        # slows down instead of aborting
+        for _ in range(RATE_LIMIT_RETRIES):
+            wait = rate_limit_wait(resp)
+            if wait is None:
+                break
+            print(f"Rate limited ({resp.status_code}); sleeping {wait:.0f}s", file=sys.stderr)
+            time.sleep(wait)
+            resp = _SESSION.request(method, req_url, headers=req_headers, params=params, json=json_body, timeout=30)
         # Friendly rate-limit message
         if resp.status_code == 403 and resp.headers.get("X-RateLimit-Remaining") == "0":
             reset = resp.headers.get("X-RateLimit-Reset")
             die(f"GitHub API rate limit exceeded. Try again after reset epoch {reset}.")
-        return resp
-
-    if not paginate:
-        r = do(url)
+        # Nearly out of calls: wait for the window to reset before the next one
+        remaining = resp.headers.get("X-RateLimit-Remaining", "")
+        if remaining.isdigit() and int(remaining) < RATE_LIMIT_FLOOR:
+            wait = _until_reset(resp)
+            print(f"{remaining} API calls left; sleeping {wait:.0f}s until reset", file=sys.stderr)
+            time.sleep(wait)
+        if resp.status_code == 304 and cached:
+            return 200, cached[1], cached[2]
         try:
-            data = r.json()
+            data = resp.json()
         except Exception:
-            data = {}
-        return r.status_code, data
+            data = None
+        link = resp.headers.get("Link", "")
+        etag = resp.headers.get("ETag")
+        if method == "GET" and params is None and resp.status_code == 200 and etag and data is not None:
+            with _etags_lock:
+                _etags[req_url] = [etag, data, link]
+                _etags_dirty = True
+        return resp.status_code, data, link
+
+    if not paginate:
+        code, data, _ = do(url)
+        return code, {} if data is None else data
 
     # Paginate (Link header); collect list results
     results: List = []
     next_url = url
     while next_url:
-        r = do(next_url)
-        try:
-            page = r.json()
-        except Exception:
+        code, page, link = do(next_url)
+        if page is None:
             page = []
         if isinstance(page, list):
             results.extend(page)
         else:
             # Unexpected payload; return as-is
-            return r.status_code, page
+            return code, page
         # Parse Link header
-        link = r.headers.get("Link", "")
-        m = re.search(r'<([^>]+)>;\s*rel="next"', link)
+        m = _LINK_NEXT_RE.search(link)
         next_url = m.group(1) if m else None
-        if r.status_code >= 400:
+        if code >= 400:
             break
     return 200, results
 
@@ -153,17 +264,25 @@ def get_existing_milestones(repo: str, token: str) -> Dict[str, int]:
     return out
 
 
-def ensure_milestone(repo: str, token: str, title: str) -> int:
+def ensure_milestone(repo: str, token: str, title: str, existing: Optional[Dict[str, int]] = None) -> int:
+    """
+    Return the milestone number for `title`, creating it if missing.
+
+    Pass the map from get_existing_milestones() as `existing` to skip re-listing
+    milestones on every call; newly created milestones are added to it.
+    """
     title = title.strip()
     if not title:
         return 0
-    existing = get_existing_milestones(repo, token)
+    if existing is None:
+        existing = get_existing_milestones(repo, token)
     if title in existing:
         return existing[title]
     code, data = api_request("POST", f"/repos/{repo}/milestones", token, json_body={"title": title})
     if code >= 400:
         die(f"Failed to create milestone '{title}': {data}")
-    return int(data["number"])
+    existing[title] = int(data["number"])
+    return existing[title]
 
 
 def get_existing_labels(repo: str, token: str) -> Set[str]:
@@ -173,16 +292,19 @@ def get_existing_labels(repo: str, token: str) -> Set[str]:
     return {lbl["name"] for lbl in data}
 
 
-def ensure_label(repo: str, token: str, name: str, color: str = "0E8A16") -> None:
+def ensure_label(repo: str, token: str, name: str, color: str = "0E8A16", existing: Optional[Set[str]] = None) -> None:
+    """Create label `name` if missing; `existing` (from get_existing_labels) avoids a re-list per call."""
     name = name.strip()
     if not name:
         return
-    existing = get_existing_labels(repo, token)
+    if existing is None:
+        existing = get_existing_labels(repo, token)
     if name in existing:
         return
     code, data = api_request("POST", f"/repos/{repo}/labels", token, json_body={"name": name, "color": color})
     if code >= 400 and not (code == 422 and "already_exists" in str(data)):
         die(f"Failed to create label '{name}': {data}")
+    existing.add(name)
 
 
 def get_existing_issue_titles(repo: str, token: str) -> Set[str]:
@@ -200,6 +322,66 @@ def get_existing_issue_titles(repo: str, token: str) -> Set[str]:
     return titles
 
 
+_SNAPSHOT_QUERY = """
+query($owner: String!, $name: String!, $after: String, $withMeta: Boolean!) {
+  repository(owner: $owner, name: $name) {
+    issues(first: 100, after: $after, states: [OPEN, CLOSED]) {
+      pageInfo { endCursor hasNextPage }
+      nodes { title }
+    }
+    milestones(first: 100, states: [OPEN, CLOSED]) @include(if: $withMeta) {
+      pageInfo { hasNextPage }
+      nodes { number title }
+    }
+    labels(first: 100) @include(if: $withMeta) {
+      pageInfo { hasNextPage }
+      nodes { name }
+    }
+  }
+}
+"""
+
+
+def get_repo_snapshot(repo: str, token: str) -> Tuple[Set[str], Dict[str, int], Set[str]]:
+    """
+    Existing issue titles, milestone numbers and label names in one GraphQL pass.
+
+    The first request returns milestones and labels alongside the first 100
+    issues; only issues are paged after that (GraphQL issues exclude PRs).
+    Repos with more than 100 milestones/labels fall back to the REST listing for
+    those, and any GraphQL failure falls back to the REST helpers entirely.
+    """
+    owner, name = repo.split("/", 1)
+    titles: Set[str] = set()
+    milestones: Optional[Dict[str, int]] = None
+    labels: Optional[Set[str]] = None
+    after: Optional[str] = None
+    while True:
+        variables = {"owner": owner, "name": name, "after": after, "withMeta": after is None}
+        code, data = api_request("POST", "/graphql", token, json_body={"query": _SNAPSHOT_QUERY, "variables": variables})
+        node = (data.get("data") or {}).get("repository") if isinstance(data, dict) else None
+        if code >= 400 or not node or data.get("errors"):
+            return (get_existing_issue_titles(repo, token),
+                    get_existing_milestones(repo, token),
+                    get_existing_labels(repo, token))
+        if after is None:
+            ms, lb = node["milestones"], node["labels"]
+            if not ms["pageInfo"]["hasNextPage"]:
+                milestones = {m["title"]: int(m["number"]) for m in ms["nodes"]}
+            if not lb["pageInfo"]["hasNextPage"]:
+                labels = {l["name"] for l in lb["nodes"]}
+        issues = node["issues"]
+        titles.update(it["title"] for it in issues["nodes"] if it.get("title"))
+        if not issues["pageInfo"]["hasNextPage"]:
+            break
+        after = issues["pageInfo"]["endCursor"]
+    if milestones is None:
+        milestones = get_existing_milestones(repo, token)
+    if labels is None:
+        labels = get_existing_labels(repo, token)
+    return titles, milestones, labels
+
+
 def create_issue(repo: str, token: str, title: str, body: str, labels: List[str], milestone_num: int) -> str:
     payload = {"title": title, "body": body or ""}
     if labels:
@@ -212,11 +394,87 @@ def create_issue(repo: str, token: str, title: str, body: str, labels: List[str]
     return data.get("html_url", "")
 
 
+def get_node_ids(
+    repo: str, token: str, labels: Set[str], milestone_nums: Set[int]
+) -> Optional[Tuple[str, Dict[str, str], Dict[int, str]]]:
+    """
+    Node IDs of the repo and of the given labels/milestones in one aliased query.
+
+    createIssue takes IDs rather than label names or milestone numbers. Returns
+    (repo_id, {label: id}, {milestone number: id}), or None if the query fails
+    or anything is missing (callers then stay on REST).
+    """
+    owner, name = repo.split("/", 1)
+    label_list = sorted(labels)
+    nums = sorted(milestone_nums)
+    params = "".join(f", $l{i}: String!" for i in range(len(label_list)))
+    fields = ["id"]
+    fields += [f"l{i}: label(name: $l{i}) {{ id }}" for i in range(len(label_list))]
+    fields += [f"m{i}: milestone(number: {n}) {{ id }}" for i, n in enumerate(nums)]
+    query = f"query($owner: String!, $name: String!{params}) {{ repository(owner: $owner, name: $name) {{ {' '.join(fields)} }} }}"
+    variables: Dict[str, Any] = {"owner": owner, "name": name}
+    variables.update((f"l{i}", lbl) for i, lbl in enumerate(label_list))
+    code, data = api_request("POST", "/graphql", token, json_body={"query": query, "variables": variables})
+    node = (data.get("data") or {}).get("repository") if isinstance(data, dict) else None
+    if code >= 400 or not node or data.get("errors"):
+        return None
+    found = [node.get(f"l{i}") for i in range(len(label_list))] + [node.get(f"m{i}") for i in range(len(nums))]
+    if not all(found):
+        return None
+    label_ids = {lbl: found[i]["id"] for i, lbl in enumerate(label_list)}
+    milestone_ids = {n: found[len(label_list) + i]["id"] for i, n in enumerate(nums)}
+    return node["id"], label_ids, milestone_ids
+
+
+def create_issues_graphql(
+    token: str,
+    batch: List[Tuple[str, str, List[str], int]],
+    ids: Tuple[str, Dict[str, str], Dict[int, str]],
+) -> Tuple[int, List[Optional[str]]]:
+    """
+    Create every (title, body, labels, milestone_num) in `batch` with one aliased
+    createIssue mutation. Returns the HTTP status and one URL per issue, None
+    where that issue's mutation failed.
+    """
+    repo_id, label_ids, milestone_ids = ids
+    inputs: Dict[str, dict] = {}
+    for i, (title, body, labels, milestone_num) in enumerate(batch):
+        inp: Dict[str, Any] = {"repositoryId": repo_id, "title": title, "body": body or ""}
+        if labels:
+            inp["labelIds"] = [label_ids[l] for l in labels]
+        if milestone_num:
+            inp["milestoneId"] = milestone_ids[milestone_num]
+        inputs[f"i{i}"] = inp
+    params = ", ".join(f"${k}: CreateIssueInput!" for k in inputs)
+    fields = " ".join(f"{k}: createIssue(input: ${k}) {{ issue {{ url }} }}" for k in inputs)
+    code, data = api_request("POST", "/graphql", token, json_body={"query": f"mutation({params}) {{ {fields} }}", "variables": inputs})
+    results = (data.get("data") or {}) if isinstance(data, dict) else {}
+    return code, [((results.get(k) or {}).get("issue") or {}).get("url") for k in inputs]
+
+
+def create_issue_batch(
+    repo: str,
+    token: str,
+    batch: List[Tuple[str, str, List[str], int]],
+    ids: Tuple[str, Dict[str, str], Dict[int, str]],
+) -> List[Tuple[str, str]]:
+    """create_issues_graphql() plus a REST create_issue() for each item the batch didn't create."""
+    code, urls = create_issues_graphql(token, batch, ids)
+    if code >= 500:
+        # the mutation may or may not have landed; a rerun skips whatever did
+        die(f"GraphQL createIssue batch failed ({code}); rerun to create the remaining issues")
+    return [(t[0], url or create_issue(repo, token, *t)) for t, url in zip(batch, urls)]
+
+
 def main():
     ap = argparse.ArgumentParser(description="Import GitHub issues from JSON via REST API.")
     ap.add_argument("--file", "-f", default="data/issues.json", help="Path to issues JSON.")
     ap.add_argument("--repo", "-r", help="owner/name. If omitted, tries to detect from git remote.")
     ap.add_argument("--dry-run", action="store_true", help="Show actions without creating anything.")
+    ap.add_argument("--workers", type=int, default=4,
+                    help="Concurrent create requests (default 4; keep low, GitHub rate-limits rapid creates).")
+    ap.add_argument("--batch-size", type=int, default=GRAPHQL_BATCH,
+                    help=f"Issues per GraphQL createIssue request (default {GRAPHQL_BATCH}; 1 = one REST call per issue).")
     args = ap.parse_args()
 
     token = get_token()
@@ -225,7 +483,8 @@ def main():
         die("Could not detect repo. Pass --repo owner/name or run inside a git repo with origin set.")
 
     try:
-        payload = json.loads(Path(args.file).read_text(encoding="utf-8"))  # type: ignore[name-defined]
+        with Path(args.file).open("r", encoding="utf-8") as fp:
+            payload = json.load(fp)
     except Exception as e:
         die(f"Error reading {args.file}: {e}")
 
@@ -251,24 +510,24 @@ def main():
     milestones_needed = sorted(set(milestones_needed))
     labels_needed = sorted(labels_needed)
 
+    # Existing titles (to avoid duplicates), milestones and labels in one pass.
+    # milestone_numbers / existing_labels are kept up to date as items are created.
+    existing_titles, milestone_numbers, existing_labels = get_repo_snapshot(repo, token)
+
     if args.dry_run:
         print("\n[DRY-RUN] Would ensure milestones:", milestones_needed)
         print("[DRY-RUN] Would ensure labels:", labels_needed)
     else:
         # Create milestones
-        milestone_numbers: Dict[str, int] = {}
         for ms in milestones_needed:
-            num = ensure_milestone(repo, token, ms)
-            milestone_numbers[ms] = num
+            ensure_milestone(repo, token, ms, milestone_numbers)
         # Create labels
         for lbl in labels_needed:
-            ensure_label(repo, token, lbl)
-
-    # Cache existing titles to avoid duplicates
-    existing_titles = get_existing_issue_titles(repo, token)
+            ensure_label(repo, token, lbl, existing=existing_labels)
 
     created = 0
     skipped = 0
+    tasks: List[Tuple[str, str, List[str], int]] = []
 
     for it in issues:
         title = (it.get("title") or "").strip()
@@ -289,31 +548,38 @@ def main():
             if args.dry_run:
                 milestone_num = 0  # just show the plan
             else:
-                # fetch latest milestone map (cheap, but we could cache earlier)
-                milestone_num = get_existing_milestones(repo, token).get(ms_title, 0)
-                if not milestone_num:
-                    milestone_num = ensure_milestone(repo, token, ms_title)
+                milestone_num = (milestone_numbers.get(ms_title)
+                                 or ensure_milestone(repo, token, ms_title, milestone_numbers))
 
         if args.dry_run:
             print(f"[DRY-RUN] Would create: {title} | labels={labels} | milestone='{ms_title}'")
             created += 1
         else:
-            url = create_issue(repo, token, title, body, labels, milestone_num)
-            print(f"Created: {title} -> {url}")
-            existing_titles.add(title)
-            created += 1
+            tasks.append((title, body, labels, milestone_num))
+            existing_titles.add(title)  # later duplicates in the file are skipped
+
+    # Batch creates into aliased GraphQL mutations when the node IDs resolve
+    ids = None
+    if len(tasks) > 1 and args.batch_size > 1:
+        ids = get_node_ids(repo, token, {l for t in tasks for l in t[2]}, {t[3] for t in tasks if t[3]})
+    if ids is not None:
+        n = args.batch_size
+        batches = [tasks[i:i + n] for i in range(0, len(tasks), n)]
+        with ThreadPoolExecutor(max_workers=max(1, min(args.workers, len(batches)))) as ex:
+            for fut in as_completed([ex.submit(create_issue_batch, repo, token, b, ids) for b in batches]):
+                for title, url in fut.result():
+                    print(f"Created: {title} -> {url}")
+                    created += 1
+    # Otherwise creates are independent network round trips: overlap them
+    elif tasks:
+        with ThreadPoolExecutor(max_workers=max(1, min(args.workers, len(tasks)))) as ex:
+            futs = {ex.submit(create_issue, repo, token, *t): t[0] for t in tasks}
+            for fut in as_completed(futs):
+                print(f"Created: {futs[fut]} -> {fut.result()}")
+                created += 1
 
     print(f"\nDone. Created: {created}, Skipped (duplicates): {skipped}")
 
 
-# --- tiny helper to avoid importing pathlib at top just for one call ---
-class Path:
-    def __init__(self, p: str) -> None:
-        self.p = p
-    def read_text(self, encoding="utf-8") -> str:
-        with open(self.p, "r", encoding=encoding) as f:
-            return f.read()
-
-
 if __name__ == "__main__":
     main()
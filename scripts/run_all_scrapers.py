@@ -8,7 +8,11 @@ Run from the repo root (folder that contains app/).
 What this does:
   - Recursively finds scraper modules under scrapers/state/**/*_scraper.py.
   - Imports each module and calls check_for_update().
-  - Runs scrapers in a thread pool and streams results to a timestamped JSONL file.
+  - Runs scrapers on one asyncio event loop (at most --workers at a time) and streams
+    results to a timestamped JSONL file. Modules that also define
+    check_for_update_async(client) are awaited with a shared httpx.AsyncClient;
+    sync-only ones run in worker threads, and those whose check_for_update()
+    accepts client= all reuse one pooled httpx.Client.
   - Prints a concise console summary (ok/updated/failed) and per-scraper status.
 
 Output format (one JSON object per line):
@@ -37,24 +41,48 @@ Common examples:
   python tools/run_all_scrapers.py --root scrapers/state --out data/runs
 
 Notes:
-  - A scraper is expected to define a callable check_for_update() → dict.
+  - A scraper is expected to define a callable check_for_update() → dict
+    (optionally taking client=<httpx.Client>, or also defining
+    async check_for_update_async(client) → dict).
   - Failures are captured and recorded; the run continues.
   - Output file path is printed at the end (default: data/runs/scrape_<timestamp>.jsonl).
 """
 from __future__ import annotations
 
 import argparse
+import asyncio
 import importlib
+import inspect
 import json
 import os
+import sys
 import traceback
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+import orjson
 
 SCRAPERS_ROOT = Path("scrapers/state")
+JSONL_BATCH = 256  # records joined per write() to the output file
+CLIENT_KWARGS: Dict[str, Any] = dict(
+    follow_redirects=True,
+    timeout=30,
+    headers={"User-Agent": "Mozilla/5.0"},
+    http2=True,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+)
+
+
+def _jsonl(rec: Dict[str, Any]) -> bytes:
+    try:
+        return orjson.dumps(rec) + b"\n"
+    except TypeError:
+        pass  # e.g. non-str dict keys in a scraper result; json.dumps copes
+    return json.dumps(rec, ensure_ascii=False).encode("utf-8") + b"\n"
 
 
 @dataclass(frozen=True)
@@ -87,19 +115,84 @@ def load_module(mp: str):
     return importlib.import_module(mp)
 
 
-def run_one(ref: ScraperRef) -> Tuple[ScraperRef, Dict[str, Any] | None, str | None]:
+def _error(e: Exception) -> str:
+    tb = traceback.format_exc(limit=3)
+    return f"{e.__class__.__name__}: {e}\n{tb}"
+
+
+def resolve_check(ref: ScraperRef) -> Tuple[Optional[Callable[[], Any]], str | None]:
+    """Import ref's module and return (check_for_update, None), or (None, error)."""
     try:
         mod = load_module(ref.module_path)
-        fn = getattr(mod, "check_for_update", None)
-        if not callable(fn):
-            return ref, None, f"No check_for_update() in {ref.module_path}"
-        res_any: Any = fn()
-        if not isinstance(res_any, dict):
-            return ref, None, f"Unexpected result type from {ref.module_path}: {type(res_any).__name__}"
-        return ref, res_any, None
     except Exception as e:
-        tb = traceback.format_exc(limit=3)
-        return ref, None, f"{e.__class__.__name__}: {e}\n{tb}"
+        return None, _error(e)
+    fn = getattr(mod, "check_for_update", None)
+    if not callable(fn):
+        return None, f"No check_for_update() in {ref.module_path}"
+    return fn, None
+
+
+def _checked(ref: ScraperRef, res_any: Any) -> Tuple[ScraperRef, Dict[str, Any] | None, str | None]:
+    if not isinstance(res_any, dict):
+        return ref, None, f"Unexpected result type from {ref.module_path}: {type(res_any).__name__}"
+    return ref, res_any, None
+
+
+def _takes_client(fn: Callable[..., Any]) -> bool:
+    """True if fn accepts client= (newer generated scrapers do; older ones open their own)."""
+    try:
+        return "client" in inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def run_one(ref: ScraperRef, fn: Optional[Callable[[], Any]] = None) -> Tuple[ScraperRef, Dict[str, Any] | None, str | None]:
+    try:
+        if fn is None:
+            fn, err = resolve_check(ref)
+            if err is not None:
+                return ref, None, err
+        return _checked(ref, fn())
+    except Exception as e:
+        return ref, None, _error(e)
+
+
+async def run_one_async(
+    ref: ScraperRef,
+    fn: Callable[[], Any],
+    client: "httpx.AsyncClient",
+    sem: asyncio.Semaphore,
+    sync_client: Optional["httpx.Client"] = None,
+) -> Tuple[ScraperRef, Dict[str, Any] | None, str | None]:
+    """Await the module's check_for_update_async(client) if it has one, else run check_for_update() in a thread."""
+    afn = getattr(sys.modules.get(ref.module_path), "check_for_update_async", None)
+    async with sem:
+        try:
+            if callable(afn):
+                res_any = await afn(client)
+            elif sync_client is not None and _takes_client(fn):
+                res_any = await asyncio.to_thread(fn, client=sync_client)
+            else:
+                res_any = await asyncio.to_thread(fn)
+        except Exception as e:
+            return ref, None, _error(e)
+    return _checked(ref, res_any)
+
+
+async def run_all_async(
+    tasks: List[Tuple[ScraperRef, Callable[[], Any]]],
+    workers: int,
+    report: Callable[[ScraperRef, Dict[str, Any] | None, str | None], None],
+) -> None:
+    """Run every (ref, check) on one event loop, at most `workers` at a time; report() each result as it lands."""
+    sem = asyncio.Semaphore(workers)
+    # sync-only scrapers go through to_thread: size its pool to match the semaphore
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=workers))
+    # one connection pool per kind of client, shared by every scraper in the run
+    with httpx.Client(**CLIENT_KWARGS) as sync_client:
+        async with httpx.AsyncClient(**CLIENT_KWARGS) as client:
+            for fut in asyncio.as_completed([run_one_async(r, fn, client, sem, sync_client) for r, fn in tasks]):
+                report(*(await fut))
 
 
 def main():
@@ -108,7 +201,7 @@ def main():
     ap.add_argument("--state", action="append", help="Filter by state code (e.g., --state tx --state ca)")
     ap.add_argument("--pattern", help="Substring filter on filename (case-insensitive)")
     ap.add_argument("--limit", type=int, default=0, help="Limit number of scrapers (for quick tests)")
-    ap.add_argument("--workers", type=int, default=8, help="Threaded concurrency")
+    ap.add_argument("--workers", type=int, default=8, help="Max scrapers running at once")
     ap.add_argument("--only_updated", action="store_true", help="Print only updated results")
     ap.add_argument("--out", default="data/runs", help="Directory to write JSONL output")
     args = ap.parse_args()
@@ -139,11 +232,23 @@ def main():
     upd = 0
     fail = 0
 
+    # Import everything up front on this thread: workers then only do the
+    # network-bound check_for_update() instead of queueing on the import lock.
+    # Refs that fail to import (or lack the callable) never enter the pool.
+    tasks: List[Tuple[ScraperRef, Callable[[], Any]]] = []
+    unresolved: List[Tuple[ScraperRef, None, str]] = []
+    for r in refs:
+        fn, err = resolve_check(r)
+        if err is None:
+            tasks.append((r, fn))
+        else:
+            unresolved.append((r, None, err))
+
     print(f"Running {len(refs)} scraper(s) with {args.workers} workers…")
-    with ThreadPoolExecutor(max_workers=args.workers) as ex, outfile.open("w", encoding="utf-8") as fh:
-        futures = [ex.submit(run_one, r) for r in refs]
-        for fut in as_completed(futures):
-            ref, res, err = fut.result()
+    batch: List[bytes] = []
+    with outfile.open("wb", buffering=1 << 20) as fh:
+        def report(ref: ScraperRef, res: Dict[str, Any] | None, err: str | None) -> None:
+            nonlocal ok, upd, fail
             record = {
                 "source_id": ref.path.stem,
                 "state": ref.state,
@@ -170,7 +275,16 @@ def main():
                             print(f"• {ref.state} {ref.path.name} (no change)")
                 else:
                     record["result"] = None
-                fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+                batch.append(_jsonl(record))
+                if len(batch) >= JSONL_BATCH:
+                    fh.write(b"".join(batch))
+                    batch.clear()
+
+        for ref, res, err in unresolved:
+            report(ref, res, err)
+        if tasks:
+            asyncio.run(run_all_async(tasks, max(1, args.workers), report))
+        fh.write(b"".join(batch))
 
     print(f"\nDone: ok={ok} updated={upd} failed={fail}")
     print(f"Output → {outfile}")
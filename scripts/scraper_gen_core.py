@@ -0,0 +1,292 @@
+"""
+scraper_gen_core.py — Config normalization and naming helpers for
+generate_scrapers_from_json.py.
+
+Everything here is plain str/dict code with no I/O, kept in its own module so it
+can be compiled with mypyc. The generator imports it the same way either way:
+a built extension next to this file wins over the .py source.
+
+Build (optional, needs `pip install mypy`):
+  make -f Makefile.mak scrapergen-native
+  # or: cd scripts && mypyc scraper_gen_core.py
+
+Delete the built scripts/scraper_gen_core.*.so to go back to pure Python.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import ParseResult, urlparse
+
+# -------------------------
+# State mapping
+# -------------------------
+
+_RE_STATE_OF = re.compile(r"\bstate of\b")
+_RE_NONALPHA = re.compile(r"[^a-z]+")
+_RE_WS = re.compile(r"\s+")
+
+def _norm_state_key(s: str) -> str:
+    s = s.lower().strip()
+    s = _RE_STATE_OF.sub("", s)
+    s = _RE_NONALPHA.sub(" ", s)
+    return _RE_WS.sub(" ", s).strip()
+
+STATE_TO_CODE: Dict[str, str] = {
+    # 50 states + DC
+    "alabama": "al", "al": "al",
+    "alaska": "ak", "ak": "ak",
+    "arizona": "az", "az": "az",
+    "arkansas": "ar", "ar": "ar",
+    "california": "ca", "ca": "ca",
+    "colorado": "co", "co": "co",
+    "connecticut": "ct", "ct": "ct",
+    "delaware": "de", "de": "de",
+    "florida": "fl", "fl": "fl",
+    "georgia": "ga", "ga": "ga",
+    "hawaii": "hi", "hi": "hi",
+    "idaho": "id", "id": "id",
+    "illinois": "il", "il": "il",
+    "indiana": "in", "in": "in",
+    "iowa": "ia", "ia": "ia",
+    "kansas": "ks", "ks": "ks",
+    "kentucky": "ky", "ky": "ky",
+    "louisiana": "la", "la": "la",
+    "maine": "me", "me": "me",
+    "maryland": "md", "md": "md",
+    "massachusetts": "ma", "ma": "ma",
+    "michigan": "mi", "mi": "mi",
+    "minnesota": "mn", "mn": "mn",
+    "mississippi": "ms", "ms": "ms",
+    "missouri": "mo", "mo": "mo",
+    "montana": "mt", "mt": "mt",
+    "nebraska": "ne", "ne": "ne",
+    "nevada": "nv", "nv": "nv",
+    "new hampshire": "nh", "nh": "nh",
+    "new jersey": "nj", "nj": "nj",
+    "new mexico": "nm", "nm": "nm",
+    "new york": "ny", "ny": "ny",
+    "north carolina": "nc", "nc": "nc",
+    "north dakota": "nd", "nd": "nd",
+    "ohio": "oh", "oh": "oh",
+    "oklahoma": "ok", "ok": "ok",
+    "oregon": "or", "or": "or",
+    "pennsylvania": "pa", "pa": "pa",
+    "rhode island": "ri", "ri": "ri",
+    "south carolina": "sc", "sc": "sc",
+    "south dakota": "sd", "sd": "sd",
+    "tennessee": "tn", "tn": "tn",
+    "texas": "tx", "tx": "tx",
+    "utah": "ut", "ut": "ut",
+    "vermont": "vt", "vt": "vt",
+    "virginia": "va", "va": "va",
+    "washington": "wa", "wa": "wa",
+    "west virginia": "wv", "wv": "wv",
+    "wisconsin": "wi", "wi": "wi",
+    "wyoming": "wy", "wy": "wy",
+    "district of columbia": "dc", "washington dc": "dc", "dc": "dc", "d c": "dc"
+}
+
+@lru_cache(maxsize=4096)
+def state_code_for(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    # fast path: "CO", "Colorado", "new york" are already table keys once lowercased
+    code = STATE_TO_CODE.get(name.lower())
+    if code is not None:
+        return code
+    key = _norm_state_key(name)
+    return STATE_TO_CODE.get(key)
+
+# -------------------------
+# Helpers
+# -------------------------
+
+URL_KEYS = ("target_url", "url", "link", "href", "source_url", "pdf_url", "website")
+_URL_KEY_SET = frozenset(URL_KEYS)
+_HTTP_PREFIXES = ("http://", "https://")
+
+_RE_SCHEME = re.compile(r"https?://")
+_RE_NONALNUM = re.compile(r"[^a-z0-9]+")
+_RE_NONALNUM_PATH = re.compile(r"[^a-z0-9/]+")
+_RE_WWW = re.compile(r"^www\.")
+
+def slugify(s: str, max_len: int = 50) -> str:
+    s = s.strip().lower()
+    s = _RE_SCHEME.sub("", s)
+    s = _RE_NONALNUM.sub("-", s)
+    s = s.strip("-")
+    if len(s) > max_len:
+        s = s[:max_len].rstrip("-")
+    return s or "source"
+
+@lru_cache(maxsize=8192)
+def _parsed(u: str) -> ParseResult:
+    # guess_type/host_slug/path_slug all look at the same URL: parse it once
+    return urlparse(u)
+
+@lru_cache(maxsize=4096)
+def _netloc_slug(netloc: str) -> str:
+    # keyed by netloc, not URL: many entries share a host
+    return slugify(_RE_WWW.sub("", netloc.lower()), max_len=50)
+
+def host_slug(u: str) -> str:
+    try:
+        return _netloc_slug(_parsed(u).netloc)
+    except Exception:
+        return "host"
+
+def path_slug(u: str) -> str:
+    try:
+        p = _parsed(u).path
+        if not p or p == "/":
+            return "root"
+        # one regex pass over the lowered path ("/" kept as the segment boundary),
+        # then the per-segment trim/truncate slugify(seg, 20) would have done
+        parts = [seg for seg in _RE_NONALNUM_PATH.sub("-", p.lower()).split("/") if seg]
+        parts = parts[:4]  # keep it short
+        s = "-".join((seg.strip("-")[:20].rstrip("-") or "source") for seg in parts)
+        return s or "root"
+    except Exception:
+        return "root"
+
+def guess_type(u: str) -> str:
+    # only the last four characters of the (cached) path need lowering
+    return "pdf" if _parsed(u).path[-4:].lower() == ".pdf" else "html"
+
+def iter_nodes(x: Any) -> Iterable[Dict[str, Any]]:
+    """Every dict in `x`, depth-first in document order (explicit stack, no recursion)."""
+    if isinstance(x, Iterator):
+        # streamed rows: walk each one as it is read
+        for row in x:
+            yield from iter_nodes(row)
+        return
+    stack = [x]
+    pop, extend = stack.pop, stack.extend
+    while stack:
+        n = pop()
+        if isinstance(n, dict):
+            yield n
+            extend(reversed(n.values()))
+        elif isinstance(n, list):
+            extend(reversed(n))
+
+def _noting_strings(rows: Iterator[Any], strings: List[str]) -> Iterator[Any]:
+    for row in rows:
+        if isinstance(row, str):
+            strings.append(row)
+        yield row
+
+def pick_url(d: Dict[str, Any]) -> Optional[str]:
+    get = d.get
+    for k in URL_KEYS:
+        v = get(k)
+        if isinstance(v, str) and v.startswith(_HTTP_PREFIXES):
+            return v
+    return None
+
+def normalize_entries(raw: Any, default_selector: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Produce entries with:
+      { name?: str, target_url: str, type?: 'html'|'pdf', selector?: str }
+    Accepts:
+      - dict of {state: [url, url, ...]}  <-- your file shape
+      - list of strings (urls)
+      - list/dicts with any of URL_KEYS
+      - nested structures (recursively)
+    """
+    # De-dup by target_url as entries are found: the first occurrence wins and
+    # later duplicates are never built.
+    out: Dict[str, Dict[str, Any]] = {}
+
+    def add(name: Any, url: str, type_: Any = None, selector: Any = None) -> None:
+        if url in out:
+            return
+        guessed = guess_type(url)  # once per new url; reused for type and selector
+        t = (type_ or guessed).lower()
+        if t not in ("html", "pdf"):
+            t = guessed
+        if not selector:
+            selector = default_selector if "html" in (t, guessed) else None
+        out[url] = {"name": name, "target_url": url, "type": t, "selector": selector}
+
+    # Case 1: dict of "state": [urls...]
+    if isinstance(raw, dict) and all(isinstance(v, list) for v in raw.values()):
+        nested = False
+        for state, urls in raw.items():
+            for u in urls:
+                if isinstance(u, str):
+                    if u.startswith(_HTTP_PREFIXES):
+                        add(state, u)
+                else:
+                    nested = True
+        # Only url strings under the states: the walker would find nothing more
+        if not nested:
+            return list(out.values())
+
+    # NDJSON arrives as an iterator of rows, consumed once by the walker below;
+    # its bare string rows are kept aside like the items of a top-level list.
+    top = raw
+    if isinstance(raw, Iterator):
+        top = []
+        raw = _noting_strings(raw, top)
+
+    # Generic walker: catches lists, nested dicts, etc. One pass per node covers
+    # both the URL_KEYS url and plain url strings tucked under other keys.
+    for node in iter_nodes(raw):
+        name = (node.get("name")
+                or node.get("slug")
+                or node.get("id")
+                or node.get("title")
+                or None)
+        url = pick_url(node)
+        if url:
+            add(name or node.get("state") or None, url, node.get("type"), node.get("selector"))
+        for k, v in node.items():
+            if isinstance(v, str) and v.startswith(_HTTP_PREFIXES) and k not in _URL_KEY_SET:
+                add(name, v)
+
+    # Also, if the top-level is a list of raw URL strings:
+    if isinstance(top, list):
+        for v in top:
+            if isinstance(v, str) and v.startswith(_HTTP_PREFIXES):
+                add(None, v)
+
+    return list(out.values())
+
+def unique_filename(base: str, used: set[str], next_suffix: Optional[Dict[str, int]] = None) -> str:
+    """
+    Ensure unique filename stem (without extension) within a directory.
+
+    `next_suffix` (one dict per directory) remembers where the -N probe for each
+    base stopped, so many pages from one host don't re-probe -2, -3, ... each
+    time. `used` is still checked: a real stem may already look like "x-3".
+    """
+    if base not in used:
+        used.add(base)
+        return base
+    i = next_suffix.get(base, 2) if next_suffix is not None else 2
+    b = f"{base}-{i}"
+    while b in used:
+        i += 1
+        b = f"{base}-{i}"
+    if next_suffix is not None:
+        next_suffix[base] = i + 1
+    used.add(b)
+    return b
+
+def filename_stem_for(entry: Dict[str, Any]) -> str:
+    """Build a friendly filename stem without extension."""
+    url = entry["target_url"]
+    parts = []
+    if entry.get("name"):
+        parts.append(slugify(str(entry["name"]), 40))
+    parts.append(host_slug(url))
+    ps = path_slug(url)
+    if ps != "root":
+        parts.append(ps)
+    stem = "-".join([p for p in parts if p]) or "source"
+    return stem
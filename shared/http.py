@@ -1,31 +1,68 @@
 # shared/http.py
 from __future__ import annotations
+import os
 import time
+from pathlib import Path
 from typing import Optional
 import httpx
 
+try:
+    import hishel
+except Exception:  # pragma: no cover - optional; uncached httpx.Client
+    hishel = None
+
+# hishel response cache: fresh responses (Cache-Control/Expires) are answered from
+# disk without a request, stale ones are revalidated with ETag/Last-Modified.
+HTTP_CACHE_DIR = os.getenv(
+    "HTTP_CACHE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "http")
+)
+HTTP_CACHE_TTL = 24 * 3600  # stored entries are evicted after a day
+
+# one process-wide pool: checks fan out over dozens of hosts, so keep plenty of
+# connections alive rather than re-doing DNS + TLS per request
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+CONNECT_RETRIES = 2  # transport-level: connection failures only, not 5xx
+
 _client: Optional[httpx.Client] = None
 
 def get_client(timeout: float = 15.0) -> httpx.Client:
     global _client
     if _client is None:
-        _client = httpx.Client(
+        kwargs = dict(
             timeout=timeout,
             follow_redirects=True,
             headers={"User-Agent": "regulatory-data-bridge/0.1"},
+            transport=httpx.HTTPTransport(http2=True, limits=HTTP_LIMITS, retries=CONNECT_RETRIES),
         )
+        if hishel is not None:
+            storage = hishel.FileStorage(base_path=Path(HTTP_CACHE_DIR), ttl=HTTP_CACHE_TTL)
+            _client = hishel.CacheClient(storage=storage, **kwargs)
+        else:
+            _client = httpx.Client(**kwargs)
     return _client
 
-def fetch_text(url: str, *, retries: int = 2, backoff: float = 0.6) -> str:
+def fetch(url: str, *, headers: Optional[dict] = None, retries: int = 2, backoff: float = 0.6) -> httpx.Response:
+    """
+    GET with retries; a 304 reply to conditional `headers` is returned, not raised.
+
+    Failed connections were already retried by the transport, so only error
+    statuses and read/protocol errors go through the backoff loop here.
+    """
     client = get_client()
     last_err: Exception | None = None
     for attempt in range(retries + 1):
         try:
-            r = client.get(url)
-            r.raise_for_status()
-            return r.text
+            r = client.get(url, headers=headers)
+            if r.status_code != 304:
+                r.raise_for_status()
+            return r
+        except (httpx.ConnectError, httpx.ConnectTimeout):
+            raise
         except Exception as e:
             last_err = e
             if attempt < retries:
                 time.sleep(backoff * (2 ** attempt))
     raise last_err  # type: ignore[misc]
+
+def fetch_text(url: str, *, retries: int = 2, backoff: float = 0.6) -> str:
+    return fetch(url, retries=retries, backoff=backoff).text
@@ -2,20 +2,42 @@
 import logging, json, sys
 from typing import Any, Mapping
 
+import orjson
+
+_TIME_FMT = "%Y-%m-%dT%H:%M:%S"
+
+def _dumps(payload: dict) -> str:
+    try:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS).decode()
+    except TypeError:
+        pass  # e.g. ints beyond 64 bits in extras; json.dumps copes
+    return json.dumps(payload, ensure_ascii=False)
+
 class JSONFormatter(logging.Formatter):
+    # (second, formatted) of the last record: records within the same second
+    # skip strftime; one tuple so threads never see a mismatched pair
+    _last_time: tuple = (-1, "")
+
+    def _time(self, created: float) -> str:
+        sec = int(created)
+        last = self._last_time
+        if last[0] != sec:
+            last = self._last_time = (sec, self.formatTime(logging.makeLogRecord({"created": sec}), _TIME_FMT))
+        return last[1]
+
     def format(self, record: logging.LogRecord) -> str:
         payload: dict[str, Any] = {
             "level": record.levelname,
             "msg": record.getMessage(),
             "logger": record.name,
-            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "time": self._time(record.created),
         }
         if record.exc_info:
             payload["exc_info"] = self.formatException(record.exc_info)
         # Attach any extras
         if hasattr(record, "extra") and isinstance(record.extra, Mapping):
             payload.update(record.extra)  # type: ignore[arg-type]
-        return json.dumps(payload, ensure_ascii=False)
+        return _dumps(payload)
 
 def setup_json_logging(level: int = logging.INFO):
     handler = logging.StreamHandler(sys.stdout)
@@ -0,0 +1,163 @@
+"""
+test_change_tracker.py — Diff summaries in app/services/change_tracker.py.
+
+Place at: tests/test_change_tracker.py
+Run from the repo root (folder that contains app/).
+
+What this does:
+  - Checks the diff-match-patch line diff formats exactly like
+    difflib.unified_diff(..., lineterm="") for inserts, deletes, replaces,
+    edits at either end, long unchanged runs and empty input, and that
+    diff_summary() keeps only the first max_lines and counts the rest.
+  - Runs the same documents through record_versions_bulk() and through
+    per-doc record_version() (direct and queued via flush_versions) on
+    in-memory SQLite, and checks statuses, version rows and last_version_no
+    agree, including a doc listed twice in one batch.
+
+Common examples:
+  pytest -q tests/test_change_tracker.py
+"""
+from datetime import datetime
+from difflib import unified_diff
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Base, Document, DocumentVersion, Source
+from app.services import change_tracker
+from app.services.change_tracker import (
+    _fast_unified_diff,
+    compute_hash,
+    flush_versions,
+    record_version,
+    record_versions_bulk,
+)
+
+LINES = [f"line {i}" for i in range(20)]
+
+
+def _edit(lines, i, j, new=()):
+    return lines[:i] + list(new) + lines[j:]
+
+
+CASES = {
+    "insert": (LINES, _edit(LINES, 10, 10, ["new a", "new b"])),
+    "delete": (LINES, _edit(LINES, 8, 11)),
+    "replace": (LINES, _edit(LINES, 5, 7, ["changed 5", "changed 6", "extra"])),
+    "start": (LINES, _edit(LINES, 0, 1, ["first"])),
+    "end": (LINES, _edit(LINES, 19, 20) + ["last"]),
+    "long_equal_run": (LINES, _edit(_edit(LINES, 17, 18, ["x"]), 2, 3, ["y"])),
+    "three_hunks": ([f"line {i}" for i in range(40)],
+                    _edit(_edit(_edit([f"line {i}" for i in range(40)], 35, 36, ["x"]), 20, 21), 3, 3, ["y"])),
+    "from_empty": ([], LINES[:4]),
+    "to_empty": (LINES[:4], []),
+    "both_empty": ([], []),
+    "unchanged": (LINES, list(LINES)),
+}
+
+
+@pytest.mark.skipif(change_tracker._fast_diff is None, reason="fast_diff_match_patch not installed")
+@pytest.mark.parametrize("name", list(CASES))
+def test_fast_unified_diff_matches_difflib(name):
+    a, b = CASES[name]
+    expected = list(unified_diff(a, b, lineterm=""))
+    assert _fast_unified_diff(a, b) == (expected, len(expected))
+    # past max_lines, lines are counted but not formatted
+    assert _fast_unified_diff(a, b, max_lines=5) == (expected[:5], len(expected))
+
+
+@pytest.mark.parametrize("fast", [True, False], ids=["engine", "difflib"])
+def test_diff_summary_truncates(monkeypatch, fast):
+    if not fast:
+        monkeypatch.setattr(change_tracker, "_fast_diff", None)
+    a, b = CASES["long_equal_run"]
+    expected = list(unified_diff(a, b, lineterm=""))
+    summary = change_tracker.diff_summary("\n".join(a), "\n".join(b), max_lines=4)
+    assert summary.splitlines() == expected[:4] + [f"... (+{len(expected) - 4} more)"]
+    assert change_tracker.diff_summary("same", "same") == ""
+
+
+NOW = datetime(2025, 7, 1, 12, 0)
+
+
+def _session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    src = Source(name="EPA", url="https://www.epa.gov/", type="rss")
+    db.add(src)
+    db.flush()
+    docs = {name: Document(source_id=src.id, title=name, url=f"https://www.epa.gov/{name}")
+            for name in ("new", "new_twice", "changed", "legacy", "same", "flip", "repeat")}
+    db.add_all(docs.values())
+    db.flush()
+    # already tracked at "v0"; "legacy" predates last_version_no and has two versions
+    for name in ("changed", "legacy", "same", "flip", "repeat"):
+        doc = docs[name]
+        record_version(db, doc, extracted_text="v0", title=None, now=NOW)
+    docs["legacy"].last_version_no = None
+    db.add(DocumentVersion(doc_id=docs["legacy"].id, version_no=2, content_hash=compute_hash("x"),
+                           change_type="UPDATED"))
+    db.flush()
+    return db, docs
+
+
+BATCH = [
+    ("new", "hello", "New"),
+    ("new_twice", "a", None),
+    ("new_twice", "b", None),
+    ("changed", "v1", "Changed"),
+    ("legacy", "v1", None),
+    ("same", "v0", None),
+    ("flip", "v1", None),
+    ("flip", "v0", None),
+    ("repeat", "v1", None),
+    ("repeat", "v1", None),
+]
+
+
+def _state(db, docs):
+    versions = db.execute(
+        select(DocumentVersion.doc_id, DocumentVersion.version_no, DocumentVersion.change_type,
+               DocumentVersion.content_hash, DocumentVersion.title)
+        .order_by(DocumentVersion.doc_id, DocumentVersion.version_no)
+    ).all()
+    fields = {name: (d.current_hash, d.last_version_no, d.last_changed_at, d.title) for name, d in docs.items()}
+    return versions, fields
+
+
+def _per_doc(pending):
+    db, docs = _session()
+    statuses = [record_version(db, docs[name], extracted_text=text, title=title, now=NOW, pending=pending)
+                for name, text, title in BATCH]
+    if pending is not None:
+        flush_versions(db, pending)
+        assert pending == []
+    db.flush()
+    return statuses, _state(db, docs)
+
+
+@pytest.mark.parametrize("pending", [None, []], ids=["direct", "pending"])
+@pytest.mark.parametrize("batch_size", [change_tracker.BULK_BATCH_SIZE, 3])
+def test_record_versions_bulk_matches_record_version(pending, batch_size):
+    expected_statuses, expected_state = _per_doc(pending)
+    assert expected_statuses == [
+        "ADDED", "ADDED", "UPDATED", "UPDATED", "UPDATED", "NOCHANGE", "UPDATED", "UPDATED", "UPDATED", "NOCHANGE",
+    ]
+
+    db, docs = _session()
+    statuses = record_versions_bulk(db, [(docs[name], text, title) for name, text, title in BATCH],
+                                    batch_size=batch_size, now=NOW)
+    db.flush()
+    assert statuses == expected_statuses
+    assert _state(db, docs) == expected_state
+
+
+def test_record_versions_bulk_numbers_legacy_docs_from_max():
+    db, docs = _session()
+    record_versions_bulk(db, [(docs["legacy"], "v1", None), (docs["legacy"], "v2", None)], now=NOW)
+    db.flush()
+    assert docs["legacy"].last_version_no == 4
+    nos = db.scalars(select(DocumentVersion.version_no).where(DocumentVersion.doc_id == docs["legacy"].id))
+    assert sorted(nos) == [1, 2, 3, 4]
@@ -0,0 +1,85 @@
+"""
+test_crud.py — Document upserts in app/db/crud.py.
+
+Place at: tests/test_crud.py
+Run from the repo root (folder that contains app/).
+
+What this does:
+  - Runs create_or_update_doc() on in-memory SQLite through both the
+    INSERT ... ON CONFLICT statement and the SELECT-then-write ORM path.
+  - Checks both keep existing values for empty inputs, fill empty
+    text/metadata, and never overwrite non-empty text/metadata.
+
+Common examples:
+  pytest -q tests/test_crud.py
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db import crud
+from app.db.models import Base, Document, Source
+
+URL = "https://www.epa.gov/newsreleases/1"
+D1 = datetime(2025, 7, 1)
+D2 = datetime(2025, 7, 2)
+
+
+@pytest.fixture(params=["on_conflict", "orm"])
+def db(request, monkeypatch):
+    if request.param == "orm":
+        monkeypatch.setattr(crud, "_UPSERT_DIALECTS", ())
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(Source(id=1, name="EPA", url="https://www.epa.gov/", type="rss"))
+    session.commit()
+    yield session
+    session.close()
+
+
+def _upsert(db, **kw):
+    args = dict(source_id=1, title="", url=URL, published_at=None, text=None, metadata=None, jurisdiction=None)
+    args.update(kw)
+    return crud.create_or_update_doc(db, **args)
+
+
+def _row(db):
+    db.expire_all()
+    doc = db.execute(select(Document).where(Document.url == URL)).scalar_one()
+    return doc.title, doc.published_at, doc.text, doc.meta, doc.jurisdiction
+
+
+def test_insert(db):
+    doc = _upsert(db, title="Rule", published_at=D1, text="body", metadata={"a": 1}, jurisdiction="US")
+    assert doc.id is not None
+    assert _row(db) == ("Rule", D1, "body", {"a": 1}, "US")
+
+
+def test_insert_without_title_is_untitled(db):
+    _upsert(db)
+    assert _row(db)[0] == "(untitled)"
+
+
+def test_reupsert_with_empty_values_keeps_existing(db):
+    first = _upsert(db, title="Rule", published_at=D1, text="body", metadata={"a": 1}, jurisdiction="US")
+    again = _upsert(db, title="", text="", metadata={})
+    assert again.id == first.id
+    assert _row(db) == ("Rule", D1, "body", {"a": 1}, "US")
+    assert db.scalar(select(func.count()).select_from(Document)) == 1
+
+
+@pytest.mark.parametrize("empty_text, empty_meta", [(None, None), ("", {}), (None, [])])
+def test_fills_empty_text_and_metadata(db, empty_text, empty_meta):
+    _upsert(db, title="Rule", text=empty_text, metadata=empty_meta)
+    _upsert(db, title="Rule", text="body", metadata={"a": 1})
+    assert _row(db)[2:4] == ("body", {"a": 1})
+
+
+def test_does_not_overwrite_text_or_metadata(db):
+    _upsert(db, title="Rule", text="body", metadata={"a": 1})
+    _upsert(db, title="Rule v2", published_at=D2, text="other", metadata={"b": 2}, jurisdiction="TX")
+    # title, date and jurisdiction follow the newest non-empty input
+    assert _row(db) == ("Rule v2", D2, "body", {"a": 1}, "TX")
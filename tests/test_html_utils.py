@@ -0,0 +1,65 @@
+"""
+test_html_utils.py — Link resolution and date parsing in the HTML ingest helpers.
+
+Place at: tests/test_html_utils.py
+Run from the repo root (folder that contains app/).
+
+What this does:
+  - Checks _local_href() resolves root- and scheme-relative hrefs against the
+    source URL and drops links to other hosts.
+  - Runs the RRC news parser over a small page and checks the stored URLs and
+    publish dates (URL date patterns first, then nearby text).
+
+Common examples:
+  pytest -q tests/test_html_utils.py
+"""
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from app.scrapers import html_utils
+from app.scrapers.html_utils import _base_parts, _local_href, _parse_page, _parse_rrc_news
+
+BASE = "https://www.rrc.texas.gov/news/"
+
+
+def _resolve(href):
+    origin, host = _base_parts(BASE)
+    return _local_href(href, BASE, origin, host)
+
+
+@pytest.mark.parametrize("href, expected", [
+    ("/news/010125-x?a=1#top", ("https://www.rrc.texas.gov/news/010125-x?a=1#top", "/news/010125-x")),
+    ("/about/../news/x", ("https://www.rrc.texas.gov/news/x", "/news/x")),
+    ("//www.rrc.texas.gov/news/0101-25-x", ("https://www.rrc.texas.gov/news/0101-25-x", "/news/0101-25-x")),
+    ("https://www.rrc.texas.gov/news/x", ("https://www.rrc.texas.gov/news/x", "/news/x")),
+])
+def test_local_href_resolves_same_host(href, expected):
+    assert _resolve(href) == expected
+
+
+@pytest.mark.parametrize("href", ["https://example.com/news/x", "//example.com/news/x"])
+def test_local_href_drops_other_hosts(href):
+    assert _resolve(href) is None
+
+
+def test_rrc_news_urls_and_dates(monkeypatch):
+    stored = []
+    monkeypatch.setattr(html_utils, "_ingest_doc", lambda db, src, title, href, pub: stored.append((href, pub)))
+    page = _parse_page("""
+      <ul>
+        <li><a href="/news/20250113-eight-digit">Eight</a></li>
+        <li><a href="//www.rrc.texas.gov/news/090525-six-digit">Six</a></li>
+        <li>Posted January 2, 2024 <a href="/news/no-date-in-url">Nearby</a></li>
+        <li><a href="/about-us/">About</a></li>
+        <li><a href="https://example.com/news/elsewhere">Elsewhere</a></li>
+        <li><a href="/news/20250113-eight-digit">Eight again</a></li>
+      </ul>
+    """)
+    _parse_rrc_news(None, SimpleNamespace(url=BASE), page)
+    assert stored == [
+        ("https://www.rrc.texas.gov/news/20250113-eight-digit", datetime(2025, 1, 13)),
+        ("https://www.rrc.texas.gov/news/090525-six-digit", datetime(2025, 9, 5)),
+        ("https://www.rrc.texas.gov/news/no-date-in-url", datetime(2024, 1, 2)),
+    ]
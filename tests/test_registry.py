@@ -8,6 +8,8 @@ What this does:
   - Imports and calls app.registry.discover().
   - Asserts the result is a dict mapping names → callables.
   - Sanity check: all values in the registry are callable.
+  - Checks the lazy registry cache is reused as-is and rebuilt when a scraper
+    is added at the top level or in a subdirectory.
 
 Why it matters:
   - Ensures scraper registry auto-discovery works and doesn’t break.
@@ -24,6 +26,7 @@ Common examples:
       # Run by keyword across the test suite
 """
 
+from app import registry
 from app.registry import discover
 
 
@@ -32,3 +35,23 @@ def test_discover_scrapers_imports():
     assert isinstance(reg, dict)
     # Every entry must map to a callable
     assert all(callable(fn) for fn in reg.values())
+
+
+def test_lazy_cache_reused_until_a_scraper_is_added(tmp_path, monkeypatch):
+    (tmp_path / "state" / "tx").mkdir(parents=True)
+    (tmp_path / "state" / "tx" / "a_scraper.py").write_text("")
+    builds = []
+    build = registry.build_registry_cache
+    monkeypatch.setattr(registry, "build_registry_cache", lambda root=None: builds.append(root) or build(root))
+
+    assert sorted(discover(tmp_path, lazy=True)) == ["a_scraper"]
+    # writing the cache file must not make the cache look stale
+    assert sorted(discover(tmp_path, lazy=True)) == ["a_scraper"]
+    assert len(builds) == 1
+    assert [p.name for p in tmp_path.iterdir() if p.suffix == ".tmp"] == []
+
+    (tmp_path / "b_scraper.py").write_text("")
+    assert sorted(discover(tmp_path, lazy=True)) == ["a_scraper", "b_scraper"]
+    (tmp_path / "state" / "tx" / "c_scraper.py").write_text("")
+    assert sorted(discover(tmp_path, lazy=True)) == ["a_scraper", "b_scraper", "c_scraper"]
+    assert len(builds) == 3
@@ -0,0 +1,135 @@
+"""
+test_rss_fast.py — Streaming RSS/Atom parsing in app/scrapers/rss_fast.py.
+
+Place at: tests/test_rss_fast.py
+Run from the repo root (folder that contains app/).
+
+What this does:
+  - Parses small RSS 2.0, Atom and RDF (RSS 1.0) documents and checks the
+    item links, dates, titles and summaries.
+  - Checks RFC 822 and ISO 8601 / dc:date dates come back as naive UTC.
+  - Checks malformed XML returns None so callers fall back to feedparser.
+
+Common examples:
+  pytest -q tests/test_rss_fast.py
+"""
+from datetime import datetime
+
+import pytest
+
+from app.scrapers import rss_fast
+
+pytestmark = pytest.mark.skipif(rss_fast.etree is None, reason="lxml not installed")
+
+RSS2 = b"""<?xml version="1.0"?>
+<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">
+  <channel>
+    <title>EPA News</title>
+    <link>https://www.epa.gov/newsreleases</link>
+    <atom:link href="https://www.epa.gov/feed.xml" rel="self" type="application/rss+xml"/>
+    <item>
+      <title>Rule one</title>
+      <atom:link href="https://www.epa.gov/feed.xml#1" rel="self"/>
+      <link>https://www.epa.gov/news/1</link>
+      <description>First &lt;b&gt;rule&lt;/b&gt;</description>
+      <pubDate>Tue, 01 Jul 2025 14:30:00 -0400</pubDate>
+      <guid>urn:epa:1</guid>
+      <category domain="topics">Air</category>
+    </item>
+    <item>
+      <link>https://www.epa.gov/news/2</link>
+      <atom:link href="https://www.epa.gov/feed.xml#2" rel="self"/>
+    </item>
+  </channel>
+</rss>"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>FERC</title>
+  <link href="https://www.ferc.gov/" rel="alternate"/>
+  <entry>
+    <title type="xhtml"><div xmlns="http://www.w3.org/1999/xhtml">Order <b>No. 2023</b></div></title>
+    <link href="https://www.ferc.gov/feed/self/1" rel="self"/>
+    <link href="https://www.ferc.gov/news/1" rel="alternate"/>
+    <id>tag:ferc.gov,2025:1</id>
+    <published>2025-07-01T18:30:00Z</published>
+    <summary type="html">&lt;p&gt;Interconnection&lt;/p&gt;</summary>
+    <category term="electric" scheme="https://www.ferc.gov/topics" label="Electric"/>
+  </entry>
+  <entry>
+    <title>Self only</title>
+    <link href="https://www.ferc.gov/feed/self/2" rel="self"/>
+    <updated>2025-07-02T08:00:00+02:00</updated>
+    <content type="xhtml"><div xmlns="http://www.w3.org/1999/xhtml"><p>Body</p></div></content>
+  </entry>
+</feed>"""
+
+RDF = b"""<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+         xmlns="http://purl.org/rss/1.0/" xmlns:dc="http://purl.org/dc/elements/1.1/">
+  <channel rdf:about="https://www.psc.state.md.us/">
+    <title>MD PSC</title>
+    <link>https://www.psc.state.md.us/</link>
+    <items><rdf:Seq><rdf:li rdf:resource="https://www.psc.state.md.us/1"/></rdf:Seq></items>
+  </channel>
+  <item rdf:about="https://www.psc.state.md.us/1">
+    <title>Notice</title>
+    <link>https://www.psc.state.md.us/1</link>
+    <description>Hearing</description>
+    <dc:date>2025-07-03T09:15:00-05:00</dc:date>
+  </item>
+</rdf:RDF>"""
+
+
+def test_rss2_prefers_link_text_over_atom_self():
+    first, second = rss_fast.parse(RSS2)
+    assert first["link"] == "https://www.epa.gov/news/1"
+    assert second["link"] == "https://www.epa.gov/news/2"
+    assert first["title"] == "Rule one"
+    assert first["summary"] == "First <b>rule</b>"
+    assert first["id"] == "urn:epa:1"
+    assert first["tags"] == [{"term": "Air", "scheme": "topics", "label": None}]
+    assert second["title"] == "(untitled)"
+    assert second["published_at"] is None
+
+
+def test_atom_prefers_alternate_over_self():
+    first, second = rss_fast.parse(ATOM)
+    assert first["link"] == "https://www.ferc.gov/news/1"
+    # no alternate link: the self link is the only URL there is
+    assert second["link"] == "https://www.ferc.gov/feed/self/2"
+    assert first["id"] == "tag:ferc.gov,2025:1"
+    assert first["tags"] == [{"term": "electric", "scheme": "https://www.ferc.gov/topics", "label": "Electric"}]
+
+
+def test_atom_xhtml_title_and_content_keep_child_text():
+    first, second = rss_fast.parse(ATOM)
+    assert first["title"] == "Order No. 2023"
+    assert first["summary"] == "<p>Interconnection</p>"
+    assert second["summary"] == "Body"
+
+
+def test_rdf_items():
+    (item,) = rss_fast.parse(RDF)
+    assert item["title"] == "Notice"
+    assert item["link"] == "https://www.psc.state.md.us/1"
+    assert item["summary"] == "Hearing"
+
+
+@pytest.mark.parametrize("feed, index, expected", [
+    (RSS2, 0, datetime(2025, 7, 1, 18, 30)),   # RFC 822 with offset
+    (ATOM, 0, datetime(2025, 7, 1, 18, 30)),   # ISO 8601 "Z"
+    (ATOM, 1, datetime(2025, 7, 2, 6, 0)),     # ISO 8601 with offset (<updated>)
+    (RDF, 0, datetime(2025, 7, 3, 14, 15)),    # dc:date
+])
+def test_dates_are_naive_utc(feed, index, expected):
+    assert rss_fast.parse(feed)[index]["published_at"] == expected
+
+
+@pytest.mark.parametrize("content", [
+    b"<rss><channel><item><title>cut off",
+    b"<html><body><p>not a feed</body></html>",
+    b"",
+])
+def test_malformed_xml_returns_none(content):
+    assert rss_fast.parse(content) is None
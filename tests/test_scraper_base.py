@@ -0,0 +1,119 @@
+"""
+test_scraper_base.py — Hash cache and conditional-GET validators in scrapers/_base.py.
+
+Place at: tests/test_scraper_base.py
+Run from the repo root (folder that contains app/).
+
+What this does:
+  - Points the shared SQLite hash cache at a temp file.
+  - Checks a pre-SQLite last_hash.txt is migrated, but a validators blob is not
+    mistaken for a previous hash.
+  - Checks validators round-trip through their own file.
+  - Checks extract_text() gives the same text with selectolax and BeautifulSoup.
+
+Common examples:
+  pytest -q tests/test_scraper_base.py
+"""
+import hashlib
+import json
+
+import pytest
+
+from scrapers import _base
+
+
+@pytest.fixture(autouse=True)
+def cache_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(_base, "CACHE_DB", str(tmp_path / "hashes.sqlite3"))
+    monkeypatch.setattr(_base, "_conn", None)
+    yield
+    if _base._conn is not None:
+        _base._conn.close()
+
+
+def _check(cache_dir, html="<main>hello</main>"):
+    return _base.check_updated(lambda: html, str(cache_dir), selector="main")
+
+
+def test_legacy_hash_file_is_migrated(tmp_path):
+    # old files hold bare sha256 hex of the extracted text
+    (tmp_path / "last_hash.txt").write_text(hashlib.sha256(b"hello").hexdigest())
+    assert _check(tmp_path)["updated"] is False
+
+
+def test_validators_blob_is_not_a_previous_hash(tmp_path):
+    # what earlier builds wrote into last_hash.txt
+    (tmp_path / "last_hash.txt").write_text(json.dumps({"etag": '"abc"', "last_modified": None}))
+    assert _base.get_hash(str(tmp_path)) is None
+    assert _check(tmp_path)["updated"] is True
+    assert _check(tmp_path)["updated"] is False
+
+
+def test_validators_round_trip(tmp_path):
+    cache_dir = str(tmp_path / "site")
+    assert _base.load_validators(cache_dir) == {}
+    state = {"etag": '"v1"', "last_modified": "Tue, 01 Jul 2025 00:00:00 GMT", "head_first": True}
+    _base.save_validators(cache_dir, state)
+    assert _base.load_validators(cache_dir) == state
+    assert not (tmp_path / "site" / "last_hash.txt").exists()
+
+
+PAGE = """<!doctype html><html><head><title>CalGEM</title><style>a{}</style><script>var x=1;</script></head>
+<body><div class="view-content"><div class="views-row"><a href="/a"> Notice  one </a></div>
+<div class="views-row"><a href="/b">Two <b>bold</b></a></div></div>
+<h2>Rules</h2> <!-- note --> <p>oil &amp; gas</p><h3> Orders </h3></body></html>"""
+
+
+@pytest.mark.parametrize("selector", [".view-content .views-row a, h2, h3", "p", "table", None])
+def test_extract_text_backends_agree(monkeypatch, selector):
+    # a backend switch must not change the stored hashes
+    fast = _base.extract_text(PAGE, selector)
+    monkeypatch.setattr(_base, "LexborHTMLParser", None)
+    assert fast == _base.extract_text(PAGE, selector)
+
+
+def test_extract_text_soupsieve_only_selector_falls_back():
+    assert _base.extract_text(PAGE, "a:-soup-contains('bold')") == "Twobold"
+
+
+class _Response:
+    def __init__(self, status_code=200, text="<main>hello</main>", headers=None):
+        self.status_code, self.text, self.headers = status_code, text, headers or {}
+
+    def raise_for_status(self):
+        pass
+
+
+class _Session:
+    def __init__(self, response):
+        self.response, self.sent = response, None
+
+    def get(self, url, headers=None, timeout=None):
+        self.sent = headers
+        return self.response
+
+
+def test_fetch_conditional_returns_validators_without_saving(tmp_path):
+    session = _Session(_Response(headers={"ETag": '"v1"', "Last-Modified": "Tue, 01 Jul 2025 00:00:00 GMT"}))
+    html, validators = _base.fetch_conditional("https://example.gov/", str(tmp_path), session=session)
+    assert html == "<main>hello</main>"
+    assert validators == {"etag": '"v1"', "last_modified": "Tue, 01 Jul 2025 00:00:00 GMT"}
+    # nothing is stored until the page has been checked
+    assert _base.load_validators(str(tmp_path)) == {}
+
+    session.response = _Response(status_code=304)
+    _base.save_validators(str(tmp_path), validators)
+    assert _base.fetch_conditional("https://example.gov/", str(tmp_path), session=session) == (_base.NOT_MODIFIED, None)
+    assert session.sent["If-None-Match"] == '"v1"'
+
+
+def test_check_hash_update_saves_only_its_own_validators(tmp_path):
+    cache_dir = str(tmp_path)
+    check = lambda fetch: _base.check_hash_update("https://example.gov/", "main", "Test", cache_dir=cache_dir,
+                                                  fetch_html_fn=fetch)
+    # a bare page text carries no validators
+    assert check(lambda: "<main>hello</main>")["updated"] is True
+    assert _base.load_validators(cache_dir) == {}
+    assert check(lambda: ("<main>changed</main>", {"etag": '"v2"', "last_modified": None}))["updated"] is True
+    assert _base.load_validators(cache_dir) == {"etag": '"v2"', "last_modified": None}
+    assert check(lambda: (_base.NOT_MODIFIED, None))["diffSummary"] == "304 not modified"
@@ -7,7 +7,8 @@ Run from the repo root (folder that contains app/).
 
 What this does:
   - Finds Document rows where current_hash is NULL/empty.
-  - Derives a basis string (doc.text, or title + URL), computes a SHA-1,
+  - Derives a basis string (doc.text, or title + URL), computes the content hash
+    (app.services.change_tracker.compute_hash),
     and fills: current_hash, first_seen_at, last_seen_at, last_changed_at.
   - If NO existing DocumentVersion for the doc, creates version_no=1 with a
     snapshot of the basis (first 20,000 chars) and change_type="ADDED".
@@ -42,11 +43,10 @@ Notes:
 from __future__ import annotations
 
 import os
-import hashlib
 from contextlib import contextmanager
 from datetime import datetime
 
-from sqlalchemy import create_engine, func
+from sqlalchemy import create_engine, exists
 from sqlalchemy.orm import sessionmaker
 
 # ---- Models (support singular/plural module naming) ----
@@ -55,6 +55,8 @@ try:
 except Exception:  # pragma: no cover
     from app.db.models import Document, DocumentVersion  # fallback
 
+from app.services.change_tracker import compute_hash
+
 
 # ---- DB connection helpers ----
 def _sqlite_url_from_path(path: str) -> str:
@@ -86,11 +88,6 @@ def session_scope():
         db.close()
 
 
-# ---- Hashing ----
-def sha1(s: str) -> str:
-    return hashlib.sha1(s.encode("utf-8")).hexdigest()
-
-
 # ---- Backfill logic ----
 def choose_basis_text(doc: Document) -> str:
     text = (doc.text or "").strip()
@@ -113,18 +110,16 @@ def backfill(batch_size: int = 500) -> None:
             batch = q.offset(offset).limit(batch_size).all()
             if not batch:
                 break
+            now = datetime.utcnow()  # one timestamp per batch
             for doc in batch:
                 total_seen += 1
                 basis = choose_basis_text(doc)
-                h = sha1(basis)
-                now = datetime.utcnow()
+                h = compute_hash(basis)
 
                 # If a version exists, don't duplicate — just fill fields
-                has_version = (
-                    db.query(func.count(DocumentVersion.id))
-                    .filter(DocumentVersion.doc_id == doc.id)
-                    .scalar()
-                )
+                has_version = db.query(
+                    exists().where(DocumentVersion.doc_id == doc.id)
+                ).scalar()
                 if has_version:
                     doc.current_hash = doc.current_hash or h
                     doc.first_seen_at = doc.first_seen_at or now
@@ -137,6 +132,7 @@ def backfill(batch_size: int = 500) -> None:
                 doc.first_seen_at = now
                 doc.last_seen_at = now
                 doc.last_changed_at = now
+                doc.last_version_no = 1
 
                 v = DocumentVersion(
                     doc_id=doc.id,
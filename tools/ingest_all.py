@@ -43,13 +43,15 @@ import sys
 import urllib.parse
 import urllib.request
 
+import orjson
+
 
 def call(url: str, method: str = "GET"):
     req = urllib.request.Request(url, method=method)
     with urllib.request.urlopen(req, timeout=600) as r:
         data = r.read()
     try:
-        return json.loads(data.decode("utf-8"))
+        return orjson.loads(data)  # bytes in; no separate decode pass
     except Exception:
         return data.decode("utf-8")
 
@@ -48,7 +48,6 @@ Notes:
 from __future__ import annotations
 
 import sys
-import json
 import argparse
 import importlib
 import hashlib
@@ -56,6 +55,8 @@ from contextlib import contextmanager
 from pathlib import Path
 from urllib.parse import urlparse
 
+import orjson
+
 # --- Make repo root importable (parent of tools/) ---
 HERE = Path(__file__).resolve()
 REPO_ROOT = HERE.parents[1]
@@ -126,8 +127,7 @@ def load_sites(json_path: Path) -> dict[str, list[str]]:
     if not json_path.exists():
         raise SystemExit(f"ERROR: sites file not found: {json_path}")
     try:
-        with json_path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = orjson.loads(json_path.read_bytes())
     except Exception as e:
         raise SystemExit(f"ERROR: could not read JSON {json_path}: {e}")
     if not isinstance(data, dict):